@@ -0,0 +1,972 @@
+"""
+Micro-benchmarks for the stop words library.
+
+Run with ``python src/benchmarks.py [name ...]``, or ``make bench``. Every
+benchmark reports the best time per operation over a few repeats, so numbers
+are comparable between runs on the same machine but not across machines.
+
+``--json PATH`` writes the results and the environment they were measured in.
+``--compare PATH`` compares them against such a file, typically a baseline
+recorded with ``make bench-baseline`` before a change, and exits with status 1
+if any timing is slower than the baseline by more than ``--threshold``.
+Benchmarks may also set a budget relative to a reference timed in the same
+run, which holds on any machine; the run exits with status 1 if one is
+exceeded, baseline or not.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import stop_words
+from stop_words import (
+    STOP_WORDS_CACHE,
+    get_stop_words,
+    get_stop_words_set,
+    is_stop_word,
+    remove_stop_words,
+    remove_stop_words_batch,
+)
+from stop_words._index import build_index
+
+
+Benchmark = Callable[[], dict[str, float]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+# Figures other than timings (sizes, counts) reported by the running benchmark, by label.
+INFO: dict[str, float] = {}
+
+# Budgets exceeded by the benchmarks run so far.
+OVER_BUDGET: list[str] = []
+
+# A mix of stop words and regular words, roughly like running text.
+SAMPLE_TOKENS = ("the quick brown fox jumps over the lazy dog and then it was gone " * 64).split()
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    """Register a benchmark under its function name."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def info(label: str, value: float) -> None:
+    """
+    Report a figure that is not a timing, e.g., a size. It is printed and written to JSON, but never compared.
+
+    :param label: What the value is, including its unit.
+    :param value: The value.
+    """
+    INFO[label] = value
+
+
+def budget(label: str, seconds: float, reference: float, limit: float) -> None:
+    """
+    Require a timing to stay within a multiple of a reference timed in the same run.
+
+    :param label: What is timed.
+    :param seconds: The timing.
+    :param reference: The timing of the reference, e.g., a plain frozenset lookup.
+    :param limit: How many times slower than the reference the timing may be.
+    """
+    ratio = seconds / reference
+    info(f"{label} / reference", ratio)
+    if ratio > limit:
+        OVER_BUDGET.append(f"{label}: {ratio:.1f}x the reference, budget {limit:g}x")
+
+
+def measure(func: Callable[[], object], *, number: int = 1000, repeat: int = 5) -> float:
+    """
+    Time a callable.
+
+    :param func: The callable to time.
+    :param number: How many times to call it per repeat.
+    :param repeat: How many repeats to run; the fastest one wins.
+
+    :returns: Seconds per call.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+@benchmark
+def membership() -> dict[str, float]:
+    """Per-token lookup cost against the English stop words."""
+    STOP_WORDS_CACHE.clear()
+    words = get_stop_words("en")
+    words_set = get_stop_words_set("en")
+    per_token = len(SAMPLE_TOKENS)
+
+    return {
+        "list `in`": measure(lambda: [t in words for t in SAMPLE_TOKENS], number=20) / per_token,
+        "set() per call": measure(lambda: set(get_stop_words("en")), number=200),
+        "get_stop_words_set": measure(lambda: get_stop_words_set("en"), number=100_000),
+        "frozenset `in`": measure(lambda: [t in words_set for t in SAMPLE_TOKENS], number=200) / per_token,
+        "is_stop_word": measure(lambda: [is_stop_word(t, "en") for t in SAMPLE_TOKENS], number=200) / per_token,
+    }
+
+
+@benchmark
+def membership_overhead() -> dict[str, float]:
+    """Cost of a cached lookup through the API against testing a hoisted frozenset, with budgets."""
+    STOP_WORDS_CACHE.clear()
+    words_set = get_stop_words_set("en")
+    is_stop_word("the", "en")
+
+    results = {
+        "frozenset `in`": measure(lambda: "the" in words_set, number=200_000),
+        "is_stop_word": measure(lambda: is_stop_word("the", "en"), number=200_000),
+        "get_stop_words_set": measure(lambda: get_stop_words_set("en"), number=200_000),
+    }
+    # All three include calling the lambda. Before the fast path, both took more than 10 times the reference.
+    budget("is_stop_word", results["is_stop_word"], results["frozenset `in`"], 8)
+    budget("get_stop_words_set", results["get_stop_words_set"], results["frozenset `in`"], 8)
+    return results
+
+
+@benchmark
+def normalized_membership() -> dict[str, float]:
+    """Per-token accent- and case-insensitive lookups: normalizing in the caller against the cached normalizers."""
+    import unicodedata
+
+    tokens = ("Über die Straße ging ein Mann, ÜBER DEN ER NICHTS WUSSTE, und dann war er weg " * 32).split()
+    per_token = len(tokens)
+
+    def strip_accents(word: str) -> str:
+        decomposed = unicodedata.normalize("NFD", unicodedata.normalize("NFKC", word).casefold())
+        return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+    words = {strip_accents(word) for word in get_stop_words("de")}
+    words_set = get_stop_words_set("de", normalize="accents")
+    normalize_word = stop_words.get_normalizer("de", "accents")
+
+    return {
+        "caller normalizes each token": measure(lambda: [strip_accents(t) in words for t in tokens], number=100)
+        / per_token,
+        "is_stop_word(normalize='accents')": measure(
+            lambda: [is_stop_word(t, "de", normalize="accents") for t in tokens], number=100
+        )
+        / per_token,
+        "get_normalizer() + hoisted set": measure(lambda: [normalize_word(t) in words_set for t in tokens], number=100)
+        / per_token,
+        "is_stop_word(normalize='casefold')": measure(
+            lambda: [is_stop_word(t, "de", normalize="casefold") for t in tokens], number=100
+        )
+        / per_token,
+    }
+
+
+@benchmark
+def copy_vs_view() -> dict[str, float]:
+    """Cache hit cost of the defensive copy against the read-only view, on the largest languages."""
+    STOP_WORDS_CACHE.clear()
+    sizes = {language: len(get_stop_words(language, copy=False)) for language in stop_words.AVAILABLE_LANGUAGES}
+    largest = sorted(sizes, key=sizes.__getitem__, reverse=True)[:3]
+
+    results = {}
+    for language in largest:
+        results[f"{language} ({sizes[language]}) copy"] = measure(lambda: get_stop_words(language), number=5000)
+        results[f"{language} ({sizes[language]}) view"] = measure(
+            lambda: get_stop_words(language, copy=False), number=50_000
+        )
+    return results
+
+
+@benchmark
+def removal() -> dict[str, float]:
+    """Per-token cost of stop word removal: hand-written list loop against the streaming API."""
+    words = get_stop_words("en")
+    batches = [list(batch) for batch in zip(*[iter(SAMPLE_TOKENS)] * 16)]
+    per_token = len(SAMPLE_TOKENS)
+
+    return {
+        "list comprehension, list `in`": measure(lambda: [t for t in SAMPLE_TOKENS if t not in words], number=20)
+        / per_token,
+        "remove_stop_words": measure(lambda: list(remove_stop_words(SAMPLE_TOKENS, "en")), number=500) / per_token,
+        "remove_stop_words_batch": measure(lambda: remove_stop_words_batch(batches, "en"), number=500) / per_token,
+    }
+
+
+@benchmark
+def cold_load() -> dict[str, float]:
+    """Cold loading of every available language, from the text files and from the compiled index."""
+    original_dir = stop_words.STOP_WORDS_DIR
+    tmp_dir = Path(tempfile.mkdtemp())
+    source_dir = tmp_dir / "stop-words"
+    shutil.copytree(original_dir, source_dir, ignore=shutil.ignore_patterns("*.idx"))
+
+    def load_all() -> None:
+        STOP_WORDS_CACHE.clear()
+        stop_words._indexes.clear()
+        for language in stop_words.AVAILABLE_LANGUAGES:
+            get_stop_words(language, copy=False)
+
+    stop_words.STOP_WORDS_DIR = source_dir
+    try:
+        results = {"text files": measure(load_all, number=20)}
+        build_index(source_dir)
+        results["compiled index"] = measure(load_all, number=20)
+    finally:
+        stop_words.STOP_WORDS_DIR = original_dir
+        stop_words._indexes.clear()
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(tmp_dir)
+
+    return results
+
+
+@benchmark
+def cold_load_per_language() -> dict[str, float]:
+    """Cold load of each language, with the compiled index if one is installed."""
+    results = {}
+    for language in stop_words.AVAILABLE_LANGUAGES:
+
+        def load() -> None:
+            STOP_WORDS_CACHE.pop(language, None)
+            get_stop_words(language, copy=False)
+
+        results[language] = measure(load, number=20)
+    STOP_WORDS_CACHE.clear()
+    return results
+
+
+@benchmark
+def filter_chain() -> dict[str, float]:
+    """apply_filters() on the English stop words with chains of 0, 1 and 4 filters."""
+    words = list(get_stop_words("en", copy=False))
+
+    def drop_short(words: list[str], _language: str | None = None) -> list[str]:
+        return [word for word in words if len(word) > 2]
+
+    def lowercase(words: list[str], _language: str | None = None) -> list[str]:
+        return [word.lower() for word in words]
+
+    def strip_quotes(words: list[str], _language: str | None = None) -> list[str]:
+        return [word.strip("'") for word in words]
+
+    def deduplicate(words: list[str], _language: str | None = None) -> list[str]:
+        return list(dict.fromkeys(words))
+
+    results = {"no filters": measure(lambda: stop_words.apply_filters(list(words), "english"))}
+    chain = [drop_short, lowercase, strip_quotes, deduplicate]
+    try:
+        for count, func in enumerate(chain, 1):
+            stop_words.add_filter(func)
+            if count in (1, len(chain)):
+                results[f"{count} filter{'s' if count > 1 else ''}"] = measure(
+                    lambda: stop_words.apply_filters(list(words), "english")
+                )
+    finally:
+        for func in chain:
+            stop_words.remove_filter(func)
+    return results
+
+
+@benchmark
+def instrumentation() -> dict[str, float]:
+    """Cache hits and cold loads without hooks, with a no-op hook and with StopWordsStats."""
+
+    def cold_load() -> None:
+        STOP_WORDS_CACHE.pop("english", None)
+        get_stop_words("en", copy=False)
+
+    def run(label: str) -> dict[str, float]:
+        get_stop_words("en", copy=False)
+        return {
+            f"hit, {label}": measure(lambda: get_stop_words("en", copy=False), number=100_000),
+            f"cold load, {label}": measure(cold_load, number=100),
+        }
+
+    def no_op(_event: stop_words.InstrumentationEvent) -> None:
+        pass
+
+    stats = stop_words.StopWordsStats()
+    results = run("no hooks")
+    try:
+        stop_words.add_hook(no_op)
+        results.update(run("no-op hook"))
+        stop_words.remove_hook(no_op)
+        stop_words.add_hook(stats)
+        results.update(run("StopWordsStats"))
+    finally:
+        stop_words.remove_hook(no_op)
+        stop_words.remove_hook(stats)
+    return results
+
+
+@benchmark
+def import_time() -> dict[str, float]:
+    """
+    Fresh-interpreter ``import stop_words`` time, best of several runs.
+
+    The budget compares it with importing pathlib and typing, which the package
+    has always needed, so only what it imports on top of them counts against it.
+    """
+    src_dir = Path(__file__).resolve().parent
+    # Time imports from cached bytecode, as installed packages have it.
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+
+    def run(*args: str) -> str:
+        return subprocess.run(
+            [sys.executable, *args], cwd=src_dir, env=env, capture_output=True, text=True, check=True
+        ).stderr
+
+    def measure_import(code: str, *names: str) -> float:
+        # Lines look like "import time: self [us] | cumulative | name", with nested imports indented.
+        stderr = run("-X", "importtime", "-c", code)
+        fields = [line.split("|") for line in stderr.splitlines()]
+        return sum(int(cumulative) for _, cumulative, name in fields if name[1:] in names) * 1e-6
+
+    def first_lookup_time() -> float:
+        code = (
+            "import sys, time; start = time.perf_counter(); import stop_words; stop_words.is_stop_word('the', 'en'); "
+            "print(time.perf_counter() - start, file=sys.stderr)"
+        )
+        return float(run("-c", code))
+
+    run("-c", "import stop_words")
+    # Alternate the two imports so that both see the same load on the machine.
+    reference, package = zip(
+        *(
+            (
+                measure_import("import pathlib, typing", "pathlib", "typing"),
+                measure_import("import stop_words", "stop_words"),
+            )
+            for _ in range(10)
+        )
+    )
+    results = {
+        "import pathlib, typing (-X importtime)": min(reference),
+        "import stop_words (-X importtime)": min(package),
+        "import + first is_stop_word()": min(first_lookup_time() for _ in range(10)),
+    }
+    budget(
+        "import stop_words",
+        results["import stop_words (-X importtime)"],
+        results["import pathlib, typing (-X importtime)"],
+        1.3,
+    )
+    return results
+
+
+@benchmark
+def cold_start() -> dict[str, float]:
+    """New process with a filter chain, until every language is cached: reading and filtering against load_cache()."""
+    src_dir = Path(__file__).resolve().parent
+    tmp_dir = Path(tempfile.mkdtemp())
+    snapshot = tmp_dir / "stop-words.snapshot"
+    # The filters add accent-free variants of the stop words, then fold their case.
+    code = (
+        "import sys, time, unicodedata, stop_words\n"
+        "def ascii_variants(words, _language):\n"
+        "    folded = (unicodedata.normalize('NFKD', w).encode('ascii', 'ignore').decode() for w in words)\n"
+        "    return list(dict.fromkeys([*words, *(w for w in folded if w)]))\n"
+        "stop_words.add_filter(ascii_variants)\n"
+        "stop_words.add_filter(stop_words.CaseFold())\n"
+        "stop_words.add_filter(stop_words.MinLength(2))\n"
+        "start = time.perf_counter()\n"
+        "if sys.argv[1] == 'load': stop_words.load_cache(sys.argv[2])\n"
+        "for language in stop_words.AVAILABLE_LANGUAGES: stop_words.get_stop_words_set(language)\n"
+        "print(time.perf_counter() - start, file=sys.stderr)\n"
+        "if sys.argv[1] == 'save': stop_words.save_cache(sys.argv[2])"
+    )
+
+    def run(*args: str) -> float:
+        result = subprocess.run(
+            [sys.executable, "-c", code, *args, str(snapshot)], cwd=src_dir, capture_output=True, text=True, check=True
+        )
+        return float(result.stderr)
+
+    try:
+        run("save")
+        info("snapshot KiB", snapshot.stat().st_size / 1024)
+        return {
+            "read and filter every language": min(run("source") for _ in range(10)),
+            "load_cache": min(run("load") for _ in range(10)),
+        }
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@benchmark
+def contended_load() -> dict[str, float]:
+    """Latency until every thread has its result when N threads miss the cache for the same language at once."""
+
+    def first_load(threads: int) -> float:
+        STOP_WORDS_CACHE.clear()
+        barrier = threading.Barrier(threads + 1)
+
+        def load() -> None:
+            barrier.wait()
+            get_stop_words("vietnamese", copy=False)
+
+        with ThreadPoolExecutor(threads) as executor:
+            futures = [executor.submit(load) for _ in range(threads)]
+            barrier.wait()
+            start = timeit.default_timer()
+            for future in futures:
+                future.result()
+            return timeit.default_timer() - start
+
+    return {f"{threads} threads": min(first_load(threads) for _ in range(20)) for threads in (1, 8, 32)}
+
+
+@benchmark
+def bounded_cache() -> dict[str, float]:
+    """Cache hit cost with and without LRU bookkeeping, and the measured size of all languages."""
+    stop_words.configure_cache()
+    for language in stop_words.AVAILABLE_LANGUAGES:
+        get_stop_words(language, copy=False)
+    total_bytes = stop_words.cache_info().bytes
+
+    results = {"unbounded hit": measure(lambda: get_stop_words("en", copy=False), number=100_000)}
+    stop_words.configure_cache(max_languages=len(stop_words.AVAILABLE_LANGUAGES))
+    results["LRU hit"] = measure(lambda: get_stop_words("en", copy=False), number=100_000)
+    stop_words.configure_cache()
+
+    info(f"all {len(stop_words.AVAILABLE_LANGUAGES)} languages cached KiB", total_bytes / 1024)
+    return results
+
+
+@benchmark
+def compact_memory() -> dict[str, float]:
+    """Memory of all languages as lists, frozensets and compact hash arrays, measured with tracemalloc."""
+    import tracemalloc
+
+    from stop_words import CompactStopWords
+    from stop_words._index import read_words
+
+    languages = stop_words.AVAILABLE_LANGUAGES
+    files = [stop_words.STOP_WORDS_DIR / f"{language}.txt" for language in languages]
+
+    def traced(build: Callable[[list[str]], object]) -> int:
+        # Each form is built straight from the files, so it is measured together with the strings it keeps alive.
+        tracemalloc.start()
+        try:
+            kept = [build(read_words(path)) for path in files]
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del kept
+        return size
+
+    info(f"all {len(languages)} languages as lists KiB", traced(list) / 1024)
+    info(f"all {len(languages)} languages as frozensets KiB", traced(frozenset) / 1024)
+    info(f"all {len(languages)} languages as CompactStopWords KiB", traced(CompactStopWords) / 1024)
+
+    words_set = get_stop_words_set("en")
+    compact = stop_words.get_compact_stop_words("en")
+    per_token = len(SAMPLE_TOKENS)
+    results = {
+        "frozenset `in`": measure(lambda: [t in words_set for t in SAMPLE_TOKENS], number=200) / per_token,
+        "CompactStopWords `in`": measure(lambda: [t in compact for t in SAMPLE_TOKENS], number=200) / per_token,
+    }
+    stop_words.configure_cache(compact=True)
+    results["is_stop_word, compact mode"] = (
+        measure(lambda: [is_stop_word(t, "en") for t in SAMPLE_TOKENS], number=200) / per_token
+    )
+    stop_words.configure_cache()
+    return results
+
+
+@benchmark
+def source_reload() -> dict[str, float]:
+    """Picking up an edited list with every language cached: reload_changed() against clearing the cache."""
+    tmp_dir = Path(tempfile.mkdtemp())
+    english_file = tmp_dir / "english.txt"
+    english_file.write_text("acme\n", encoding="utf-8")
+    source = stop_words.DirectorySource(tmp_dir)
+    languages = stop_words.AVAILABLE_LANGUAGES
+
+    def load_all() -> None:
+        for language in languages:
+            get_stop_words_set(language)
+
+    def edit_and_reload() -> None:
+        os.utime(english_file)
+        stop_words.reload_changed()
+
+    def clear_and_load() -> None:
+        STOP_WORDS_CACHE.clear()
+        load_all()
+
+    try:
+        stop_words.add_source(source)
+        load_all()
+        results = {
+            "reload_changed, nothing changed": measure(stop_words.reload_changed, number=100),
+            "reload_changed, one file edited": measure(edit_and_reload, number=100),
+            "clear the cache and reload": measure(clear_and_load, number=10),
+        }
+    finally:
+        stop_words.remove_source(source)
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(tmp_dir)
+
+    return results
+
+
+@benchmark
+def filter_change() -> dict[str, float]:
+    """First lookup after a filter change: re-filtering the cached raw words against clearing the cache."""
+
+    def drop_short(words: list[str], _language: str | None = None) -> list[str]:
+        return [word for word in words if len(word) > 2]
+
+    def refilter() -> None:
+        stop_words.add_filter(drop_short, language="english")
+        get_stop_words("en", copy=False)
+        stop_words.remove_filter(drop_short, language="english")
+        get_stop_words("en", copy=False)
+
+    def clear_and_reload() -> None:
+        stop_words.add_filter(drop_short, language="english")
+        STOP_WORDS_CACHE.clear()
+        get_stop_words("en", copy=False)
+        stop_words.remove_filter(drop_short, language="english")
+        STOP_WORDS_CACHE.clear()
+        get_stop_words("en", copy=False)
+
+    STOP_WORDS_CACHE.clear()
+    get_stop_words("en", copy=False)
+    return {
+        "automatic re-filter": measure(refilter, number=200) / 2,
+        "STOP_WORDS_CACHE.clear() + reload": measure(clear_and_reload, number=200) / 2,
+    }
+
+
+@benchmark
+def multi_language() -> dict[str, float]:
+    """Merged stop words of several languages: rebuilding the union per request against the cached union."""
+    languages = ["en", "fr", "de", "es"]
+    STOP_WORDS_CACHE.clear()
+
+    def first_all() -> frozenset[str]:
+        stop_words._multi_language_cache.clear()
+        return stop_words.get_stop_words_multi("all")
+
+    results = {
+        "4 languages, set union per call": measure(
+            lambda: set().union(*(get_stop_words(language) for language in languages)), number=200
+        ),
+        "4 languages, get_stop_words_multi": measure(lambda: stop_words.get_stop_words_multi(languages)),
+        "all, set union per call": measure(
+            lambda: set().union(*(get_stop_words(language) for language in stop_words.AVAILABLE_LANGUAGES)), number=20
+        ),
+        "all, first get_stop_words_multi": measure(first_all, number=20),
+        "all, get_stop_words_multi": measure(lambda: stop_words.get_stop_words_multi("all")),
+    }
+
+    union = stop_words.get_stop_words_multi("all")
+    sets = [get_stop_words_set(language) for language in stop_words.AVAILABLE_LANGUAGES]
+    info("all, distinct words", len(union))
+    info("all, words in per-language sets", sum(map(len, sets)))
+    info("all, union KiB", sys.getsizeof(union) / 1024)
+    info("all, per-language sets KiB", sum(map(sys.getsizeof, sets)) / 1024)
+    return results
+
+
+@benchmark
+def language_detection() -> dict[str, float]:
+    """Per-document detection over a mixed-language corpus: one set intersection per language against the index.
+
+    The last case loads a language into a bounded cache before every document, which used to rebuild the index.
+    """
+    corpus = [
+        "The cat is on the table and it does not want to move from there at all",
+        "Le chat est sur la table et il ne veut pas bouger de là du tout",
+        "Die Katze ist auf dem Tisch und sie will sich von dort gar nicht bewegen",
+        "El gato está en la mesa y no quiere moverse de ahí para nada",
+        "Il gatto è sul tavolo e non vuole muoversi da lì per niente",
+    ] * 20
+    tokenized = [document.lower().split() for document in corpus]
+    sets = {language: get_stop_words_set(language) for language in stop_words.AVAILABLE_LANGUAGES}
+
+    def naive() -> None:
+        for tokens in tokenized:
+            max(sets, key=lambda language: len(sets[language].intersection(tokens)))
+
+    def indexed() -> None:
+        for tokens in tokenized:
+            stop_words.detect_language(tokens)
+
+    def indexed_text() -> None:
+        for document in corpus:
+            stop_words.detect_language(document)
+
+    rotation = ["en", "fr", "de", "es", "it", "nl"]
+
+    def churn() -> None:
+        # Every document loads a language into a cache of 4, evicting another, as a busy process would.
+        for position in range(len(tokenized)):
+            get_stop_words(rotation[position % len(rotation)], copy=False)
+
+    def indexed_with_churn() -> None:
+        for position, tokens in enumerate(tokenized):
+            get_stop_words(rotation[position % len(rotation)], copy=False)
+            stop_words.detect_language(tokens)
+
+    stop_words.detect_language("")
+    results = {
+        "N set intersections, per document": measure(naive, number=20) / len(corpus),
+        "detect_language(tokens), per document": measure(indexed, number=20) / len(corpus),
+        "detect_language(text), per document": measure(indexed_text, number=20) / len(corpus),
+    }
+    stop_words.configure_cache(max_languages=4)
+    try:
+        results["cache of 4, loads alone"] = measure(churn, number=5) / len(corpus)
+        results["cache of 4, loads + detect_language"] = measure(indexed_with_churn, number=5) / len(corpus)
+    finally:
+        stop_words.configure_cache()
+    return results
+
+
+@benchmark
+def text_matching() -> dict[str, float]:
+    """Stop words in a long raw document (~130 KB): split-and-filter loops against the compiled matchers."""
+    import re
+
+    text = "The quick brown fox jumps over the lazy dog, and then it was gone. " * 2000
+    word_pattern = re.compile(r"\w+(?:['’]\w+)*")
+    words = get_stop_words("en")
+    words_set = get_stop_words_set("en")
+    stop_words.find_stop_words("", "en")
+
+    return {
+        "split, lower, filter against list": measure(
+            lambda: " ".join(t for t in text.split() if t.lower() not in words), number=1, repeat=3
+        ),
+        "split, lower, filter against set": measure(
+            lambda: " ".join(t for t in text.split() if t.lower() not in words_set), number=10
+        ),
+        "finditer words, spans of those in set": measure(
+            lambda: [m.span() for m in word_pattern.finditer(text.lower()) if m.group() in words_set], number=10
+        ),
+        "find_stop_words": measure(lambda: stop_words.find_stop_words(text, "en"), number=10),
+        "strip_stop_words": measure(lambda: stop_words.strip_stop_words(text, "en"), number=10),
+    }
+
+
+@benchmark
+def warm_up() -> dict[str, float]:
+    """Loading every language from an empty cache: one after the other against warm_up() on a thread pool."""
+
+    def sequential() -> None:
+        STOP_WORDS_CACHE.clear()
+        for language in stop_words.AVAILABLE_LANGUAGES:
+            get_stop_words_set(language)
+
+    def parallel(workers: int) -> Callable[[], object]:
+        def run() -> None:
+            STOP_WORDS_CACHE.clear()
+            stop_words.warm_up(workers=workers)
+
+        return run
+
+    results = {"sequential": measure(sequential, number=10)}
+    for workers in (1, 4, 8):
+        results[f"warm_up(workers={workers})"] = measure(parallel(workers), number=10)
+    STOP_WORDS_CACHE.clear()
+    return results
+
+
+@benchmark
+def event_loop_stall() -> dict[str, float]:
+    """Longest event loop stall while a coroutine loads every language cold: get_stop_words against aget_stop_words."""
+
+    async def longest_stall(load: Callable[[], Awaitable[object]]) -> float:
+        STOP_WORDS_CACHE.clear()
+        stalls = []
+
+        async def ticker() -> None:
+            while True:
+                start = timeit.default_timer()
+                await asyncio.sleep(0)
+                stalls.append(timeit.default_timer() - start)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await load()
+        await asyncio.sleep(0)
+        task.cancel()
+        return max(stalls)
+
+    async def blocking() -> None:
+        for language in stop_words.AVAILABLE_LANGUAGES:
+            get_stop_words(language)
+
+    async def non_blocking() -> None:
+        await asyncio.gather(*map(stop_words.aget_stop_words, stop_words.AVAILABLE_LANGUAGES))
+
+    def run(load: Callable[[], Awaitable[object]]) -> float:
+        return min(asyncio.run(longest_stall(load)) for _ in range(10))
+
+    results = {"get_stop_words (blocking)": run(blocking), "aget_stop_words": run(non_blocking)}
+    STOP_WORDS_CACHE.clear()
+    return results
+
+
+@benchmark
+def shared_store() -> dict[str, float]:
+    """Membership checks against the in-process cache and the shared store, and per-process memory of each."""
+    tmp_dir = Path(tempfile.mkdtemp())
+    path = stop_words.publish_shared_store(tmp_dir / "stop-words.shm")
+    per_token = len(SAMPLE_TOKENS)
+
+    def check_all(check: Callable[[str], bool]) -> float:
+        return measure(lambda: [check(t) for t in SAMPLE_TOKENS], number=200) / per_token
+
+    try:
+        STOP_WORDS_CACHE.clear()
+        results = {"is_stop_word, in-process cache": check_all(lambda t: is_stop_word(t, "en"))}
+        store = stop_words.attach_shared_store(path)
+        results["is_stop_word, shared store"] = check_all(lambda t: is_stop_word(t, "en"))
+        results["SharedStopWords.contains"] = check_all(lambda t: store.contains(t, "english"))
+
+        if Path("/proc/self/smaps_rollup").exists():
+            # Private memory a fresh process adds by checking one word in every language.
+            code = (
+                "import sys, stop_words\n"
+                "def private():\n"
+                "    with open('/proc/self/smaps_rollup') as f:\n"
+                "        return sum(int(line.split()[1]) for line in f if line.startswith('Private_'))\n"
+                "if sys.argv[1:]: stop_words.attach_shared_store(sys.argv[1])\n"
+                "stop_words.is_stop_word('the', 'en'); before = private()\n"
+                "for language in stop_words.AVAILABLE_LANGUAGES: stop_words.is_stop_word('the', language)\n"
+                "print(private() - before)"
+            )
+            src_dir = Path(__file__).resolve().parent
+
+            def private_kib(*args: str) -> int:
+                result = subprocess.run(
+                    [sys.executable, "-c", code, *args], cwd=src_dir, capture_output=True, text=True, check=True
+                )
+                return int(result.stdout)
+
+            info("private KiB per process, cache", private_kib())
+            info("private KiB per process, shared store", private_kib(str(path)))
+        info("shared store KiB", store.size / 1024)
+    finally:
+        stop_words.detach_shared_store()
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(tmp_dir)
+
+    return results
+
+
+@benchmark
+def vectorized_mask() -> dict[str, float]:
+    """Stop word masks over 1M and 10M tokens: Series.isin() against stop_word_mask() on each kind of column."""
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        print("  skipped: needs NumPy and pandas")
+        return {}
+
+    words = get_stop_words("en")
+    results = {}
+    for size in (1_000_000, 10_000_000):
+        label = f"{size // 1_000_000}M"
+        tokens = np.resize(np.array(SAMPLE_TOKENS, dtype=object), size)
+        series = pd.Series(tokens)
+        fixed_width = tokens.astype(np.str_)
+        results[f"Series.isin(get_stop_words()), {label}"] = measure(lambda: series.isin(words), number=1, repeat=3)
+        results[f"stop_word_mask, Series, {label}"] = measure(
+            lambda: stop_words.stop_word_mask(series, "en"), number=1, repeat=3
+        )
+        results[f"stop_word_mask, object array, {label}"] = measure(
+            lambda: stop_words.stop_word_mask(tokens, "en"), number=1, repeat=3
+        )
+        results[f"stop_word_mask, str array, {label}"] = measure(
+            lambda: stop_words.stop_word_mask(fixed_width, "en"), number=1, repeat=3
+        )
+    return results
+
+
+def _filter_with_list(documents: list[list[str]], words: list[str]) -> list[list[str]]:
+    """The ad hoc worker task filter_documents() replaces: the stop words list is pickled with every chunk."""
+    words_set = set(words)
+    return [[token for token in document if token not in words_set] for document in documents]
+
+
+@benchmark
+def process_pool() -> dict[str, float]:
+    """Filtering 200,000 tokenized documents on 4 processes: pickling the list per task against filter_documents()."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    documents = [SAMPLE_TOKENS[:32]] * 200_000
+    words = get_stop_words("en")
+    chunksize = 64
+    ends = range(chunksize, len(documents) + chunksize, chunksize)
+
+    def pickled_list() -> None:
+        chunks = [documents[start:end] for start, end in zip(range(0, len(documents), chunksize), ends)]
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_filter_with_list, chunks, [words] * len(chunks)))
+
+    return {
+        "stop words list pickled per chunk": measure(pickled_list, number=1, repeat=3),
+        "filter_documents": measure(
+            lambda: list(stop_words.filter_documents(documents, "en", workers=4, chunksize=chunksize)),
+            number=1,
+            repeat=3,
+        ),
+        "in-process remove_stop_words_batch": measure(
+            lambda: remove_stop_words_batch(documents, "en"), number=1, repeat=3
+        ),
+    }
+
+
+@benchmark
+def declarative_filters() -> dict[str, float]:
+    """A 5-filter chain over every language: one list comprehension per filter against the fused declarative pass."""
+    import re
+
+    excluded = {"ok", "yes", "no"}
+    digits = re.compile(r"\d").search
+    lambdas = [
+        lambda words, _language: [word for word in words if len(word) >= 2],
+        lambda words, _language: [word for word in words if len(word) <= 20],
+        lambda words, _language: [word.casefold() for word in words],
+        lambda words, _language: [word for word in words if word not in excluded],
+        lambda words, _language: [word for word in words if not digits(word)],
+    ]
+    declarative = stop_words.fuse(
+        [
+            stop_words.MinLength(2),
+            stop_words.MaxLength(20),
+            stop_words.CaseFold(),
+            stop_words.Exclude(excluded),
+            stop_words.RejectPattern(r"\d"),
+        ]
+    )
+    languages = {language: list(get_stop_words(language)) for language in stop_words.AVAILABLE_LANGUAGES}
+
+    def run(chain: list[Callable[[list[str], str | None], list[str]]]) -> None:
+        for language, words in languages.items():
+            for func in chain:
+                words = func(words, language)
+
+    info("stop words, all languages", sum(map(len, languages.values())))
+    return {
+        "5 list comprehensions": measure(lambda: run(lambdas), number=20, repeat=15),
+        "fused declarative filters": measure(lambda: run(declarative), number=20, repeat=15),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a unit that fits its magnitude."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def environment() -> dict[str, Any]:
+    """Describe where the benchmarks run, so results are only compared with care across setups."""
+    return {
+        "stop_words": stop_words.get_version(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """
+    Find the timings that regressed against a baseline.
+
+    Timings missing from either side are ignored, so benchmarks can be added or renamed.
+
+    :param results: Timings in seconds by benchmark and label.
+    :param baseline: Baseline timings, in the same shape.
+    :param threshold: Allowed slowdown as a fraction, e.g., 0.25 for 25%.
+
+    :returns: A description of each regression.
+    """
+    regressions = []
+    for name, timings in results.items():
+        for label, seconds in timings.items():
+            before = baseline.get(name, {}).get(label)
+            if before and seconds > before * (1 + threshold):
+                regressions.append(
+                    f"{name}: {label}: {format_seconds(before).strip()} -> {format_seconds(seconds).strip()}"
+                    f" (+{(seconds / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """Run the named benchmarks, or all of them, print the results and optionally save or compare them."""
+    parser = argparse.ArgumentParser(description="Run the stop_words micro-benchmarks.")
+    parser.add_argument("names", nargs="*", metavar="NAME", help=f"benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="write the results to a JSON file")
+    parser.add_argument("--compare", type=Path, metavar="PATH", help="compare against a JSON file written by --json")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown against --compare, e.g., 0.25 for 25%%"
+    )
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}", file=sys.stderr)
+        return 2
+
+    report: dict[str, Any] = {"environment": environment(), "results": {}, "info": {}}
+    print(f"stop_words {report['environment']['stop_words']} on Python {report['environment']['python']}")
+    for name in names:
+        print(f"\n{name}")
+        INFO.clear()
+        report["results"][name] = BENCHMARKS[name]()
+        for label, seconds in report["results"][name].items():
+            print(f"  {label:<40} {format_seconds(seconds)}")
+        if INFO:
+            report["info"][name] = dict(INFO)
+            for label, value in INFO.items():
+                print(f"  {label:<40} {value:11.0f}")
+
+    if OVER_BUDGET:
+        print(f"\n{len(OVER_BUDGET)} timings over budget:", file=sys.stderr)
+        for over in OVER_BUDGET:
+            print(f"  {over}", file=sys.stderr)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        if not args.compare.exists():
+            print(f"\nNo baseline at {args.compare}; record one with `make bench-baseline`.", file=sys.stderr)
+            return 1 if OVER_BUDGET else 0
+
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("environment") != report["environment"]:
+            print("\nWarning: the baseline was recorded in a different environment.", file=sys.stderr)
+
+        regressions = compare(report["results"], baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.compare}.")
+
+    return 1 if OVER_BUDGET else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -5,95 +5,1736 @@ A module for loading and managing stop words across multiple languages.
 Stop words are common words that are typically filtered out in text processing.
 
 This module provides:
-- Loading stop words from language-specific files
-- Caching for performance optimization
-- Custom filtering system for post-processing stop words
+- Loading stop words from language-specific files or a compiled, memory-mapped index
+- Extra sources (directories, in-memory lists) layered over the bundled data, with incremental reloads
+- Non-blocking loading for asyncio, and parallel warm-up of many languages
+- Preloading for pre-fork servers that keeps the cache shared with forked workers
+- Snapshots of the filtered cache that new processes load instead of reading and filtering the data
+- An optional cross-process store in a memory-mapped file, shared by all attached processes
+- Thread-safe caching, optionally bounded by languages or memory, for performance optimization
+- Constant-time membership checks via cached frozensets, per language or merged,
+  optionally case- and accent-insensitive
+- An optional compact mode storing sorted hash arrays instead of frozensets, for many languages at once
+- Streaming removal of stop words from token iterables
+- Vectorized stop word masks over NumPy arrays and pandas objects (with NumPy installed)
+- Stop-word-based language detection through a cached inverted index
+- Finding and stripping stop words in raw text through cached compiled matchers
+- Filtering corpora of documents on a process pool, in order and with bounded memory
+- Custom filtering system for post-processing stop words, with declarative
+  filters (lengths, case folding, word lists, patterns) fused into a single pass
+- Instrumentation hooks for cache hits and misses, read and filter timings
 - Language code mapping (e.g., 'en' -> 'english')
+
+Importing the module does no I/O: LANGUAGE_MAPPING and AVAILABLE_LANGUAGES
+are loaded on first access, and the data files on first lookup.
 """
 
-import json
-from pathlib import Path
-from typing import Callable
+import _thread
+import operator
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Sequence,
+    TypeVar,
+    cast,
+    overload,
+)
+
+from ._cache import CacheInfo, StopWordsCache
+
+
+if TYPE_CHECKING:
+    import re
+    from multiprocessing.context import BaseContext
+
+    from ._compact import CompactStopWords
+    from ._index import StopWordsIndex
+    from ._instrumentation import InstrumentationEvent, StopWordsStats  # noqa: F401
+    from ._pipeline import (  # noqa: F401
+        CaseFold,
+        DeclarativeFilter,
+        Exclude,
+        Include,
+        MaxLength,
+        MinLength,
+        RejectPattern,
+        fuse,
+    )
+    from ._shared import SharedStopWords
+    from ._sources import DirectorySource, MemorySource, StopWordsSource  # noqa: F401
+
+T = TypeVar("T")
+
+# Normalization modes of get_stop_words_set() and is_stop_word().
+Normalization = Literal["casefold", "nfkc", "accents"]
+
+
+# Directory configuration
+CURRENT_DIR = Path(__file__).resolve().parent
+STOP_WORDS_DIR = CURRENT_DIR / "stop-words"
+
+# Global caches
+STOP_WORDS_CACHE = StopWordsCache()
+_filters: dict[str | None, list[Callable[[list[str], str | None], list[str]]]] = {None: []}
+_indexes: "dict[Path, StopWordsIndex | None]" = {}
+_shared_store: "SharedStopWords | None" = None
+
+# Sources layered over the bundled data, lowest first, each with whether it extends the layers below it.
+_source_layers: "tuple[tuple[StopWordsSource, bool], ...]" = ()
+# Fingerprints of the sources each language was last read from, by full language name, and how often one changed.
+_source_fingerprints: dict[str, tuple[tuple[int, object], ...]] = {}
+_source_changes = 0
+
+# Compact stop words by full language name, with the filter chain stamp they were built with.
+_compact_stop_words: "dict[str, tuple[object, CompactStopWords]]" = {}
+_compact_mode = False
+
+# Structures built from several languages, keyed by kind and full names, with the state they were built from.
+_MULTI_LANGUAGE_CACHE_SIZE = 32
+_multi_language_cache: dict[tuple[str, frozenset[str]], tuple[object, tuple[frozenset[str], ...], object]] = {}
+_filters_version = 0
+_hooks: "tuple[Callable[[InstrumentationEvent], None], ...]" = ()
+
+# The inverted index of detect_language(): the global state it was last checked against, the languages,
+# the version of each language's stop words and the stop words it was built from, and the index itself.
+_language_index: (
+    "tuple[object, tuple[str, ...], tuple[object, ...], tuple[tuple[str, ...], ...], dict[str, tuple[int, ...]]] | None"
+) = None
+
+# Resolved language codes and names, normalizers by mode and full language name, and the normalizers they share:
+# one per mode, and one per mode for Turkic languages, each remembering _token_cache_size tokens.
+_resolved_languages: dict[str, str] = {}
+_normalizers: dict[tuple[str, str], tuple[Callable[[str], str], str, Callable[[Iterable[str]], frozenset[str]]]] = {}
+_shared_normalizers: dict[
+    tuple[str, bool], tuple[Callable[[str], str], str, Callable[[Iterable[str]], frozenset[str]]]
+] = {}
+_token_cache_size = 4096
+
+# Lookups are lock-free; these locks serialize loading and registry updates.
+# threading's locks are those of _thread; importing threading itself would add to the import time.
+_registry_lock = _thread.RLock()
+_load_locks: "dict[str, _thread.LockType]" = {}
+
+# Membership sets by language as callers spell it, for the fast path of is_stop_word() and get_stop_words_set().
+# They are only kept while the cache is unbounded, with no hooks, compact mode or shared store, and are all
+# dropped when STOP_WORDS_CACHE.generation moves on from _fast_sets_generation or the filters change.
+_fast_sets: dict[str, frozenset[str]] = {}
+_fast_sets_generation = -1
+
+# In the workers of filter_documents(): the stop words sent by the calling process, and their matchers by kind.
+_worker_stop_words: Container[str] = frozenset()
+_worker_matchers: "dict[str, re.Pattern[str]]" = {}
+
+
+def _get_index() -> "StopWordsIndex | None":
+    """
+    Open the compiled index that belongs to STOP_WORDS_DIR.
+
+    :returns: The index, or None if it was not built, is invalid, or languages.json changed since it was built.
+    """
+    from ._index import StopWordsIndex, index_path
+
+    path = index_path(STOP_WORDS_DIR)
+    if path not in _indexes:
+        with _registry_lock:
+            if path not in _indexes:
+                try:
+                    index: "StopWordsIndex | None" = StopWordsIndex(path)
+                except (OSError, ValueError):
+                    index = None
+                if index is not None and not index.is_current(STOP_WORDS_DIR):
+                    index.close()
+                    index = None
+                _indexes[path] = index
+
+    return _indexes[path]
+
+
+def _load_language_mapping() -> dict[str, str]:
+    """
+    Load the language code mapping, preferring the compiled index over languages.json.
+
+    :returns: Mapping of language codes to full language names.
+    """
+    import json
+
+    index = _get_index()
+    if index is not None:
+        return dict(index.mapping)
+
+    with (STOP_WORDS_DIR / "languages.json").open("r", encoding="utf-8") as f:
+        mapping: dict[str, str] = json.load(f)
+    return mapping
+
+
+# Language mapping configuration, loaded on first access by __getattr__()
+LANGUAGE_MAPPING: dict[str, str]
+AVAILABLE_LANGUAGES: list[str]
+
+
+# Public classes re-exported from the submodules defining them, imported on first access.
+_LAZY_EXPORTS = {
+    "CompactStopWords": "_compact",
+    "InstrumentationEvent": "_instrumentation",
+    "StopWordsStats": "_instrumentation",
+    **dict.fromkeys(
+        ["CaseFold", "DeclarativeFilter", "Exclude", "Include", "MaxLength", "MinLength", "RejectPattern", "fuse"],
+        "_pipeline",
+    ),
+    **dict.fromkeys(["DirectorySource", "MemorySource", "StopWordsSource"], "_sources"),
+}
+
+
+def __getattr__(name: str) -> object:
+    """
+    Resolve the lazily loaded module attributes on first access.
+
+    The value is then stored as a regular module global, so this only runs once per name.
+
+    :param name: The attribute being looked up.
+
+    :returns: The attribute value.
+    :raises AttributeError: If the module has no such attribute.
+    """
+    if name == "LANGUAGE_MAPPING":
+        value: object = _load_language_mapping()
+    elif name == "AVAILABLE_LANGUAGES":
+        value = list(_language_mapping().values())
+    elif name in _LAZY_EXPORTS:
+        from importlib import import_module
+
+        value = getattr(import_module(f".{_LAZY_EXPORTS[name]}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Another thread may have won the race; everyone gets the same object.
+    return globals().setdefault(name, value)
+
+
+def _language_mapping() -> dict[str, str]:
+    """Get LANGUAGE_MAPPING, loading it on first use."""
+    try:
+        return LANGUAGE_MAPPING
+    except NameError:
+        return __getattr__("LANGUAGE_MAPPING")  # type: ignore[return-value]
+
+
+def _available_languages() -> list[str]:
+    """Get AVAILABLE_LANGUAGES, loading it on first use."""
+    try:
+        return AVAILABLE_LANGUAGES
+    except NameError:
+        return __getattr__("AVAILABLE_LANGUAGES")  # type: ignore[return-value]
+
+
+class StopWordError(Exception):
+    """Raised when a requested language is unavailable or files are unreadable."""
+
+    pass
+
+
+def get_version() -> str:
+    """
+    Get the version of the stop words library.
+
+    :returns: The version string from _version module.
+    """
+    from ._version import __version__  # type: ignore
+
+    return __version__
+
+
+@overload
+def get_stop_words(language: str, *, cache: bool = ..., copy: Literal[True] = ...) -> list[str]: ...
+
+
+@overload
+def get_stop_words(language: str, *, cache: bool = ..., copy: Literal[False]) -> tuple[str, ...]: ...
+
+
+@overload
+def get_stop_words(language: str, *, cache: bool = ..., copy: bool = ...) -> Sequence[str]: ...
+
+
+def get_stop_words(language: str, *, cache: bool = True, copy: bool = True) -> Sequence[str]:
+    """
+    Load stop words for a specified language.
+
+    :param language: Language code (e.g., 'en', 'es') or full name (e.g., 'english', 'spanish').
+        Supports both ISO codes and full language names via LANGUAGE_MAPPING.
+    :param cache: If True, cache the results for faster subsequent access. Defaults to True.
+    :param copy: If True, return a new list the caller may modify. If False, return the
+        cached tuple itself, which avoids copying and cannot be modified. Defaults to True.
+
+    :returns: A list of stop words for the specified language, or a tuple when copy is False.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> words = get_stop_words('en')
+        >>> 'the' in words
+        True
+        >>> 'the' in get_stop_words('en', copy=False)
+        True
+    """
+    stop_words = _load_stop_words(_resolve_language(language), cache=cache)
+    return list(stop_words) if copy else stop_words
+
+
+@overload
+async def aget_stop_words(language: str, *, cache: bool = ..., copy: Literal[True] = ...) -> list[str]: ...
+
+
+@overload
+async def aget_stop_words(language: str, *, cache: bool = ..., copy: Literal[False]) -> tuple[str, ...]: ...
+
+
+@overload
+async def aget_stop_words(language: str, *, cache: bool = ..., copy: bool = ...) -> Sequence[str]: ...
+
+
+async def aget_stop_words(language: str, *, cache: bool = True, copy: bool = True) -> Sequence[str]:
+    """
+    Load stop words for a specified language without blocking the event loop.
+
+    Cache hits are answered right away; anything that may read files, including
+    the first access to LANGUAGE_MAPPING, runs get_stop_words() in a worker thread.
+
+    :param language: Language code (e.g., 'en') or full name (e.g., 'english').
+    :param cache: If True, cache the results for faster subsequent access. Defaults to True.
+    :param copy: If True, return a new list the caller may modify. If False, return the
+        cached tuple itself. Defaults to True.
+
+    :returns: A list of stop words for the specified language, or a tuple when copy is False.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> words = await aget_stop_words('en')
+    """
+    if cache and "LANGUAGE_MAPPING" in globals():
+        name = _resolve_language(language)
+        if STOP_WORDS_CACHE.lookup(name, _filter_chain(name), count=False) is not None:
+            return get_stop_words(name, copy=copy)
+
+    import asyncio
+
+    return await asyncio.to_thread(get_stop_words, language, cache=cache, copy=copy)
+
+
+def get_stop_words_set(language: str, *, cache: bool = True, normalize: Normalization | None = None) -> frozenset[str]:
+    """
+    Load stop words for a specified language as an immutable set.
+
+    The set is built once per cached language and normalization mode and
+    shared between callers, making it the cheapest way to test many tokens
+    for membership.
+
+    :param language: Language code (e.g., 'en') or full name (e.g., 'english').
+    :param cache: If True, cache the results for faster subsequent access. Defaults to True.
+    :param normalize: Normalize the stop words: 'casefold' folds case (e.g., 'ß' to 'ss'), 'nfkc' also folds
+        compatibility characters and composed accents, 'accents' also removes accents. Tokens must be normalized
+        the same way, as is_stop_word() does. Defaults to None, for the stop words as they are.
+
+    :returns: A frozenset of stop words for the specified language.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+    :raises ValueError: If the normalization mode is unknown.
+
+    Example:
+        >>> 'the' in get_stop_words_set('en')
+        True
+        >>> 'uber' in get_stop_words_set('de', normalize='accents')
+        True
+    """
+    if normalize is None and cache:
+        # Fast path: a remembered set, valid while no cache entry was added, replaced or removed.
+        if _fast_sets_generation == STOP_WORDS_CACHE.generation:
+            fast_set = _fast_sets.get(language)
+            if fast_set is not None:
+                STOP_WORDS_CACHE.count_hit()
+                return fast_set
+        return _stop_words_set(language)
+
+    language = _resolve_language(language)
+    stop_words = _load_stop_words(language, cache=cache)
+
+    if normalize is None:
+        return frozenset(stop_words)
+
+    _, kind, build = _get_normalization(normalize, language)
+    return STOP_WORDS_CACHE.derive(language, stop_words, kind, build) if cache else build(stop_words)
+
+
+def _stop_words_set(language: str) -> frozenset[str]:
+    """
+    Get the cached frozenset of a language, and remember it for the fast path when the cache state allows it.
+
+    :param language: Language code or full name, as the caller spelled it.
+
+    :returns: The frozenset of the filtered stop words.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+    """
+    global _fast_sets_generation
+
+    state = (STOP_WORDS_CACHE.generation, _filters_version)
+    name = _resolve_language(language)
+    # The set lives on the cache entry it was built from, and is evicted with it.
+    words = STOP_WORDS_CACHE.derive(name, _load_stop_words(name), "set", frozenset)
+
+    # A set is only remembered if it was a cache hit: a miss changes the generation, so the next call remembers it.
+    if (
+        STOP_WORDS_CACHE.max_languages is None
+        and STOP_WORDS_CACHE.max_bytes is None
+        and not _hooks
+        and not _compact_mode
+        and _shared_store is None
+    ):
+        with _registry_lock:
+            if state == (STOP_WORDS_CACHE.generation, _filters_version):
+                if _fast_sets_generation != state[0]:
+                    _fast_sets.clear()
+                    _fast_sets_generation = state[0]
+                _fast_sets[language] = words
+
+    return words
+
+
+def get_stop_words_multi(languages: str | Iterable[str]) -> frozenset[str]:
+    """
+    Load the union of the stop words of several languages as an immutable set.
+
+    The union is cached per set of languages, so repeated calls with the same
+    languages (in any order, by code or by name) return the same object until
+    the cache or the filters change.
+
+    :param languages: Language codes or full names, or 'all' for every available language.
+
+    :returns: A frozenset of the stop words of all the given languages.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+
+    Example:
+        >>> words = get_stop_words_multi(['en', 'fr'])
+        >>> 'the' in words and 'le' in words
+        True
+    """
+    return _derive_from_languages("union", _resolve_languages(languages), lambda _, parts: frozenset().union(*parts))
+
+
+def _resolve_languages(languages: str | Iterable[str]) -> list[str]:
+    """
+    Normalize language codes or names, or 'all', to sorted, unique full language names.
+
+    :param languages: A language code or name, several of them, or 'all' for every available language.
+
+    :returns: The full language names.
+    :raises StopWordError: If a language is not available.
+    """
+    if isinstance(languages, str):
+        languages = [languages]
+    return sorted(
+        {
+            name
+            for language in languages
+            for name in (_available_languages() if language == "all" else (_resolve_language(language),))
+        }
+    )
+
+
+def _derive_from_languages(
+    kind: str, languages: Sequence[str], factory: Callable[[Sequence[str], tuple[frozenset[str], ...]], T]
+) -> T:
+    """
+    Get a structure built from the stop word sets of several languages, building it once.
+
+    The structure is rebuilt only when one of the sets it was built from
+    changed, e.g., after a filter change or an eviction.
+
+    :param kind: Name of the structure, e.g., 'union'.
+    :param languages: Full language names, in the order the factory expects them.
+    :param factory: Builds the structure from the languages and their stop word sets.
+
+    :returns: The structure.
+    :raises StopWordError: If a file cannot be read.
+    """
+    key = (kind, frozenset(languages))
+
+    # Nothing can have changed if neither the cache nor the filters did.
+    entry = _multi_language_cache.get(key)
+    if entry is not None and entry[0] == (STOP_WORDS_CACHE.generation, _filters_version):
+        return cast(T, entry[2])
+
+    parts = tuple(get_stop_words_set(language) for language in languages)
+    state = (STOP_WORDS_CACHE.generation, _filters_version)
+    if entry is not None and len(parts) == len(entry[1]) and all(map(operator.is_, parts, entry[1])):
+        value = cast(T, entry[2])
+    else:
+        value = factory(languages, parts)
+
+    with _registry_lock:
+        _multi_language_cache.pop(key, None)
+        if len(_multi_language_cache) >= _MULTI_LANGUAGE_CACHE_SIZE:
+            del _multi_language_cache[next(iter(_multi_language_cache))]
+        _multi_language_cache[key] = (state, parts, value)
+
+    return value
+
+
+def is_stop_word(word: str, language: str, *, normalize: Normalization | None = None) -> bool:
+    """
+    Check whether a word is a stop word in the specified language.
+
+    :param word: The word to look up.
+    :param language: Language code or full name.
+    :param normalize: Normalize the word and the stop words before comparing them, as in
+        get_stop_words_set(). Defaults to None, for an exact, case-sensitive comparison.
+
+    :returns: True if the word is a stop word, False otherwise.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+    :raises ValueError: If the normalization mode is unknown.
+
+    Example:
+        >>> is_stop_word('the', 'en')
+        True
+        >>> is_stop_word('ÜBER', 'de', normalize='casefold')
+        True
+    """
+    if normalize is not None:
+        language = _resolve_language(language)
+        normalize_word, kind, build = _get_normalization(normalize, language)
+        return normalize_word(word) in STOP_WORDS_CACHE.derive(language, _load_stop_words(language), kind, build)
+
+    # Fast path: a remembered set, valid while no cache entry was added, replaced or removed.
+    if _fast_sets_generation == STOP_WORDS_CACHE.generation:
+        words = _fast_sets.get(language)
+        if words is not None:
+            STOP_WORDS_CACHE.count_hit()
+            return word in words
+
+    store = _shared_store
+    if store is not None:
+        # The store holds the unfiltered, bundled words, so it can only answer while no filter or source applies.
+        language = _resolve_language(language)
+        if language in store and not _filters.get(language) and not _filters[None] and not _source_layers:
+            return store.contains(word, language)
+
+    return word in _membership(language)
+
+
+def get_compact_stop_words(language: str) -> "CompactStopWords":
+    """
+    Get the stop words of a language in compact form, building it once.
+
+    The compact form stores the hashes of the words in a sorted array and the
+    words in a single string, a fraction of the memory of a list or frozenset
+    of str objects. Lookups binary-search the hashes, so they are much slower
+    than a frozenset's: fast enough for most uses, but not for hot loops. The
+    compact form is kept outside of STOP_WORDS_CACHE and does not add the
+    language to it. It is rebuilt after a filter change.
+
+    :param language: Language code or full name.
+
+    :returns: The compact stop words, supporting ``in``, len() and iteration.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> 'the' in get_compact_stop_words('en')
+        True
+    """
+    language = _resolve_language(language)
+    stamp = _filter_chain(language)
+    entry = _compact_stop_words.get(language)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    # Reuse cached stop words if there are any, without caching them otherwise.
+    stop_words = STOP_WORDS_CACHE.lookup(language, stamp, count=False)
+    if stop_words is None:
+        stop_words = _load_stop_words(language, cache=False)
+    from ._compact import CompactStopWords
+
+    compact = CompactStopWords(stop_words)
+    with _registry_lock:
+        _compact_stop_words[language] = (stamp, compact)
+
+    return compact
+
+
+def _membership(language: str) -> Container[str]:
+    """
+    Get what membership checks of a language run against: its compact stop words in compact mode, else its frozenset.
+
+    :param language: Language code or full name.
+
+    :returns: The stop words, supporting ``in``.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+    """
+    return get_compact_stop_words(language) if _compact_mode else _stop_words_set(language)
+
+
+def get_normalizer(language: str, normalize: Normalization) -> Callable[[str], str]:
+    """
+    Get the function that normalizes tokens for get_stop_words_set(language, normalize=...).
+
+    Fetching it and the set once outside of a loop is the fastest way to check
+    many tokens. The function remembers recently normalized tokens.
+
+    :param language: Language code or full name.
+    :param normalize: Normalization mode, as in get_stop_words_set().
+
+    :returns: A function normalizing one token.
+    :raises StopWordError: If the language is not available.
+    :raises ValueError: If the normalization mode is unknown.
+
+    Example:
+        >>> normalize_word = get_normalizer('de', 'accents')
+        >>> stop_words = get_stop_words_set('de', normalize='accents')
+        >>> [token for token in ['ÜBER', 'Straße'] if normalize_word(token) not in stop_words]
+        ['Straße']
+    """
+    return _get_normalization(normalize, _resolve_language(language))[0]
+
+
+def _get_normalization(
+    normalize: str, language: str
+) -> tuple[Callable[[str], str], str, Callable[[Iterable[str]], frozenset[str]]]:
+    """
+    Get the cached normalizer of a mode for a language, building it on first use.
+
+    Languages share the normalizer of a mode, and so the tokens it remembers,
+    except Turkic languages, which share another one.
+
+    :param normalize: Normalization mode.
+    :param language: Full language name.
+
+    :returns: A function normalizing one word, which remembers recent words, the name of the
+        normalized set derived from cache entries, and a function building that set.
+    :raises ValueError: If the normalization mode is unknown.
+    """
+    normalization = _normalizers.get((normalize, language))
+    if normalization is None:
+        from ._normalize import TURKIC_LANGUAGES, build_normalizer
+
+        key = (normalize, language in TURKIC_LANGUAGES)
+        with _registry_lock:
+            normalization = _shared_normalizers.get(key)
+            if normalization is None:
+                normalize_word = build_normalizer(normalize, key[1], _token_cache_size)
+
+                def build(words: Iterable[str]) -> frozenset[str]:
+                    return frozenset(map(normalize_word, words))
+
+                normalization = _shared_normalizers[key] = (normalize_word, f"set:{normalize}", build)
+            _normalizers[(normalize, language)] = normalization
+
+    return normalization
+
+
+def remove_stop_words(tokens: Iterable[str], language: str) -> Iterator[str]:
+    """
+    Lazily drop stop words from an iterable of tokens.
+
+    Tokens are consumed one at a time, so arbitrarily long streams (e.g., a
+    generator reading a file) are processed in constant memory. The language
+    is resolved immediately, so an unavailable language raises here rather
+    than on first iteration.
+
+    :param tokens: Any iterable of tokens. Matching is exact (case-sensitive).
+    :param language: Language code or full name.
+
+    :returns: An iterator over the tokens that are not stop words, in order.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> list(remove_stop_words(['the', 'quick', 'fox'], 'en'))
+        ['quick', 'fox']
+    """
+    stop_words = _membership(language)
+    return (token for token in tokens if token not in stop_words)
+
+
+def remove_stop_words_batch(batches: Iterable[Iterable[str]], language: str) -> list[list[str]]:
+    """
+    Drop stop words from several token sequences at once.
+
+    :param batches: An iterable of token iterables, e.g., one list of tokens per document.
+    :param language: Language code or full name.
+
+    :returns: One list of remaining tokens per input batch, in order.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> remove_stop_words_batch([['the', 'fox'], ['a', 'dog']], 'en')
+        [['fox'], ['dog']]
+    """
+    stop_words = _membership(language)
+    return [[token for token in tokens if token not in stop_words] for tokens in batches]
+
+
+def stop_word_mask(tokens: Any, language: str | Iterable[str] | Mapping[Any, str]) -> Any:
+    """
+    Compute a boolean mask of the stop words in a NumPy array or pandas object.
+
+    Requires NumPy (``pip install "stop-words[numpy]"``). Fixed-width string
+    arrays are binary-searched in a sorted array of the stop words, other
+    arrays and pandas objects are checked against the cached frozenset. Both
+    structures are built once per language, or set of languages, and cached.
+    Matching is exact (case-sensitive); non-string values are never stop words.
+
+    :param tokens: A NumPy array of any shape, a pandas Series, Index or DataFrame,
+        or anything np.asarray() accepts, e.g., a list of tokens.
+    :param language: A language code or full name; several of them, or 'all', to match the
+        stop words of any of them; or, for a DataFrame, a mapping of column labels to languages.
+
+    :returns: A boolean NumPy array of the same shape, or a boolean Series or DataFrame with
+        the same labels for a Series or DataFrame.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+    :raises ImportError: If NumPy is not installed.
+    :raises KeyError: If a DataFrame column is missing from a language mapping.
+    :raises TypeError: If a language mapping is given for anything but a DataFrame.
+
+    Example:
+        >>> stop_word_mask(np.array(['the', 'fox']), 'en')
+        array([ True, False])
+        >>> df[stop_word_mask(df['token'], 'en')]  # rows whose token is a stop word
+        >>> stop_word_mask(df[['title_en', 'title_fr']], {'title_en': 'en', 'title_fr': 'fr'})
+    """
+    try:
+        from . import _vectorized
+    except ImportError as e:
+        raise ImportError('stop_word_mask() requires NumPy: pip install "stop-words[numpy]"') from e
+
+    def lookup(languages: str | Iterable[str]) -> tuple[frozenset[str], Callable[[], Any]]:
+        names = _resolve_languages(languages)
+        if len(names) == 1:
+            (name,) = names
+            words = get_stop_words_set(name)
+            return words, lambda: STOP_WORDS_CACHE.derive(
+                name, _load_stop_words(name), "sorted_array", _vectorized.build_sorted_array
+            )
+
+        return get_stop_words_multi(names), lambda: _derive_from_languages(
+            "sorted_array", names, lambda _, parts: _vectorized.build_sorted_array(frozenset().union(*parts))
+        )
+
+    if not isinstance(language, Mapping):
+        structures = lookup(language)
+        return _vectorized.stop_word_mask(tokens, lambda _: structures)
+
+    def lookup_column(column: object) -> tuple[frozenset[str], Callable[[], Any]]:
+        if column is None:
+            raise TypeError("A mapping of columns to languages can only be used with a pandas DataFrame.")
+        return lookup(language[column])
+
+    return _vectorized.stop_word_mask(tokens, lookup_column)
+
+
+def detect_language(text_or_tokens: str | Iterable[str], candidates: Iterable[str] | None = None) -> str | None:
+    """
+    Guess the language of a text from the stop words it contains.
+
+    Every token is looked up once in an inverted index that maps each stop
+    word to the languages containing it, so the cost does not grow with the
+    number of candidate languages. Tokens are lowercased before lookup. The
+    index is built on first use, without adding languages to the cache, and
+    only the languages whose filters or sources changed are read again. It
+    covers the languages of AVAILABLE_LANGUAGES and those added by sources.
+
+    :param text_or_tokens: A text, split into words on non-word characters, or an iterable of tokens.
+    :param candidates: Language codes or full names to choose from. Defaults to all languages, including
+        those added by sources.
+
+    :returns: The full name of the language with the most stop word hits, or None if no token is a stop word.
+        Ties go to the language listed first in AVAILABLE_LANGUAGES, then to the languages of sources added first.
+    :raises StopWordError: If a candidate is not available or a file cannot be read.
+
+    Example:
+        >>> detect_language('Le chat est sur la table')
+        'french'
+        >>> detect_language(['the', 'cat', 'is', 'here'], candidates=['en', 'fr'])
+        'english'
+    """
+    names = None if candidates is None else {_resolve_language(candidate) for candidate in candidates}
+    languages, index = _get_language_index()
+    if names is not None and not names.issubset(languages):
+        # A source started to provide a language since the index was last checked.
+        languages, index = _get_language_index(refresh=True)
+    tokens = _tokenize(text_or_tokens) if isinstance(text_or_tokens, str) else map(str.lower, text_or_tokens)
+
+    # Every token adds one hit to each language containing it.
+    scores = [0] * len(languages)
+    for hits in filter(None, map(index.get, tokens)):
+        for position in hits:
+            scores[position] += 1
+
+    if names is None:
+        best = scores.index(max(scores, default=0)) if scores else None
+    else:
+        # Sorted, so ties still go to the language listed first.
+        allowed = sorted(map(languages.index, names))
+        best = max(allowed, key=scores.__getitem__, default=None)
+
+    return languages[best] if best is not None and scores[best] else None
+
+
+def _get_language_index(*, refresh: bool = False) -> tuple[tuple[str, ...], dict[str, tuple[int, ...]]]:
+    """
+    Get the inverted index of detect_language(), building or refreshing it as needed.
+
+    The index covers the available languages followed by those only sources
+    provide. It follows the filters, the sources and the directly assigned
+    cache entries, not the cache contents, so loading or evicting languages
+    keeps it. When one of them changed, or reload_changed() was called, the
+    languages are listed again and only those whose filter chain, source
+    fingerprints or assigned stop words changed are read again. Languages that
+    are not cached are read without caching them, so a bounded cache keeps its
+    languages.
+
+    :param refresh: Check the languages and their versions even if nothing changed.
+
+    :returns: The languages, and the positions of the languages containing each word.
+    :raises StopWordError: If a file cannot be read.
+    """
+    global _language_index
+
+    state = (_filters_version, _source_layers, _source_changes, STOP_WORDS_CACHE.assignments)
+    current = _language_index
+    if not refresh and current is not None and current[0] == state:
+        return current[1], current[4]
+
+    sources = _source_layers
+    languages = tuple(
+        dict.fromkeys([*_available_languages(), *(name for source, _ in sources for name in source.languages())])
+    )
+    previous = dict(zip(current[1], zip(current[2], current[3]))) if current is not None else {}
+    versions = []
+    stop_word_lists = []
+    for language in languages:
+        chain = _filter_chain(language)
+        assigned = STOP_WORDS_CACHE.get(language) if STOP_WORDS_CACHE.stamp(language) is None else None
+        version = (chain, _fingerprint(language, sources), assigned)
+        built = previous.get(language)
+        if built is not None and built[0] == version:
+            words = built[1]
+        elif assigned is not None:
+            words = assigned
+        else:
+            cached = STOP_WORDS_CACHE.lookup(language, chain, count=False)
+            words = cached if cached is not None else _load_stop_words(language, cache=False)
+        versions.append(version)
+        stop_word_lists.append(words)
+
+    if current is not None and languages == current[1] and all(map(operator.is_, stop_word_lists, current[3])):
+        index = current[4]
+    else:
+        index = _build_inverted_index(stop_word_lists)
+    _language_index = (state, languages, tuple(versions), tuple(stop_word_lists), index)
+    return languages, index
+
+
+def _build_inverted_index(stop_word_lists: Sequence[Iterable[str]]) -> dict[str, tuple[int, ...]]:
+    """
+    Map every stop word to the positions of the languages that contain it.
+
+    :param stop_word_lists: The stop words of each language.
+
+    :returns: The word-to-positions index. Words found in the same languages share one tuple.
+    """
+    masks: dict[str, int] = {}
+    for position, words in enumerate(stop_word_lists):
+        bit = 1 << position
+        for word in words:
+            masks[word] = masks.get(word, 0) | bit
+
+    positions: dict[int, tuple[int, ...]] = {}
+    for mask in set(masks.values()):
+        positions[mask] = tuple(position for position in range(mask.bit_length()) if mask >> position & 1)
+
+    return {word: positions[mask] for word, mask in masks.items()}
+
+
+def find_stop_words(text: str, language: str | Iterable[str]) -> list[tuple[int, int]]:
+    """
+    Find the stop words in a raw text, without tokenizing it first.
+
+    Stop words are matched case-insensitively as whole words: a match must not
+    be preceded or followed by a word character. Where stop words overlap, the
+    longest one wins, so multi-word entries are found as a whole.
+
+    :param text: The text to search.
+    :param language: Language code or full name, or several of them to find the stop words of any.
+
+    :returns: The (start, end) offsets of every stop word in the text, in order.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> find_stop_words('The fox and the dog', 'en')
+        [(0, 3), (8, 11), (12, 15)]
+    """
+    return [match.span("word") for match in _match_stop_words(text, language)]
+
+
+def strip_stop_words(text: str, language: str | Iterable[str]) -> str:
+    """
+    Remove the stop words from a raw text, without tokenizing it first.
+
+    Stop words are matched like find_stop_words() does, and removed together
+    with the whitespace that follows them. Everything else, including case and
+    punctuation, is kept as is.
+
+    :param text: The text to clean.
+    :param language: Language code or full name, or several of them to remove the stop words of all.
+
+    :returns: The text without its stop words.
+    :raises StopWordError: If the language is not available or the file cannot be read.
+
+    Example:
+        >>> strip_stop_words('The fox and the dog', 'en')
+        'fox dog'
+    """
+    return _strip_matches(text, _match_stop_words(text, language))
+
+
+def _strip_matches(text: str, matches: "Iterable[re.Match[str]]") -> str:
+    """Remove the spans of the matches from a text, for strip_stop_words()."""
+    parts = []
+    position = 0
+    for match in matches:
+        start, end = match.span()
+        parts.append(text[position:start])
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def filter_documents(
+    documents: Iterable[str | Iterable[str]],
+    language: str | Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = 64,
+    mp_context: "BaseContext | None" = None,
+) -> Iterator[str | list[str]]:
+    """
+    Remove the stop words from many documents on a process pool.
+
+    Raw text documents are cleaned like strip_stop_words() does, tokenized
+    documents like remove_stop_words() does. Documents are sent to the
+    workers in chunks, and at most two chunks per worker are in flight at a
+    time, so arbitrarily long iterables are processed with bounded memory.
+    Results are yielded in the order of the documents.
+
+    The stop words are loaded and filtered in this process, and sent to each
+    worker once, when it starts; tasks only carry documents. Filters, sources
+    and compact mode therefore apply in the workers whatever the start method.
+
+    :param documents: Raw texts, or iterables of tokens, in any mix.
+    :param language: Language code or full name, or several of them to remove the stop words of all.
+    :param workers: Number of processes, or None for the number of CPUs.
+    :param chunksize: Number of documents sent to a worker at once.
+    :param mp_context: Multiprocessing context the workers are started from, or None for the default.
+
+    :returns: An iterator over the filtered documents: a str for each text, a list of tokens for each iterable.
+    :raises StopWordError: If the language is not available or a file cannot be read. Raised on call, not on
+        iteration.
+    :raises ValueError: If workers or chunksize is not positive.
+
+    Example:
+        >>> with open('corpus.txt') as f:
+        ...     for text in filter_documents(f, 'en', workers=8):
+        ...         ...
+    """
+    import os
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be positive.")
+
+    stop_words: tuple[str, ...]
+    if not isinstance(language, str):
+        stop_words = tuple(get_stop_words_multi(language))
+    elif _compact_mode:
+        stop_words = tuple(get_compact_stop_words(language))
+    else:
+        stop_words = _load_stop_words(_resolve_language(language))
+    return _filter_documents(documents, stop_words, workers, chunksize, mp_context)
+
+
+def _filter_documents(
+    documents: Iterable[str | Iterable[str]],
+    stop_words: tuple[str, ...],
+    workers: int,
+    chunksize: int,
+    mp_context: "BaseContext | None",
+) -> Iterator[str | list[str]]:
+    """Run filter_documents() once the arguments are checked and the stop words loaded."""
+    from collections import deque
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from itertools import islice
+
+    iterator = iter(documents)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_filter_worker,
+        initargs=(stop_words, _compact_mode),
+    ) as executor:
+        in_flight: deque[Future[list[str | list[str]]]] = deque()
+        try:
+            while True:
+                while len(in_flight) < 2 * workers and (chunk := list(islice(iterator, chunksize))):
+                    in_flight.append(executor.submit(_filter_chunk, chunk))
+                if not in_flight:
+                    return
+                yield from in_flight.popleft().result()
+        finally:
+            # If iteration stops early, skip the chunks no worker has started yet.
+            for future in in_flight:
+                future.cancel()
+
+
+def _init_filter_worker(stop_words: tuple[str, ...], compact: bool) -> None:
+    """
+    Build the structures the documents of filter_documents() are checked against, once per worker.
+
+    :param stop_words: The stop words, loaded and filtered by the calling process.
+    :param compact: Whether the calling process is in compact mode.
+    """
+    global _worker_stop_words, _worker_matchers
 
+    if compact:
+        from ._compact import CompactStopWords
 
-# Directory configuration
-CURRENT_DIR = Path(__file__).resolve().parent
-STOP_WORDS_DIR = CURRENT_DIR / "stop-words"
+        _worker_stop_words = CompactStopWords(stop_words)
+    else:
+        _worker_stop_words = frozenset(stop_words)
+    _worker_matchers = {
+        "matcher": _build_matcher(stop_words),
+        "matcher_ignorecase": _build_ignorecase_matcher(stop_words),
+    }
 
-# Global caches
-STOP_WORDS_CACHE: dict[str, list[str]] = {}
-_filters: dict[str | None, list[Callable[[list[str], str | None], list[str]]]] = {None: []}
 
-# Load language mapping configuration
-_languages_file = STOP_WORDS_DIR / "languages.json"
-with _languages_file.open("r", encoding="utf-8") as f:
-    LANGUAGE_MAPPING: dict[str, str] = json.load(f)
+def _filter_chunk(documents: list[str | Iterable[str]]) -> list[str | list[str]]:
+    """Filter one chunk of documents for filter_documents(), in a worker."""
+    stop_words = _worker_stop_words
+    return [
+        (
+            _strip_in_worker(document)
+            if isinstance(document, str)
+            else [token for token in document if token not in stop_words]
+        )
+        for document in documents
+    ]
 
-AVAILABLE_LANGUAGES: list[str] = list(LANGUAGE_MAPPING.values())
 
+def _strip_in_worker(text: str) -> str:
+    """Remove the stop words of a filter_documents() worker from a text, like strip_stop_words() does."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return _strip_matches(text, _worker_matchers["matcher"].finditer(lowered))
 
-class StopWordError(Exception):
-    """Raised when a requested language is unavailable or files are unreadable."""
+    return _strip_matches(text, _worker_matchers["matcher_ignorecase"].finditer(text))
 
-    pass
 
+def _match_stop_words(text: str, language: str | Iterable[str]) -> "Iterator[re.Match[str]]":
+    """
+    Match the stop words of one or more languages in a text with their cached, compiled matcher.
+
+    The matcher runs on the lowercased text, whose offsets are those of the
+    original text unless lowercasing changed its length; a case-insensitive
+    matcher is used for such texts.
 
-def get_version() -> str:
+    :param text: The text to search.
+    :param language: Language code or full name, or several of them.
+
+    :returns: An iterator over the matches, with the stop word in the 'word' group.
+    :raises StopWordError: If a language is not available or a file cannot be read.
     """
-    Get the version of the stop words library.
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return _get_matcher(language, "matcher", _build_matcher).finditer(lowered)
 
-    :returns: The version string from _version module.
+    return _get_matcher(language, "matcher_ignorecase", _build_ignorecase_matcher).finditer(text)
+
+
+def _get_matcher(
+    language: str | Iterable[str], kind: str, build: "Callable[[Iterable[str]], re.Pattern[str]]"
+) -> "re.Pattern[str]":
     """
-    from ._version import __version__  # type: ignore
+    Get the compiled matcher of one language, cached with its stop words, or of several, cached for their union.
 
-    return __version__
+    :param language: Language code or full name, or several of them.
+    :param kind: Name of the matcher, 'matcher' or 'matcher_ignorecase'.
+    :param build: Compiles the matcher from stop words.
+
+    :returns: The compiled matcher.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+    """
+    if isinstance(language, str):
+        language = _resolve_language(language)
+        return STOP_WORDS_CACHE.derive(language, _load_stop_words(language), kind, build)
+
+    return _derive_from_languages(
+        kind, _resolve_languages(language), lambda _, stop_word_sets: build(frozenset().union(*stop_word_sets))
+    )
 
 
-def get_stop_words(language: str, *, cache: bool = True) -> list[str]:
+def _build_matcher(stop_words: Iterable[str], flags: int = 0) -> "re.Pattern[str]":
     """
-    Load stop words for a specified language.
+    Compile stop words into a single regular expression.
 
-    :param language: Language code (e.g., 'en', 'es') or full name (e.g., 'english', 'spanish').
-        Supports both ISO codes and full language names via LANGUAGE_MAPPING.
-    :param cache: If True, cache the results for faster subsequent access. Defaults to True.
+    The words are merged into a trie first, so the alternation shares common
+    prefixes and the regex engine tries at most one branch per character,
+    instead of every word in turn. Spaces inside multi-word entries match any
+    run of whitespace.
 
-    :returns: A list of stop words for the specified language. Returns a copy to prevent external modification.
-    :raises StopWordError: If the language is not available or the file cannot be read.
+    :param stop_words: The stop words, lowercased here like the texts they are matched in.
+    :param flags: Extra regular expression flags.
 
-    Example:
-        >>> words = get_stop_words('en')
-        >>> 'the' in words
-        True
+    :returns: A pattern matching whole stop words in the 'word' group, and the whitespace after them.
+    """
+    import re
+
+    trie: dict[str, dict] = {}
+    for word in map(str.lower, stop_words):
+        if word:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+    def render(node: dict[str, dict]) -> str:
+        branches = [
+            (r"\s+" if char.isspace() else re.escape(char)) + render(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy: a longer word is preferred over the shorter word it extends.
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    words = render(trie) if trie else "(?!)"
+    return re.compile(rf"(?<!\w)(?P<word>{words})(?!\w)\s*", flags)
+
+
+def _build_ignorecase_matcher(stop_words: Iterable[str]) -> "re.Pattern[str]":
+    """Compile stop words into a case-insensitive matcher; see _build_matcher()."""
+    import re
+
+    return _build_matcher(stop_words, re.IGNORECASE)
+
+
+def _tokenize(text: str) -> list[str]:
+    """
+    Split a text into lowercase words, keeping inner apostrophes (e.g., "don't").
+
+    :param text: The text to split.
+
+    :returns: The words.
+    """
+    import re
+
+    return re.findall(r"\w+(?:['’]\w+)*", text.lower())
+
+
+def _resolve_language(language: str) -> str:
+    """
+    Normalize a language code or name to the full language name.
+
+    :param language: Language code (e.g., 'en') or full name (e.g., 'english').
+
+    :returns: The full language name.
+    :raises StopWordError: If the language is not available.
     """
-    # Normalize language code to full name
     try:
-        language = LANGUAGE_MAPPING[language]
+        return _resolved_languages[language]
     except KeyError:
-        if language not in AVAILABLE_LANGUAGES:
-            raise StopWordError(
-                f'Language "{language}" is unavailable. '
-                f'Available languages: {", ".join(sorted(AVAILABLE_LANGUAGES))}'
-            )
+        pass
+
+    name = _language_mapping().get(language, language)
+    available_languages = _available_languages()
+    if name not in available_languages and not any(name in source.languages() for source, _ in _source_layers):
+        raise StopWordError(
+            f'Language "{language}" is unavailable. ' f'Available languages: {", ".join(sorted(available_languages))}'
+        )
+
+    # Only valid codes and names are remembered, so this stays as small as the mapping.
+    _resolved_languages[language] = name
+    return name
+
+
+def _load_stop_words(language: str, *, cache: bool = True) -> tuple[str, ...]:
+    """
+    Return the filtered stop words of a language, loading them if needed.
+
+    The returned tuple is the cached object itself when caching is enabled.
+    Concurrent cache misses for the same language are single-flight: one
+    thread loads while the others wait for its result. Cached entries built
+    with a different filter chain are re-filtered from their raw words,
+    without reading the source again.
+
+    :param language: Full language name, as returned by _resolve_language().
+    :param cache: If True, read from and store into STOP_WORDS_CACHE.
+
+    :returns: The filtered stop words.
+    :raises StopWordError: If the file cannot be read.
+    """
+    if not cache:
+        return tuple(apply_filters(list(_read_stop_words(language)), language))
 
     # Return cached version if available
-    if cache and language in STOP_WORDS_CACHE:
-        return STOP_WORDS_CACHE[language].copy()
+    stop_words = STOP_WORDS_CACHE.lookup(language, _filter_chain(language))
+    if _hooks:
+        _emit("hit" if stop_words is not None else "miss", language)
+    if stop_words is not None:
+        return stop_words
+
+    with _registry_lock:
+        load_lock = _load_locks.setdefault(language, _thread.allocate_lock())
+
+    with load_lock:
+        # Another thread may have loaded it while we were waiting.
+        stamp = _filter_chain(language)
+        stop_words = STOP_WORDS_CACHE.lookup(language, stamp, count=False)
+        if stop_words is None:
+            raw_words = STOP_WORDS_CACHE.raw(language)
+            if raw_words is None:
+                raw_words = _read_stop_words(language)
+            stop_words = tuple(apply_filters(list(raw_words), language))
+            STOP_WORDS_CACHE.store(language, stop_words, raw=raw_words, stamp=stamp)
 
-    # Load stop words from file
+    return stop_words
+
+
+def _read_stop_words(language: str) -> tuple[str, ...]:
+    """
+    Read the raw, unfiltered stop words of a language, bypassing the cache.
+
+    Registered sources are read from the most recently added one down: the
+    first source that provides the language replaces the layers below it,
+    unless it was added to extend them. The bundled data is the bottom layer.
+
+    :param language: Full language name.
+
+    :returns: The stop words as stored in the sources and data files.
+    :raises StopWordError: If a source or file cannot be read.
+    """
+    global _source_changes
+
+    start = time.perf_counter() if _hooks else 0.0
+    sources = _source_layers
+    # Taken before reading, so a change made while reading is picked up by the next reload.
+    fingerprint = _fingerprint(language, sources)
+
+    layers: list[list[str]] = []
+    detail = "source"
+    for source, extend in reversed(sources):
+        try:
+            words = source.read(language)
+        except OSError as e:
+            raise StopWordError(f'Stop words of "{language}" in {source!r} are unreadable. Error: {e}') from e
+        if words is not None:
+            layers.append(words)
+            if not extend:
+                break
+    else:
+        # Languages only provided by sources have no bundled layer.
+        if not layers or language in _available_languages():
+            detail, words = _read_bundled_stop_words(language)
+            layers.append(words)
+
+    if _source_fingerprints.get(language, ()) != fingerprint:
+        _source_changes += 1
+    _source_fingerprints[language] = fingerprint
+    if _hooks:
+        _emit("read", language, time.perf_counter() - start, detail)
+    if len(layers) == 1:
+        return tuple(layers[0])
+    return tuple(dict.fromkeys(word for words in reversed(layers) for word in words))
+
+
+def _read_bundled_stop_words(language: str) -> tuple[str, list[str]]:
+    """
+    Read the bundled stop words of a language.
+
+    :param language: Full language name.
+
+    :returns: Where they were read from ('shared store', 'index' or 'file'), and the stop words as stored.
+    :raises StopWordError: If the file cannot be read.
+    """
+    from ._index import read_words
+
+    store = _shared_store
     language_file = STOP_WORDS_DIR / f"{language}.txt"
 
+    # Load stop words from the shared store or the compiled index, falling back to the text file
     try:
-        with language_file.open("r", encoding="utf-8") as f:
-            stop_words = [line.strip() for line in f if line.strip()]
-            stop_words = apply_filters(stop_words, language)
+        if store is not None and language in store:
+            return "shared store", store.read(language)
+        # Text files edited since the index was built win over it.
+        if (index := _get_index()) is not None and language in index and index.is_current(STOP_WORDS_DIR, language):
+            return "index", index.read(language)
+        return "file", read_words(language_file)
     except (IOError, OSError) as e:
         raise StopWordError(f'File "{language_file}" is unreadable. Check your installation. Error: {e}') from e
 
-    # Cache if requested
-    if cache:
-        STOP_WORDS_CACHE[language] = stop_words
 
-    return stop_words.copy()
+def _filter_chain(language: str) -> tuple[object, object]:
+    """
+    Identify the filters that apply to a language.
+
+    The registry replaces a filter list whenever it changes, so the stamp
+    changes for the affected languages only: a language-specific filter
+    changes the stamp of its language, a global filter that of all languages.
+
+    :param language: Full language name.
+
+    :returns: A stamp to store with, and compare against, cached entries.
+    """
+    return _filters.get(language), _filters.get(None)
+
+
+def configure_cache(
+    *,
+    max_languages: int | None = None,
+    max_bytes: int | None = None,
+    compact: bool = False,
+    token_cache_size: int = 4096,
+) -> None:
+    """
+    Limit the size of STOP_WORDS_CACHE, or switch membership checks to compact mode.
+
+    With no limits (the default), every loaded language stays cached. With
+    limits, the least recently used languages are evicted to stay within them.
+    Cache statistics are reset.
+
+    In compact mode, is_stop_word(), remove_stop_words(), remove_stop_words_batch()
+    and warm_up() use get_compact_stop_words() instead of frozensets, and no
+    longer load languages into STOP_WORDS_CACHE. This suits processes checking
+    tokens against many languages; languages already cached stay cached until
+    the cache is cleared. Turning compact mode off drops the compact forms.
+
+    Token normalizers (see get_normalizer()) are shared by all languages, one
+    per normalization mode, and remember the last token_cache_size tokens they
+    normalized. Changing the size starts new normalizers, with empty caches.
+
+    :param max_languages: Maximum number of cached languages, or None for no limit.
+    :param max_bytes: Maximum memory of the cached stop words in bytes, as measured
+        with sys.getsizeof(), or None for no limit.
+    :param compact: If True, check membership against compact stop words.
+    :param token_cache_size: Number of normalized tokens each normalizer remembers.
+    :raises ValueError: If a limit is negative.
+
+    Example:
+        >>> configure_cache(max_languages=4)
+        >>> configure_cache(max_bytes=512 * 1024)
+        >>> configure_cache(compact=True)
+    """
+    global _compact_mode, _token_cache_size
+
+    if token_cache_size < 0:
+        raise ValueError("token_cache_size must be non-negative.")
+
+    STOP_WORDS_CACHE.configure(max_languages=max_languages, max_bytes=max_bytes)
+    with _registry_lock:
+        _compact_mode = compact
+        if not compact:
+            _compact_stop_words.clear()
+        _fast_sets.clear()
+        if token_cache_size != _token_cache_size:
+            _token_cache_size = token_cache_size
+            _normalizers.clear()
+            _shared_normalizers.clear()
+
+
+def cache_info() -> CacheInfo:
+    """
+    Get statistics of STOP_WORDS_CACHE.
+
+    :returns: A CacheInfo named tuple with the hits, misses and evictions since the
+        last configure_cache() call, the configured limits, and the number of cached
+        languages and their measured size in bytes.
+
+    Example:
+        >>> words = get_stop_words('en')
+        >>> cache_info().languages >= 1
+        True
+    """
+    return STOP_WORDS_CACHE.info()
+
+
+def warm_up(languages: Iterable[str] | None = None, *, workers: int | None = None) -> dict[str, float]:
+    """
+    Load several languages into STOP_WORDS_CACHE concurrently, e.g., at application startup.
+
+    Each language is loaded on a thread pool together with its frozenset, so
+    later calls to get_stop_words(), get_stop_words_set() and is_stop_word()
+    are cache hits. With a bounded cache, only the languages that fit stay cached.
+    In compact mode, only the compact stop words of each language are built.
+
+    :param languages: Language codes or full names. Defaults to all available languages.
+    :param workers: Number of threads, or None for the ThreadPoolExecutor default.
+
+    :returns: The load time in seconds of each language, by full name.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+
+    Example:
+        >>> timings = warm_up(['en', 'fr'])
+        >>> sorted(timings)
+        ['english', 'french']
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    names = list(dict.fromkeys(map(_resolve_language, _available_languages() if languages is None else languages)))
+
+    def load(language: str) -> float:
+        start = time.perf_counter()
+        _membership(language)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(names, executor.map(load, names)))
+
+
+def preload_for_fork(languages: Iterable[str] | None = None) -> dict[str, float]:
+    """
+    Preload languages in a pre-fork server's master process, before forking workers.
+
+    The languages are loaded with warm_up() into their final form, tuples of
+    words and the frozensets derived from them, so workers build nothing of
+    their own. Every object alive at that point, including the cache, is then
+    moved out of the garbage collector's reach with gc.freeze(). Collections
+    in the workers no longer write to these objects, so their memory pages
+    stay shared with the master instead of being copied into every worker.
+    Reference counting still writes to the objects a worker actually uses.
+
+    Call it once, as late as possible before forking. gc.unfreeze() reverts it.
+
+    :param languages: Language codes or full names. Defaults to all available languages.
+
+    :returns: The load time in seconds of each language, by full name.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+
+    Example:
+        >>> timings = preload_for_fork(['en', 'fr'])  # e.g., in gunicorn's on_starting hook
+    """
+    import gc
+
+    timings = warm_up(languages)
+    # Collect first, so garbage is freed rather than frozen.
+    gc.collect()
+    gc.freeze()
+    return timings
+
+
+def publish_shared_store(path: str | Path, languages: Iterable[str] | None = None) -> Path:
+    """
+    Publish the stop words of several languages into a store other processes can attach to.
+
+    The store holds the raw words of each language, before filters, in one
+    memory-mapped file with a hash table over all of them. It is written
+    atomically, so a store can be replaced while processes are attached to
+    the previous one.
+
+    :param path: Where to write the store, preferably on a memory-backed filesystem such as /dev/shm.
+    :param languages: Language codes or full names. Defaults to all available languages.
+
+    :returns: Path of the written store.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+    :raises ValueError: If there are more than 64 languages.
+
+    Example:
+        >>> path = publish_shared_store('/dev/shm/stop-words.shm', ['en', 'fr'])
+    """
+    from ._shared import build_shared_store
+
+    names = list(dict.fromkeys(map(_resolve_language, _available_languages() if languages is None else languages)))
+    stop_words = ((name, STOP_WORDS_CACHE.raw(name) or _read_stop_words(name)) for name in names)
+    return build_shared_store(Path(path), stop_words)
+
+
+def attach_shared_store(path: str | Path) -> "SharedStopWords":
+    """
+    Use a published store in this process.
+
+    While a store is attached, is_stop_word() checks the languages it holds
+    directly against the shared memory, unless filters apply to them, and
+    languages missing from STOP_WORDS_CACHE are loaded from it instead of the
+    data files. Attaching replaces any previously attached store.
+
+    :param path: Path of a store written by publish_shared_store().
+
+    :returns: The attached store.
+    :raises StopWordError: If the store cannot be opened or is invalid.
+
+    Example:
+        >>> store = attach_shared_store('/dev/shm/stop-words.shm')
+        >>> 'english' in store
+        True
+    """
+    global _shared_store
+    from ._shared import SharedStopWords
+
+    try:
+        with _registry_lock:
+            _shared_store = SharedStopWords(Path(path))
+            _fast_sets.clear()
+    except (OSError, ValueError) as e:
+        raise StopWordError(f'Shared store "{path}" cannot be attached. Error: {e}') from e
+
+    return _shared_store
+
+
+def detach_shared_store() -> None:
+    """Stop using the attached store in this process, if any. Cached stop words are kept."""
+    global _shared_store
+    _shared_store = None
+
+
+def save_cache(path: str | Path, *, filter_version: str | None = None) -> Path:
+    """
+    Save the filtered stop words of every cached language into a snapshot.
+
+    Another process loads the snapshot with load_cache() to fill its cache
+    without reading the data files or running the filters, e.g., workers that
+    load a snapshot written at deploy time. Each language is stamped with what
+    its stop words were built from: the modification times and sizes of the
+    bundled data files, the fingerprints of the sources providing it, and a
+    fingerprint of its filter chain. The snapshot also records the library
+    version. Entries assigned to STOP_WORDS_CACHE directly are left out.
+
+    A filter function that reads globals, other than builtins, cannot be
+    fingerprinted, as the globals may differ in the loading process, so the
+    languages it filters never match. Pass filter_version, and the same value
+    to load_cache(), to vouch for them instead; change it whenever those
+    globals change.
+
+    :param path: Where to write the snapshot; it is replaced atomically.
+    :param filter_version: A version of the globals the filters read, or None.
+
+    :returns: Path of the written snapshot.
+    :raises StopWordError: If the snapshot cannot be written.
+
+    Example:
+        >>> warm_up()
+        >>> save_cache('/var/cache/myapp/stop-words.snapshot')
+    """
+    from ._snapshot import write_snapshot
+
+    entries = []
+    for language in list(STOP_WORDS_CACHE):
+        chain = _filter_chain(language)
+        stop_words = STOP_WORDS_CACHE.lookup(language, chain, count=False)
+        if stop_words is not None and STOP_WORDS_CACHE.stamp(language) is not None:
+            entries.append((language, _snapshot_stamp(language, chain, filter_version), stop_words))
+
+    try:
+        return write_snapshot(Path(path), get_version(), entries)
+    except OSError as e:
+        raise StopWordError(f'Snapshot "{path}" cannot be written. Error: {e}') from e
+
+
+def load_cache(path: str | Path, *, filter_version: str | None = None) -> list[str]:
+    """
+    Fill the cache from a snapshot written by save_cache().
+
+    A language is only loaded if its stamp still matches: a snapshot written
+    by another library version is ignored as a whole, and a language whose
+    data files, sources or filter chain changed since it was saved is skipped,
+    to be loaded from its source on first lookup as usual. Languages that are
+    already cached are kept.
+
+    Languages that were filtered are loaded without their raw words: if
+    filters change later, their stop words are read from the source again.
+
+    :param path: Path of a snapshot written by save_cache().
+    :param filter_version: The filter_version the snapshot was saved with, if any.
+
+    :returns: The full names of the loaded languages.
+    :raises StopWordError: If the snapshot cannot be read or is invalid.
+
+    Example:
+        >>> load_cache('/var/cache/myapp/stop-words.snapshot')  # e.g., at worker start
+        ['english', 'french']
+    """
+    global _source_changes
+    from ._snapshot import read_snapshot
+
+    try:
+        snapshot = read_snapshot(Path(path), get_version())
+    except (OSError, ValueError) as e:
+        raise StopWordError(f'Snapshot "{path}" cannot be loaded. Error: {e}') from e
+
+    loaded = []
+    for language, (saved_stamp, words) in snapshot.items():
+        chain = _filter_chain(language)
+        if saved_stamp != _snapshot_stamp(language, chain, filter_version):
+            continue
+
+        with _registry_lock:
+            load_lock = _load_locks.setdefault(language, _thread.allocate_lock())
+        with load_lock:
+            if STOP_WORDS_CACHE.lookup(language, chain, count=False) is not None:
+                continue
+            stop_words = tuple(words)
+            # Without filters, the stop words are their own raw words.
+            raw_words = None if any(chain) else stop_words
+            fingerprint = _fingerprint(language, _source_layers)
+            if _source_fingerprints.get(language, ()) != fingerprint:
+                _source_changes += 1
+            _source_fingerprints[language] = fingerprint
+            STOP_WORDS_CACHE.store(language, stop_words, raw=raw_words, stamp=chain)
+        loaded.append(language)
+
+    return loaded
+
+
+def _snapshot_stamp(language: str, chain: tuple[object, object], filter_version: str | None) -> bytes:
+    """Identify what the stop words of a language are built from, alike in every process."""
+    from ._files import file_version
+    from ._index import index_path
+    from ._snapshot import describe_filter, stamp
+
+    language_filters, global_filters = cast(
+        tuple[list[Callable[[list[str], str | None], list[str]]] | None, ...], chain
+    )
+    return stamp(
+        file_version(STOP_WORDS_DIR / f"{language}.txt"),
+        file_version(index_path(STOP_WORDS_DIR)),
+        [(repr(source), extend, source.fingerprint(language)) for source, extend in _source_layers],
+        filter_version,
+        [
+            describe_filter(func, globals_versioned=filter_version is not None)
+            for func in (*(language_filters or ()), *(global_filters or ()))
+        ],
+    )
+
+
+def add_source(source: "StopWordsSource", *, extend: bool = False) -> None:
+    """
+    Layer a source of stop words over the bundled data and the sources added before.
+
+    For the languages it provides, a source replaces the stop words of the
+    layers below it, or adds to them with extend=True. It may also provide
+    languages that are not bundled, by full name. Cached languages the source
+    provides are reloaded right away; later changes to the source are picked
+    up by reload_changed().
+
+    :param source: A DirectorySource, a MemorySource, or any object implementing StopWordsSource.
+    :param extend: If True, add the source's stop words to those below it instead of replacing them.
+    :raises StopWordError: If the source cannot be read.
+
+    Example:
+        >>> add_source(DirectorySource('/etc/myapp/stop-words'), extend=True)
+        >>> add_source(MemorySource({'english': ['acme']}), extend=True)
+    """
+    global _source_layers
+
+    with _registry_lock:
+        _source_layers = (*_source_layers, (source, extend))
+        _resolved_languages.clear()
+    reload_changed()
+
+
+def remove_source(source: "StopWordsSource") -> bool:
+    """
+    Remove a source added with add_source(), and reload the cached languages it provided.
+
+    :param source: The source to remove.
+
+    :returns: True if the source was registered, False otherwise.
+    :raises StopWordError: If another source cannot be read.
+    """
+    global _source_layers
+
+    with _registry_lock:
+        remaining = tuple(layer for layer in _source_layers if layer[0] is not source)
+        if len(remaining) == len(_source_layers):
+            return False
+        _source_layers = remaining
+        _resolved_languages.clear()
+    reload_changed()
+    return True
+
+
+def reload_changed() -> list[str]:
+    """
+    Reload the cached languages whose stop words changed in a source since they were read.
+
+    Only languages whose source fingerprints changed (e.g., a file's modification
+    time, or a MemorySource update) are read again. Each is re-filtered and
+    swapped into the cache in one step, so lookups keep being served from the
+    previous stop words until then, and the other languages stay cached as they
+    are. Languages no longer provided by any source or the bundled data are dropped.
+
+    Call it periodically, or when notified of a change, to pick up edits without a restart.
+
+    :returns: The full names of the reloaded or dropped languages.
+    :raises StopWordError: If a source cannot be read.
+
+    Example:
+        >>> add_source(DirectorySource('/etc/myapp/stop-words'))
+        >>> reload_changed()  # e.g., every minute, after someone edited english.txt
+        ['english']
+    """
+    global _source_changes
+
+    sources = _source_layers
+    # The index of detect_language() also holds languages that are not cached; let it check them too.
+    _source_changes += 1
+    changed = []
+    for language in sorted({*STOP_WORDS_CACHE, *_compact_stop_words}):
+        if _source_fingerprints.get(language, ()) != _fingerprint(language, sources):
+            _reload(language)
+            changed.append(language)
+
+    return changed
+
+
+def _fingerprint(language: str, sources: "tuple[tuple[StopWordsSource, bool], ...]") -> tuple[tuple[int, object], ...]:
+    """Identify the sources providing a language, and the version of their stop words."""
+    return tuple(
+        (id(source), fingerprint) for source, _ in sources if (fingerprint := source.fingerprint(language)) is not None
+    )
+
+
+def _reload(language: str) -> None:
+    """
+    Read a language again and replace its cached stop words and compact form.
+
+    :param language: Full language name.
+    """
+    with _registry_lock:
+        load_lock = _load_locks.setdefault(language, _thread.allocate_lock())
+
+    with load_lock:
+        try:
+            raw_words = _read_stop_words(language)
+        except StopWordError:
+            if language in _available_languages() or language not in _source_fingerprints:
+                raise
+            # The language only came from a source that no longer provides it. Resolving it
+            # again must fail as for any unavailable language, not as an unreadable file.
+            STOP_WORDS_CACHE.pop(language, None)
+            _compact_stop_words.pop(language, None)
+            with _registry_lock:
+                _resolved_languages.clear()
+            return
+
+        stamp = _filter_chain(language)
+        stop_words = tuple(apply_filters(list(raw_words), language))
+        if language in STOP_WORDS_CACHE:
+            STOP_WORDS_CACHE.store(language, stop_words, raw=raw_words, stamp=stamp)
+        if language in _compact_stop_words:
+            from ._compact import CompactStopWords
+
+            _compact_stop_words[language] = (stamp, CompactStopWords(stop_words))
 
 
 def apply_filters(stopwords: list[str], language: str | None) -> list[str]:
@@ -102,20 +1743,39 @@ def apply_filters(stopwords: list[str], language: str | None) -> list[str]:
 
     Filters can modify, remove, or add stop words. Language-specific filters
     are applied first, followed by global filters (registered with language=None).
+    Consecutive declarative filters (MinLength, Exclude, ...) run as one fused pass.
 
     :param stopwords: List of stop words to filter.
     :param language: Language code for language-specific filters.
 
     :returns: Filtered list of stop words.
     """
-    # Apply language-specific filters
-    if language in _filters:
-        for func in _filters[language]:
-            stopwords = func(stopwords, language)
+    # The registry replaces its lists instead of mutating them, so iterating needs no lock.
+    funcs = [*(_filters.get(language, ()) if language is not None else ()), *_filters.get(None, ())]
+    if not funcs:
+        return stopwords
 
-    # Apply global filters
-    for func in _filters[None]:
+    from ._pipeline import fuse as _fuse
+
+    funcs = _fuse(funcs)
+    if _hooks:
+        return _apply_filters_timed(funcs, stopwords, language)
+
+    # Language-specific filters come first, then global filters
+    for func in funcs:
+        stopwords = func(stopwords, language)
+
+    return stopwords
+
+
+def _apply_filters_timed(
+    funcs: list[Callable[[list[str], str | None], list[str]]], stopwords: list[str], language: str | None
+) -> list[str]:
+    """Apply filters like apply_filters(), emitting a 'filter' event with the duration of each."""
+    for func in funcs:
+        start = time.perf_counter()
         stopwords = func(stopwords, language)
+        _emit("filter", language, time.perf_counter() - start, getattr(func, "__qualname__", repr(func)))
 
     return stopwords
 
@@ -127,8 +1787,8 @@ def add_filter(func: Callable[[list[str], str | None], list[str]], *, language:
     Language-specific filters receive: func(stopwords: list[str]) -> list[str]
     Global filters receive: func(stopwords: list[str], language: str) -> list[str]
 
-    Note: Filters only apply to newly loaded stop words, not cached ones.
-          Clear the cache with STOP_WORDS_CACHE.clear() to reapply filters.
+    Cached stop words of the affected languages (all languages for a global
+    filter) are re-filtered on their next lookup, without re-reading the files.
 
     :param func: Callable that takes a list of stop words and returns a modified list.
     :param language: Language code for language-specific filter, or None for global filter.
@@ -139,14 +1799,12 @@ def add_filter(func: Callable[[list[str], str | None], list[str]], *, language:
         >>> # Add a global filter to remove single-character words
         >>> add_filter(lambda words, lang: [w for w in words if len(w) > 1])
     """
-    if language is None:
-        _filters[None].append(func)
-        return
-
-    if language not in _filters:
-        _filters[language] = []
+    global _filters_version
 
-    _filters[language].append(func)
+    with _registry_lock:
+        _filters[language] = [*_filters.get(language, ()), func]
+        _filters_version += 1
+        _fast_sets.clear()
 
 
 def remove_filter(func: Callable[[list[str], str | None], list[str]], *, language: str | None = None) -> bool:
@@ -158,13 +1816,76 @@ def remove_filter(func: Callable[[list[str], str | None], list[str]], *, languag
 
     :returns: True if the filter was found and removed, False otherwise.
     """
-    if language not in _filters or func not in _filters[language]:
-        return False
+    global _filters_version
+
+    with _registry_lock:
+        if func not in _filters.get(language, ()):
+            return False
+
+        remaining = list(_filters[language])
+        remaining.remove(func)
+        _filters[language] = remaining
+        _filters_version += 1
+        _fast_sets.clear()
+
+    return True
+
+
+def add_hook(hook: "Callable[[InstrumentationEvent], None]") -> None:
+    """
+    Register an instrumentation hook.
+
+    The hook is called with an InstrumentationEvent for every cache hit and
+    miss, every read of a language's source (with its duration), and every
+    filter run (with its duration), in the thread that caused it. Hooks should
+    be fast and must not raise; their exceptions propagate to the caller.
+    With no hook registered, nothing is timed.
+
+    :param hook: Callable taking an InstrumentationEvent, e.g., a StopWordsStats instance.
+
+    Example:
+        >>> add_hook(lambda event: metrics.timing(f'stop_words.{event.kind}', event.seconds))
+    """
+    global _hooks
+
+    with _registry_lock:
+        _hooks = (*_hooks, hook)
+        # Fast path lookups emit no events.
+        _fast_sets.clear()
+
+
+def remove_hook(hook: "Callable[[InstrumentationEvent], None]") -> bool:
+    """
+    Unregister a previously registered instrumentation hook.
+
+    :param hook: The hook to remove.
+
+    :returns: True if the hook was found and removed, False otherwise.
+    """
+    global _hooks
+
+    with _registry_lock:
+        if hook not in _hooks:
+            return False
+
+        remaining = list(_hooks)
+        remaining.remove(hook)
+        _hooks = tuple(remaining)
 
-    _filters[language].remove(func)
     return True
 
 
+def _emit(
+    kind: Literal["hit", "miss", "read", "filter"], language: str | None, seconds: float = 0.0, detail: str = ""
+) -> None:
+    """Send an event to every registered hook."""
+    from ._instrumentation import InstrumentationEvent
+
+    event = InstrumentationEvent(kind, language, seconds, detail)
+    for hook in _hooks:
+        hook(event)
+
+
 def safe_get_stop_words(language: str) -> list[str]:
     """
     Safely load stop words, returning an empty list on error.
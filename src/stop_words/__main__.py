@@ -0,0 +1,179 @@
+"""
+Command line interface: remove stop words from text streams.
+
+Reads the given files, or standard input, line by line and writes every line
+to standard output without its stop words, as strip_stop_words() removes them.
+Line endings are kept, and undecodable bytes are passed through unchanged.
+
+Run ``python -m stop_words --help``, or ``stop-words --help`` once installed.
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from typing import IO, Iterable, Iterator, cast
+
+from . import LANGUAGE_MAPPING, StopWordError, filter_documents, get_stop_words, strip_stop_words
+
+
+# Size of the read and write buffers, large enough that big dumps are read and written in few system calls.
+BUFFER_SIZE = 1024 * 1024
+
+# Lines sent to a worker at once in multi-process mode.
+CHUNK_SIZE = 2048
+
+
+def _open(path: str, mode: str, encoding: str) -> IO[str]:
+    """Open a file, or standard input or output for '-', as buffered text that survives undecodable bytes."""
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        stream.flush()
+        return open(
+            stream.fileno(),
+            mode,
+            buffering=BUFFER_SIZE,
+            encoding=encoding,
+            errors="surrogateescape",
+            newline="",
+            closefd=False,
+        )
+    return open(path, mode, buffering=BUFFER_SIZE, encoding=encoding, errors="surrogateescape", newline="")
+
+
+def _read_lines(paths: Iterable[str], encoding: str) -> Iterator[str]:
+    """Read the lines of files one after the other, opening each file when it is reached."""
+    for path in paths:
+        with _open(path, "r", encoding) as f:
+            yield from f
+
+
+class _Stats:
+    """Lines and tokens processed, for --stats."""
+
+    def __init__(self) -> None:
+        self.lines = 0
+        self.tokens = 0
+        self.start = time.perf_counter()
+
+    def report(self, stream: IO[str]) -> None:
+        """Write the totals and throughput to a stream."""
+        seconds = max(time.perf_counter() - self.start, 1e-9)
+        stream.write(
+            f"{self.lines:,} lines, {self.tokens:,} tokens in {seconds:.2f} s: "
+            f"{self.lines / seconds:,.0f} lines/s, {self.tokens / seconds:,.0f} tokens/s\n"
+        )
+
+
+def strip_lines(
+    lines: Iterable[str], language: str | list[str], *, workers: int = 1, stats: _Stats | None = None
+) -> Iterator[str]:
+    """
+    Remove the stop words from lines of text, keeping their line endings.
+
+    :param lines: Lines, with or without their line endings.
+    :param language: Language code or full name, or several of them.
+    :param workers: Number of processes; 1 strips the lines in this process, 0 uses one process per CPU.
+    :param stats: If given, counts the lines and tokens read.
+
+    :returns: An iterator over the stripped lines, in order.
+    :raises StopWordError: If a language is not available or a file cannot be read.
+    """
+    # Stop words are removed with the whitespace that follows them, so line endings are set aside and put back.
+    endings: deque[str] = deque()
+
+    def texts() -> Iterator[str]:
+        for line in lines:
+            text = line.rstrip("\r\n")
+            end = len(text)
+            endings.append(line[end:])
+            if stats is not None:
+                stats.lines += 1
+                stats.tokens += len(text.split())
+            yield text
+
+    if workers == 1:
+        results: Iterator[str] = (strip_stop_words(text, language) for text in texts())
+    else:
+        results = cast(
+            Iterator[str], filter_documents(texts(), language, workers=workers or None, chunksize=CHUNK_SIZE)
+        )
+
+    for result in results:
+        yield result + endings.popleft()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line interface.
+
+    :param argv: Command line arguments, without the program name. Defaults to sys.argv[1:].
+
+    :returns: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="stop-words",
+        description="Remove stop words from text files, or standard input, line by line, and write to standard output.",
+    )
+    parser.add_argument("files", nargs="*", default=["-"], metavar="FILE", help="Files to read; '-' is standard input.")
+    parser.add_argument(
+        "-l",
+        "--language",
+        action="append",
+        dest="languages",
+        metavar="LANGUAGE",
+        help="Language code or full name; repeat to remove the stop words of several languages. Default: en.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes, 0 for one per CPU. Default: 1, in this process.",
+    )
+    parser.add_argument("--encoding", default="utf-8", help="Encoding of the input and output. Default: utf-8.")
+    parser.add_argument(
+        "--stats", action="store_true", help="Report lines and tokens per second on standard error when done."
+    )
+    parser.add_argument("--list-languages", action="store_true", help="List the language codes and names, and exit.")
+    args = parser.parse_args(argv)
+
+    if args.list_languages:
+        for code, name in sorted(LANGUAGE_MAPPING.items()):
+            print(f"{code}\t{name}")
+        return 0
+
+    if args.workers < 0:
+        parser.error("--workers must not be negative.")
+
+    # Load every language up front, so an unavailable one fails before any output.
+    names = []
+    for language in args.languages or ["en"]:
+        try:
+            get_stop_words(language, copy=False)
+        except StopWordError as e:
+            parser.error(str(e))
+        names.append(LANGUAGE_MAPPING.get(language, language))
+    language = names[0] if len(names) == 1 else names
+
+    stats = _Stats() if args.stats else None
+    try:
+        with _open("-", "w", args.encoding) as out:
+            out.writelines(
+                strip_lines(_read_lines(args.files, args.encoding), language, workers=args.workers, stats=stats)
+            )
+    except OSError as e:
+        if isinstance(e, BrokenPipeError):
+            # The reader went away, e.g., `| head`; nothing more can be written.
+            return 1
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    except KeyboardInterrupt:
+        return 130
+
+    if stats is not None:
+        stats.report(sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Cache backend for loaded stop words.
+
+The cache is a dictionary that maps full language names to their filtered
+stop words. It is unbounded by default, and can be limited to a number of
+languages and/or a memory budget, in which case the least recently used
+languages are evicted.
+Each entry also keeps the raw, unfiltered words it was built from and a
+stamp identifying the filter chain that produced it, so a changed filter
+chain can be re-applied without reading the source again. Structures derived
+from an entry (such as its frozenset) are stored on the entry itself, so they
+are evicted and accounted for together with it.
+"""
+
+import _thread
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Iterable, NamedTuple, Self, TypeVar, cast
+
+
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the stop words cache, in the spirit of functools.lru_cache().cache_info()."""
+
+    hits: int
+    misses: int
+    evictions: int
+    max_languages: int | None
+    max_bytes: int | None
+    languages: int
+    bytes: int
+
+
+def measure_size(*collections: Collection[str]) -> int:
+    """
+    Estimate the memory held by collections of stop words.
+
+    :param collections: The stop word collections.
+
+    :returns: Size in bytes of the containers and of every distinct string in them.
+    """
+    strings = {id(word): word for words in collections for word in words}
+    return sum(map(sys.getsizeof, collections)) + sum(map(sys.getsizeof, strings.values()))
+
+
+class _Entry:
+    """A cached language: its stop words, their raw source, derived structures and their measured size."""
+
+    __slots__ = ("words", "raw", "stamp", "derived", "size")
+
+    def __init__(self, words: tuple[str, ...], raw: tuple[str, ...] | None, stamp: object) -> None:
+        self.words = words
+        self.raw = raw
+        self.stamp = stamp
+        self.derived: dict[str, object] = {}
+        self.size = measure_size(words) if raw is None or raw is words else measure_size(words, raw)
+
+
+class StopWordsCache(dict[str, tuple[str, ...]]):
+    """
+    Dictionary of language names to cached stop words, with optional LRU eviction.
+
+    Reads work like any dictionary. Writes go through the overridden mutators,
+    which keep the per-entry metadata (recency, size, raw words, derived
+    structures) in sync and evict entries when the cache is over its limits.
+    Lookups through lookup() check the filter chain stamp and update the hit
+    and miss counters; plain dictionary access does neither.
+    """
+
+    # Slots keep attribute access on this dict subclass as fast as on a plain object.
+    __slots__ = (
+        "_entries",
+        "_lock",
+        "_bytes",
+        "_hits",
+        "_misses",
+        "_evictions",
+        "assignments",
+        "generation",
+        "max_languages",
+        "max_bytes",
+    )
+
+    def __init__(self, *, max_languages: int | None = None, max_bytes: int | None = None) -> None:
+        """
+        Create an empty cache.
+
+        :param max_languages: Maximum number of cached languages, or None for no limit.
+        :param max_bytes: Maximum measured size of all entries in bytes, or None for no limit.
+        """
+        super().__init__()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = _thread.RLock()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = 0
+        # Incremented whenever an entry is added, replaced or removed, and when the limits change.
+        self.generation = 0
+        # Incremented whenever an entry is assigned directly, or such an entry is replaced or removed.
+        self.assignments = 0
+        self.max_languages: int | None = None
+        self.max_bytes: int | None = None
+        self.configure(max_languages=max_languages, max_bytes=max_bytes)
+
+    def configure(self, *, max_languages: int | None = None, max_bytes: int | None = None) -> None:
+        """
+        Change the limits of the cache and reset its statistics.
+
+        Entries over the new limits are evicted right away.
+
+        :param max_languages: Maximum number of cached languages, or None for no limit.
+        :param max_bytes: Maximum measured size of all entries in bytes, or None for no limit.
+        :raises ValueError: If a limit is negative.
+        """
+        if (max_languages is not None and max_languages < 0) or (max_bytes is not None and max_bytes < 0):
+            raise ValueError("Cache limits must be None or non-negative.")
+
+        with self._lock:
+            self.max_languages = max_languages
+            self.max_bytes = max_bytes
+            self._hits = self._misses = self._evictions = 0
+            # Structures kept outside of the cache may depend on its limits.
+            self.generation += 1
+            self._evict()
+
+    def info(self) -> CacheInfo:
+        """Get the cache statistics."""
+        return CacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self.max_languages,
+            self.max_bytes,
+            len(self),
+            self._bytes,
+        )
+
+    def lookup(self, language: str, stamp: object = None, *, count: bool = True) -> tuple[str, ...] | None:
+        """
+        Get the stop words of a language if they are cached and current.
+
+        :param language: Full language name.
+        :param stamp: The current filter chain stamp. Entries stored with a different
+            stamp are stale; entries stored without one (e.g., by assigning to the
+            dictionary directly) are always current.
+        :param count: If True, count a hit or a miss.
+
+        :returns: The cached stop words, or None if the language is not cached or stale.
+        """
+        entry = self._entries.get(language)
+        if entry is None or (entry.stamp is not None and entry.stamp != stamp):
+            if count:
+                self._misses += 1
+            return None
+
+        if count:
+            self._hits += 1
+        if self.max_languages is not None or self.max_bytes is not None:
+            with self._lock:
+                if language in self._entries:
+                    self._entries.move_to_end(language)
+
+        return entry.words
+
+    def count_hit(self) -> None:
+        """Count a hit served without lookup(), e.g., from a set derived from a current entry."""
+        self._hits += 1
+
+    def raw(self, language: str) -> tuple[str, ...] | None:
+        """
+        Get the raw, unfiltered words a cached entry was built from.
+
+        :param language: Full language name.
+
+        :returns: The raw words, or None if the language is not cached or its source is unknown.
+        """
+        entry = self._entries.get(language)
+        return entry.raw if entry is not None else None
+
+    def stamp(self, language: str) -> object:
+        """
+        Get the filter chain stamp a cached entry was stored with.
+
+        :param language: Full language name.
+
+        :returns: The stamp, or None if the language is not cached or was assigned directly.
+        """
+        entry = self._entries.get(language)
+        return entry.stamp if entry is not None else None
+
+    def store(self, language: str, words: tuple[str, ...], *, raw: tuple[str, ...] | None, stamp: object) -> None:
+        """
+        Cache the stop words of a language together with their raw words and filter chain stamp.
+
+        :param language: Full language name.
+        :param words: The filtered stop words.
+        :param raw: The unfiltered words `words` were built from, or None if they are unknown,
+            in which case a changed filter chain reads the source again.
+        :param stamp: The filter chain stamp `words` were built with.
+        """
+        self._put(language, _Entry(words, raw, stamp))
+
+    def derive(self, language: str, words: tuple[str, ...], kind: str, factory: Callable[[tuple[str, ...]], T]) -> T:
+        """
+        Get a structure derived from cached stop words, building it once per entry.
+
+        If the entry was evicted or replaced since `words` were looked up, the
+        structure is built but not stored.
+
+        :param language: Full language name.
+        :param words: The stop words the caller looked up.
+        :param kind: Name of the derived structure, e.g., 'set'.
+        :param factory: Builds the structure from the stop words.
+
+        :returns: The derived structure.
+        """
+        entry = self._entries.get(language)
+        if entry is None or entry.words is not words:
+            return factory(words)
+
+        if kind in entry.derived:
+            return cast(T, entry.derived[kind])
+
+        value = factory(words)
+        with self._lock:
+            if kind not in entry.derived and self._entries.get(language) is entry:
+                entry.derived[kind] = value
+                entry.size += sys.getsizeof(value)
+                self._bytes += sys.getsizeof(value)
+                self._evict()
+
+        return value
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries until the cache fits its limits. Call with the lock held."""
+        while self._entries and (
+            (self.max_languages is not None and len(self._entries) > self.max_languages)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            language, entry = self._entries.popitem(last=False)
+            super().__delitem__(language)
+            self._bytes -= entry.size
+            self._evictions += 1
+            self.generation += 1
+            if entry.stamp is None:
+                self.assignments += 1
+
+    def _discard(self, language: str) -> None:
+        """Forget the metadata of a removed entry. Call with the lock held."""
+        entry = self._entries.pop(language, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            self.generation += 1
+            if entry.stamp is None:
+                self.assignments += 1
+
+    def _put(self, language: str, entry: _Entry) -> None:
+        """Insert or replace an entry and evict what no longer fits."""
+        with self._lock:
+            self._discard(language)
+            super().__setitem__(language, entry.words)
+            self._entries[language] = entry
+            self.generation += 1
+            self._bytes += entry.size
+            self._evict()
+
+    def __setitem__(self, language: str, words: Iterable[str]) -> None:
+        # Stored as a tuple, so callers holding the stop words cannot change the cached entry.
+        self._put(language, _Entry(tuple(words), None, None))
+        self.assignments += 1
+
+    def __delitem__(self, language: str) -> None:
+        with self._lock:
+            super().__delitem__(language)
+            self._discard(language)
+
+    def pop(self, language: str, *default: Any) -> Any:  # type: ignore[override]
+        with self._lock:
+            self._discard(language)
+            return super().pop(language, *default)
+
+    def popitem(self) -> tuple[str, tuple[str, ...]]:
+        with self._lock:
+            item = super().popitem()
+            self._discard(item[0])
+            return item
+
+    def setdefault(self, language: str, default: Iterable[str]) -> tuple[str, ...]:  # type: ignore[override]
+        with self._lock:
+            if language not in self:
+                self[language] = default
+            return self[language]
+
+    def update(self, *args: Any, **kwargs: Iterable[str]) -> None:  # type: ignore[override]
+        for language, words in dict(*args, **kwargs).items():
+            self[language] = words
+
+    def __ior__(self, other: Any) -> Self:  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Drop every entry. Statistics are kept."""
+        with self._lock:
+            if any(entry.stamp is None for entry in self._entries.values()):
+                self.assignments += 1
+            super().clear()
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
@@ -0,0 +1,84 @@
+"""
+Compact, hash-indexed stop words for membership checks.
+
+A frozenset of stop words keeps a hash table of pointers plus one Python str
+object per word, most of it object overhead. CompactStopWords keeps the
+64-bit hashes of the words in one sorted array and the words themselves in
+one string, so a language costs a few machine words per stop word. Lookups
+binary-search the hashes and only compare strings when a hash matches.
+
+Hashes come from hash(), which Python caches on str objects and randomizes
+per process, so a CompactStopWords is never pickled or shared between
+processes; it is rebuilt from the stop words instead.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+
+# Joins the words in the text; stop words never contain it.
+_SEPARATOR = "\n"
+
+
+class CompactStopWords:
+    """
+    Read-only set of stop words stored as a sorted array of hashes and a single string.
+
+    Supports ``in``, len() and iteration, like the frozenset from get_stop_words_set().
+
+    Example:
+        >>> words = CompactStopWords(['the', 'a', 'an'])
+        >>> 'the' in words
+        True
+    """
+
+    __slots__ = ("_hashes", "_offsets", "_text")
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """
+        Build the compact form of stop words.
+
+        :param words: The stop words; duplicates are dropped.
+        """
+        ordered = sorted({(hash(word), word) for word in words})
+        self._hashes = array("q", [word_hash for word_hash, _ in ordered])
+        self._text = _SEPARATOR.join(word for _, word in ordered)
+        # Word i spans _text[_offsets[i]:_offsets[i + 1] - 1].
+        self._offsets = array("I", [0])
+        for _, word in ordered:
+            self._offsets.append(self._offsets[-1] + len(word) + 1)
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+
+        word_hash = hash(word)
+        hashes = self._hashes
+        position = bisect_left(hashes, word_hash)
+        if position == len(hashes) or hashes[position] != word_hash:
+            return False
+
+        # Several stop words may share a hash; compare the strings of each.
+        offsets, text = self._offsets, self._text
+        while position < len(hashes) and hashes[position] == word_hash:
+            start, end = offsets[position], offsets[position + 1] - 1
+            if text[start:end] == word:
+                return True
+            position += 1
+
+        return False
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the stop words, in no particular order."""
+        return iter(self._text.split(_SEPARATOR) if self._hashes else ())
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(map(sys.getsizeof, (self._hashes, self._offsets, self._text)))
+
+    def __repr__(self) -> str:
+        return f"<CompactStopWords: {len(self)} words>"
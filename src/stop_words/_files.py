@@ -0,0 +1,73 @@
+"""
+File helpers shared by the index, the shared store and cache snapshots.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+DIGEST_SIZE = 16
+
+
+def file_version(path: Path) -> tuple[int, int] | None:
+    """
+    Identify the version of a file by its modification time and size.
+
+    :param path: The file.
+
+    :returns: The modification time in nanoseconds and the size, or None if the file does not exist.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path: Path) -> bytes | None:
+    """
+    Digest the content of a file.
+
+    :param path: The file.
+
+    :returns: A DIGEST_SIZE-byte digest, or None if the file cannot be read.
+    """
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=DIGEST_SIZE).digest()
+    except OSError:
+        return None
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """
+    Write a file through a uniquely named temporary file in the same directory, then rename it over the target.
+
+    Readers never see a partial file, and concurrent writers never write to
+    the same temporary file; the last rename wins. The file keeps the
+    permissions of the file it replaces, or gets 0o644, not the owner-only
+    permissions of temporary files.
+
+    :param path: The file to write.
+    :param data: Its new content.
+    :raises OSError: If the file cannot be written; the temporary file is removed.
+    """
+    import os
+    import tempfile
+
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
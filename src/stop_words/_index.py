@@ -0,0 +1,223 @@
+"""
+Compiled, single-file index of the bundled stop words.
+
+The index packs ``languages.json`` and every ``<language>.txt`` file into one
+binary file that is memory-mapped on first use, so a language is decoded on
+demand without opening its text file. The text files remain the source of
+truth; the index is rebuilt from them with::
+
+    cd src && python -m stop_words._index [SOURCE_DIR] [INDEX_FILE]
+
+The index records the modification time, size and content digest of every
+file it was compiled from. Readers only use the parts whose text file is
+unchanged, or missing, so edits to the text files are never hidden by an
+older index. Installers do not keep modification times, so a file whose
+size matches but whose modification time does not is compared by digest.
+
+Layout, all integers little-endian:
+
+- Header: magic ``b"SWIDX"``, format version (u8), mapping size (u32), language count (u32),
+  ``languages.json`` modification time in nanoseconds (i64), size (u64) and digest (16 bytes).
+- The language mapping as UTF-8 JSON.
+- One directory entry per language: name size (u16), UTF-8 name, payload offset (u32), payload size (u32),
+  text file modification time in nanoseconds (i64), size (u64) and digest (16 bytes).
+- Payloads: the stop words of each language, UTF-8 encoded and joined by newlines.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+from ._files import DIGEST_SIZE, file_digest, file_version, write_atomically
+
+
+MAGIC = b"SWIDX"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("<5sBIIqQ16s")
+_NAME_SIZE = struct.Struct("<H")
+_ENTRY = struct.Struct("<IIqQ16s")
+
+
+def index_path(source_dir: Path) -> Path:
+    """
+    Get the index file that belongs to a stop words directory.
+
+    The index lives next to the directory it was compiled from, e.g.
+    ``stop-words/`` is compiled into ``stop-words.idx``.
+
+    :param source_dir: Directory holding ``languages.json`` and the ``.txt`` files.
+
+    :returns: Path of the index file.
+    """
+    return source_dir.with_name(f"{source_dir.name}.idx")
+
+
+def read_words(language_file: Path) -> list[str]:
+    """
+    Read a stop words text file, one word per line, skipping blank lines.
+
+    :param language_file: Path of the ``<language>.txt`` file.
+
+    :returns: The stripped, non-empty lines.
+    :raises OSError: If the file cannot be read.
+    """
+    with language_file.open("r", encoding="utf-8") as f:
+        return [word for word in map(str.strip, f) if word]
+
+
+def build_index(source_dir: Path, index_file: Path | None = None) -> Path:
+    """
+    Compile a stop words directory into a binary index.
+
+    Every language of ``languages.json`` is included, in mapping order.
+
+    :param source_dir: Directory holding ``languages.json`` and the ``.txt`` files.
+    :param index_file: Where to write the index. Defaults to index_path(source_dir).
+
+    :returns: Path of the written index.
+    :raises OSError: If a source file cannot be read or the index cannot be written.
+    """
+    index_file = index_file or index_path(source_dir)
+
+    mapping_file = source_dir / "languages.json"
+    mapping_version = file_version(mapping_file) or (0, 0)
+    mapping_bytes = mapping_file.read_bytes()
+    mapping: dict[str, str] = json.loads(mapping_bytes)
+    languages = list(dict.fromkeys(mapping.values()))
+
+    names = [language.encode("utf-8") for language in languages]
+    # Versions are taken before reading, so a file changed meanwhile is seen as changed.
+    versions = []
+    for language in languages:
+        language_file = source_dir / f"{language}.txt"
+        mtime_ns, size = file_version(language_file) or (0, 0)
+        versions.append((mtime_ns, size, file_digest(language_file) or bytes(DIGEST_SIZE)))
+    payloads = ["\n".join(read_words(source_dir / f"{language}.txt")).encode("utf-8") for language in languages]
+
+    offset = _HEADER.size + len(mapping_bytes) + sum(_NAME_SIZE.size + len(name) + _ENTRY.size for name in names)
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            len(mapping_bytes),
+            len(languages),
+            *mapping_version,
+            hashlib.blake2b(mapping_bytes, digest_size=DIGEST_SIZE).digest(),
+        ),
+        mapping_bytes,
+    ]
+    for name, payload, version in zip(names, payloads, versions):
+        parts += [_NAME_SIZE.pack(len(name)), name, _ENTRY.pack(offset, len(payload), *version)]
+        offset += len(payload)
+    parts += payloads
+
+    write_atomically(index_file, b"".join(parts))
+
+    return index_file
+
+
+class StopWordsIndex:
+    """
+    Read-only view of a compiled index file.
+
+    The directory is parsed when the index is opened; the stop words of a
+    language are only decoded when read(). is_current() tells whether the
+    text files the index was compiled from are unchanged, and remembers the
+    files it had to compare by digest.
+    """
+
+    def __init__(self, index_file: Path) -> None:
+        """
+        Memory-map an index file.
+
+        :param index_file: Path of the index file.
+
+        :raises OSError: If the file cannot be opened.
+        :raises ValueError: If the file is not a valid index.
+        """
+        with index_file.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, mapping_size, count, *mapping_version = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"expected {MAGIC!r} format version {FORMAT_VERSION}")
+            # Versions by language, and None for languages.json: modification time, size and digest.
+            self._versions: dict[str | None, tuple[int, int, bytes]] = {None: tuple(mapping_version)}  # type: ignore
+
+            start, end = _HEADER.size, _HEADER.size + mapping_size
+            self.mapping: dict[str, str] = json.loads(self._mm[start:end])
+
+            self._entries: dict[str, tuple[int, int]] = {}
+            for _ in range(count):
+                (name_size,) = _NAME_SIZE.unpack_from(self._mm, end)
+                start, end = end + _NAME_SIZE.size, end + _NAME_SIZE.size + name_size
+                name = self._mm[start:end].decode("utf-8")
+                offset, size, *source_version = _ENTRY.unpack_from(self._mm, end)
+                self._entries[name] = (offset, size)
+                self._versions[name] = tuple(source_version)  # type: ignore[assignment]
+                end += _ENTRY.size
+        except (struct.error, ValueError) as e:
+            self._mm.close()
+            raise ValueError(f'"{index_file}" is not a valid stop words index: {e}') from e
+
+    def __contains__(self, language: object) -> bool:
+        return language in self._entries
+
+    def is_current(self, source_dir: Path, language: str | None = None) -> bool:
+        """
+        Tell whether a text file the index was compiled from is unchanged.
+
+        A file of another size has changed. A file of the same size and
+        modification time has not. A file of the same size with another
+        modification time, as after installing the package, is compared by
+        digest, once per modification time. A missing text file counts as
+        unchanged, so an index can be shipped without them.
+
+        :param source_dir: Directory holding ``languages.json`` and the ``.txt`` files.
+        :param language: Full language name, or None for ``languages.json``.
+
+        :returns: True if the index holds the current content of the file.
+        """
+        path = source_dir / (f"{language}.txt" if language is not None else "languages.json")
+        version = file_version(path)
+        if version is None:
+            return True
+        recorded = self._versions.get(language)
+        if recorded is None or version[1] != recorded[1]:
+            return False
+        if version[0] == recorded[0]:
+            return True
+        if file_digest(path) != recorded[2]:
+            return False
+        self._versions[language] = (*version, recorded[2])
+        return True
+
+    def read(self, language: str) -> list[str]:
+        """
+        Decode the stop words of a language.
+
+        :param language: Full language name.
+
+        :returns: The stop words, in file order.
+        :raises KeyError: If the language is not in the index.
+        """
+        offset, size = self._entries[language]
+        if not size:
+            return []
+        end = offset + size
+        return self._mm[offset:end].decode("utf-8").split("\n")
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._mm.close()
+
+
+if __name__ == "__main__":
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent / "stop-words"
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(f"Wrote {build_index(source, target)}")
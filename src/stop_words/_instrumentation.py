@@ -0,0 +1,59 @@
+"""
+Instrumentation events for loading and caching stop words.
+
+Hooks registered with stop_words.add_hook() receive an InstrumentationEvent
+for every cache lookup, every read of a language's source, and every filter
+run. Nothing is timed or built when no hook is registered.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from typing import Literal, NamedTuple
+
+
+class InstrumentationEvent(NamedTuple):
+    """Something that happened while loading stop words."""
+
+    #: 'hit' or 'miss' for a cache lookup, 'read' for reading a language's source, 'filter' for running a filter.
+    kind: Literal["hit", "miss", "read", "filter"]
+    #: Full language name, or None for filters applied with apply_filters(words, None).
+    language: str | None
+    #: Duration in seconds of reads and filters; 0.0 for hits and misses.
+    seconds: float
+    #: Where reads came from ('shared store', 'index', 'file', or 'source' for a source added with add_source()),
+    #: the filter's qualified name for filters, else ''.
+    detail: str
+
+
+class StopWordsStats:
+    """
+    Hook that aggregates events per language, ready to be registered with add_hook().
+
+    Example:
+        >>> stats = StopWordsStats()
+        >>> add_hook(stats)
+        >>> words = get_stop_words('en')
+        >>> stats.misses['english']
+        1
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits: Counter[str | None] = Counter()
+        self.misses: Counter[str | None] = Counter()
+        self.reads: Counter[str | None] = Counter()
+        self.read_seconds: defaultdict[str | None, float] = defaultdict(float)
+        #: Total seconds spent in each filter, by filter name.
+        self.filter_seconds: defaultdict[str, float] = defaultdict(float)
+
+    def __call__(self, event: InstrumentationEvent) -> None:
+        with self._lock:
+            if event.kind == "hit":
+                self.hits[event.language] += 1
+            elif event.kind == "miss":
+                self.misses[event.language] += 1
+            elif event.kind == "read":
+                self.reads[event.language] += 1
+                self.read_seconds[event.language] += event.seconds
+            elif event.kind == "filter":
+                self.filter_seconds[event.detail] += event.seconds
@@ -0,0 +1,66 @@
+"""
+Normalization of stop words and query tokens for case- and accent-insensitive lookups.
+
+A normalizer is built once per normalization mode, and once more for Turkic
+languages, and keeps the results of recent tokens in an LRU cache, since
+running text repeats the same tokens over and over. Languages share their
+normalizer, so the cache is bounded however many languages are used.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Callable
+
+
+# Turkic languages pair dotted and dotless i differently from every other language.
+TURKIC_LANGUAGES = frozenset({"azerbaijani", "turkish"})
+_TURKIC_CASE = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def _nfkc(word: str) -> str:
+    """Fold compatibility characters (ligatures, full-width forms, composed or decomposed accents) and case."""
+    # Casefolding can produce characters outside NFKC, hence the second pass.
+    return unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", word).casefold())
+
+
+def _strip_accents(word: str) -> str:
+    """Like _nfkc(), and drop combining marks, so that 'École' becomes 'ecole'."""
+    decomposed = unicodedata.normalize("NFD", _nfkc(word))
+    return unicodedata.normalize("NFC", "".join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+_FUNCTIONS: dict[str, Callable[[str], str]] = {"casefold": str.casefold, "nfkc": _nfkc, "accents": _strip_accents}
+
+
+def build_normalizer(normalization: str, turkic: bool, cache_size: int) -> Callable[[str], str]:
+    """
+    Build the normalizer of a normalization mode, shared by the languages using it.
+
+    - 'casefold': Unicode case folding, e.g., 'Straße' and 'STRASSE' both become 'strasse'.
+    - 'nfkc': NFKC normalization and case folding, which also unifies ligatures, full-width forms
+      and precomposed against decomposed accents.
+    - 'accents': like 'nfkc', and removes accents, e.g., 'Été' becomes 'ete'.
+
+    For Turkic languages (see TURKIC_LANGUAGES), 'I' folds to dotless 'ı' and 'İ' to 'i'.
+
+    :param normalization: 'casefold', 'nfkc' or 'accents'.
+    :param turkic: If True, build the variant for Turkic languages.
+    :param cache_size: Number of words the LRU cache of the normalizer remembers.
+
+    :returns: A function normalizing one word, with an LRU cache of cache_size words.
+    :raises ValueError: If the normalization mode is unknown.
+    """
+    try:
+        func = _FUNCTIONS[normalization]
+    except KeyError:
+        raise ValueError(
+            f'Unknown normalization "{normalization}". Available normalizations: {", ".join(_FUNCTIONS)}'
+        ) from None
+
+    if turkic:
+        fold = func
+
+        def func(word: str) -> str:
+            return fold(word.translate(_TURKIC_CASE))
+
+    return lru_cache(maxsize=cache_size)(func)
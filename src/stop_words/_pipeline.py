@@ -0,0 +1,226 @@
+"""
+Declarative stop word filters, fused into a single pass.
+
+Each filter here can be registered with add_filter() like any callable. Unlike
+arbitrary callables, they compare equal by value and describe what they do,
+so apply_filters() compiles every run of consecutive declarative filters into
+one generated loop: each word goes through all of their steps at once, and a
+single list is built, instead of one pass and one list per filter.
+
+The fused loop gives exactly the result of applying the filters one after
+the other, including for Include, whose words go through the steps that
+follow it.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Iterable, cast
+
+
+class DeclarativeFilter:
+    """
+    Base class of the filters apply_filters() fuses into a single pass.
+
+    Filters compare equal, and hash alike, when they are of the same class
+    and have the same parameters, so an equal filter can be passed to
+    remove_filter() and equal chains keep cached stop words valid.
+    """
+
+    __slots__ = ()
+
+    def _parameters(self) -> tuple[object, ...]:
+        """The parameters that identify the filter."""
+        return ()
+
+    def __call__(self, words: list[str], language: str | None = None) -> list[str]:
+        return compile_filters((self,))(words, language)
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and other._parameters() == self._parameters()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._parameters()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self._parameters()))})"
+
+
+class MinLength(DeclarativeFilter):
+    """Drop stop words shorter than a number of characters."""
+
+    __slots__ = ("length",)
+
+    def __init__(self, length: int) -> None:
+        if length < 0:
+            raise ValueError("length must not be negative.")
+        self.length = length
+
+    def _parameters(self) -> tuple[object, ...]:
+        return (self.length,)
+
+
+class MaxLength(DeclarativeFilter):
+    """Drop stop words longer than a number of characters."""
+
+    __slots__ = ("length",)
+
+    def __init__(self, length: int) -> None:
+        if length < 0:
+            raise ValueError("length must not be negative.")
+        self.length = length
+
+    def _parameters(self) -> tuple[object, ...]:
+        return (self.length,)
+
+
+class CaseFold(DeclarativeFilter):
+    """Case-fold every stop word with str.casefold()."""
+
+    __slots__ = ()
+
+
+class Exclude(DeclarativeFilter):
+    """Drop the given words from the stop words."""
+
+    __slots__ = ("words",)
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words = frozenset(words)
+
+    def _parameters(self) -> tuple[object, ...]:
+        return (self.words,)
+
+    def __repr__(self) -> str:
+        return f"Exclude({sorted(self.words)!r})"
+
+
+class Include(DeclarativeFilter):
+    """Append the given words that are not among the stop words yet, in order."""
+
+    __slots__ = ("words",)
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words = tuple(dict.fromkeys(words))
+
+    def _parameters(self) -> tuple[object, ...]:
+        return (self.words,)
+
+    def __repr__(self) -> str:
+        return f"Include({list(self.words)!r})"
+
+
+class RejectPattern(DeclarativeFilter):
+    """Drop the stop words in which a regular expression matches, as re.search() finds it."""
+
+    __slots__ = ("pattern", "flags", "search")
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        import re
+
+        self.pattern = pattern
+        self.flags = flags
+        self.search = re.compile(pattern, flags).search
+
+    def _parameters(self) -> tuple[object, ...]:
+        return (self.pattern, self.flags) if self.flags else (self.pattern,)
+
+
+class FusedFilters:
+    """Consecutive declarative filters compiled into one pass, called like a filter."""
+
+    __slots__ = ("filters", "_run")
+
+    def __init__(self, filters: tuple[DeclarativeFilter, ...], run: Callable[[list[str]], list[str]]) -> None:
+        self.filters = filters
+        self._run = run
+
+    def __call__(self, words: list[str], language: str | None = None) -> list[str]:
+        return self._run(words)
+
+    def __repr__(self) -> str:
+        return " + ".join(map(repr, self.filters))
+
+
+@lru_cache(maxsize=128)
+def compile_filters(filters: tuple[DeclarativeFilter, ...]) -> FusedFilters:
+    """
+    Compile declarative filters into a single pass over the stop words.
+
+    :param filters: The filters, in the order they apply.
+
+    :returns: A filter equivalent to applying them one after the other.
+    """
+    constants: dict[str, object] = {}
+    includes = [position for position, step in enumerate(filters) if isinstance(step, Include)]
+
+    def clauses(start: int) -> tuple[list[str], str]:
+        """Generate the comprehension clauses applying filters[start:] to w0, and the name of the result."""
+        word = "w0"
+        generated = []
+        for position in range(start, len(filters)):
+            step = filters[position]
+            name = f"c{position}"
+            if isinstance(step, MinLength):
+                generated.append(f"if len({word}) >= {step.length}")
+            elif isinstance(step, MaxLength):
+                generated.append(f"if len({word}) <= {step.length}")
+            elif isinstance(step, CaseFold):
+                # CPython turns a loop over a one-item list in a comprehension into a plain assignment.
+                generated.append(f"for w{position + 1} in [{word}.casefold()]")
+                word = f"w{position + 1}"
+            elif isinstance(step, Exclude):
+                constants[name] = step.words
+                generated.append(f"if {word} not in {name}")
+            elif isinstance(step, RejectPattern):
+                constants[name] = step.search
+                generated.append(f"if not {name}({word})")
+            elif isinstance(step, Include):
+                # Remember the words present at this point, which the include must not add again; add() is None.
+                generated.append(f"if not seen{position}.add({word})")
+        return generated, word
+
+    main, word = clauses(0)
+    body = [f"seen{position} = set()" for position in includes]
+    body.append(f"out = [{word} for w0 in words {' '.join(main)}]")
+    for position in includes:
+        constants[f"c{position}"] = cast(Include, filters[position]).words
+        rest, word = clauses(position + 1)
+        body.append(f"out += [{word} for w0 in c{position} if w0 not in seen{position} {' '.join(rest)}]")
+    body.append("return out")
+
+    # The constants are closure variables of run(), which reads them faster than globals.
+    source = "\n".join(
+        [
+            f"def build({', '.join(constants)}):",
+            "    def run(words):",
+            *(f"        {line}" for line in body),
+            "    return run",
+        ]
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)
+    return FusedFilters(filters, namespace["build"](**constants))
+
+
+def fuse(
+    funcs: Iterable[Callable[[list[str], str | None], list[str]]],
+) -> list[Callable[[list[str], str | None], list[str]]]:
+    """
+    Replace every run of consecutive declarative filters in a chain by their compiled pass.
+
+    :param funcs: The filter chain.
+
+    :returns: An equivalent chain; other callables are kept as they are.
+    """
+    fused: list[Callable[[list[str], str | None], list[str]]] = []
+    run: list[DeclarativeFilter] = []
+    for func in [*funcs, None]:
+        if isinstance(func, DeclarativeFilter):
+            run.append(func)
+            continue
+        if run:
+            fused.append(compile_filters(tuple(run)))
+            run = []
+        if func is not None:
+            fused.append(func)
+
+    return fused
@@ -0,0 +1,204 @@
+"""
+Cross-process stop words store in a memory-mapped file.
+
+One process publishes the stop words of several languages into a single
+file; any number of processes then map it read-only. The operating system
+keeps one copy of its pages for all of them, and membership checks run
+against the mapped bytes without building per-process sets. Place the file
+on a memory-backed filesystem (e.g., ``/dev/shm`` on Linux) to avoid disk I/O.
+
+Layout, all integers little-endian:
+
+- Header: magic ``b"SWSHM"``, format version (u8), language count (u32), slot count (u32).
+- One directory entry per language: name size (u16), UTF-8 name, payload offset (u32), payload size (u32).
+- An open-addressing hash table of slot count slots, a power of two: CRC-32 of the word (u32),
+  word offset (u32), word size (u32), bitmask of the languages containing the word (u64).
+  Empty slots have a word size of 0. Bit N stands for the Nth language of the directory.
+- Payloads: the stop words of each language, UTF-8 encoded and joined by newlines.
+  Table slots point into them, at the first occurrence of each word.
+"""
+
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+from ._files import write_atomically
+
+
+MAGIC = b"SWSHM"
+FORMAT_VERSION = 1
+MAX_LANGUAGES = 64
+
+_HEADER = struct.Struct("<5sBII")
+_NAME_SIZE = struct.Struct("<H")
+_ENTRY = struct.Struct("<II")
+_SLOT = struct.Struct("<IIIQ")
+
+
+def build_shared_store(path: Path, stop_words: Iterable[tuple[str, Iterable[str]]]) -> Path:
+    """
+    Write a shared stop words store.
+
+    :param path: Where to write the store.
+    :param stop_words: Pairs of full language name and stop words.
+
+    :returns: Path of the written store.
+    :raises ValueError: If there are more than MAX_LANGUAGES languages.
+    :raises OSError: If the store cannot be written.
+    """
+    languages = [(name.encode("utf-8"), [word.encode("utf-8") for word in words]) for name, words in stop_words]
+    if len(languages) > MAX_LANGUAGES:
+        raise ValueError(f"A shared store holds at most {MAX_LANGUAGES} languages, got {len(languages)}.")
+
+    payloads = [b"\n".join(words) for _, words in languages]
+    directory_size = sum(_NAME_SIZE.size + len(name) + _ENTRY.size for name, _ in languages)
+
+    # Locate every distinct word in the payloads and collect its languages: word -> [offset, size, mask].
+    words: dict[bytes, list[int]] = {}
+    offset = _HEADER.size + directory_size
+    payload_offsets = []
+    for position, (_, language_words) in enumerate(languages):
+        payload_offsets.append(offset)
+        word_offset = offset
+        for word in language_words:
+            if word:
+                located = words.setdefault(word, [word_offset, len(word), 0])
+                located[2] |= 1 << position
+            word_offset += len(word) + 1
+        offset += len(payloads[position])
+
+    # Keep the table at most half full, so probe sequences stay short.
+    slot_count = 1
+    while slot_count < 2 * len(words):
+        slot_count *= 2
+    table = bytearray(slot_count * _SLOT.size)
+    table_size = len(table)
+    payload_offsets = [payload_offset + table_size for payload_offset in payload_offsets]
+    for word, (word_offset, size, mask) in words.items():
+        crc = zlib.crc32(word)
+        slot = crc & (slot_count - 1)
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[2]:
+            slot = (slot + 1) & (slot_count - 1)
+        _SLOT.pack_into(table, slot * _SLOT.size, crc, word_offset + table_size, size, mask)
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(languages), slot_count)]
+    for (name, _), payload_offset, payload in zip(languages, payload_offsets, payloads):
+        parts += [_NAME_SIZE.pack(len(name)), name, _ENTRY.pack(payload_offset, len(payload))]
+    parts.append(table)
+    parts += payloads
+
+    write_atomically(path, b"".join(parts))
+
+    return path
+
+
+class SharedStopWords:
+    """
+    Read-only view of a shared stop words store.
+
+    The directory is parsed when the store is opened; membership checks probe
+    the hash table in the mapped file directly.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Memory-map a shared store.
+
+        :param path: Path of the store.
+
+        :raises OSError: If the file cannot be opened.
+        :raises ValueError: If the file is not a valid store.
+        """
+        self.path = path
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, count, self._slot_count = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"expected {MAGIC!r} format version {FORMAT_VERSION}")
+
+            # Full language name to its (bit, payload offset, payload size).
+            self._languages: dict[str, tuple[int, int, int]] = {}
+            end = _HEADER.size
+            for position in range(count):
+                (name_size,) = _NAME_SIZE.unpack_from(self._mm, end)
+                start, end = end + _NAME_SIZE.size, end + _NAME_SIZE.size + name_size
+                name = self._mm[start:end].decode("utf-8")
+                self._languages[name] = (1 << position, *_ENTRY.unpack_from(self._mm, end))
+                end += _ENTRY.size
+            self._table_offset = end
+        except (struct.error, ValueError) as e:
+            self._mm.close()
+            raise ValueError(f'"{path}" is not a valid shared stop words store: {e}') from e
+
+    @property
+    def languages(self) -> list[str]:
+        """The full names of the languages in the store."""
+        return list(self._languages)
+
+    def __contains__(self, language: object) -> bool:
+        return language in self._languages
+
+    def languages_of(self, word: str) -> int:
+        """
+        Look a word up in the hash table.
+
+        :param word: The word, matched exactly.
+
+        :returns: The bitmask of the languages containing the word, 0 if none.
+        """
+        try:
+            data = word.encode("utf-8")
+        except UnicodeEncodeError:
+            return 0
+
+        crc = zlib.crc32(data)
+        last_slot = self._slot_count - 1
+        slot = crc & last_slot
+        while True:
+            slot_crc, offset, size, mask = _SLOT.unpack_from(self._mm, self._table_offset + slot * _SLOT.size)
+            if not size:
+                return 0
+            end = offset + size
+            if slot_crc == crc and size == len(data) and self._mm[offset:end] == data:
+                return mask
+            slot = (slot + 1) & last_slot
+
+    def contains(self, word: str, language: str) -> bool:
+        """
+        Check whether a word is a stop word of a language in the store.
+
+        :param word: The word, matched exactly.
+        :param language: Full language name.
+
+        :returns: True if the word is a stop word of the language.
+        :raises KeyError: If the language is not in the store.
+        """
+        return bool(self.languages_of(word) & self._languages[language][0])
+
+    def read(self, language: str) -> list[str]:
+        """
+        Decode the stop words of a language.
+
+        :param language: Full language name.
+
+        :returns: The stop words, in published order.
+        :raises KeyError: If the language is not in the store.
+        """
+        _, offset, size = self._languages[language]
+        if not size:
+            return []
+        end = offset + size
+        return self._mm[offset:end].decode("utf-8").split("\n")
+
+    @property
+    def size(self) -> int:
+        """Size of the store in bytes."""
+        return len(self._mm)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._mm.close()
@@ -0,0 +1,179 @@
+"""
+Snapshots of the filtered stop words cache, for fast process start.
+
+A snapshot holds the filtered stop words of every cached language, so a new
+process can fill its cache without reading the data files or running the
+filters. Each language is stamped with a digest of what its stop words were
+built from: the bundled data files, the registered sources and the filter
+chain. A language whose stamp no longer matches is not loaded.
+
+Layout, all integers little-endian:
+
+- Header: magic ``b"SWSNP"``, format version (u8), library version size (u16), UTF-8 library version,
+  language count (u32).
+- One entry per language: name size (u16), UTF-8 name, stamp (16 bytes), payload size (u32),
+  payload: the stop words, UTF-8 encoded and joined by newlines.
+"""
+
+import builtins
+import dis
+import hashlib
+import os
+import struct
+from pathlib import Path
+from types import CodeType
+from typing import Callable, Iterable
+
+from ._files import write_atomically
+from ._pipeline import DeclarativeFilter
+
+
+MAGIC = b"SWSNP"
+FORMAT_VERSION = 1
+STAMP_SIZE = 16
+
+_HEADER = struct.Struct("<5sBH")
+_COUNT = struct.Struct("<I")
+_NAME_SIZE = struct.Struct("<H")
+_PAYLOAD_SIZE = struct.Struct("<I")
+
+
+def stamp(*parts: object) -> bytes:
+    """
+    Digest a description of what stop words were built from.
+
+    :param parts: Values whose repr() is the same in every process for the same input.
+
+    :returns: A STAMP_SIZE-byte digest.
+    """
+    return hashlib.blake2b(repr(parts).encode("utf-8", "surrogatepass"), digest_size=STAMP_SIZE).digest()
+
+
+def describe_filter(func: Callable[[list[str], str | None], list[str]], *, globals_versioned: bool = False) -> object:
+    """
+    Describe a filter so that the same filter is described alike in every process.
+
+    Declarative filters are described by their parameters. Functions are
+    described by their name, code, constants, defaults and closure. Their
+    globals cannot be described, so a function reading globals other than
+    builtins gets a random description, which never matches, unless the
+    caller versions the globals itself. Other callables are described by their
+    repr(), which by default holds their address, so they never match another process.
+
+    :param func: A registered filter.
+    :param globals_versioned: If True, describe functions reading globals like the others.
+
+    :returns: A value whose repr() describes the filter.
+    """
+    if isinstance(func, DeclarativeFilter):
+        return repr(func)
+
+    code = getattr(func, "__code__", None)
+    if not isinstance(code, CodeType):
+        return repr(func)
+    if not globals_versioned and _reads_globals(code, getattr(func, "__globals__", {})):
+        return os.urandom(STAMP_SIZE)
+
+    closure = [cell.cell_contents for cell in getattr(func, "__closure__", None) or ()]
+    return (
+        func.__module__,
+        func.__qualname__,
+        _describe_code(code),
+        [_describe_value(value) for value in getattr(func, "__defaults__", None) or ()],
+        {name: _describe_value(value) for name, value in (getattr(func, "__kwdefaults__", None) or {}).items()},
+        [_describe_value(value) for value in closure],
+    )
+
+
+def _reads_globals(code: CodeType, namespace: dict[str, object]) -> bool:
+    """Tell whether a code object, or one nested in it, reads globals other than builtins."""
+    for instruction in dis.get_instructions(code):
+        if instruction.opname in ("LOAD_GLOBAL", "LOAD_NAME") and (
+            instruction.argval in namespace or instruction.argval not in vars(builtins)
+        ):
+            return True
+    return any(_reads_globals(value, namespace) for value in code.co_consts if isinstance(value, CodeType))
+
+
+def _describe_code(code: CodeType) -> object:
+    """Describe a code object and the code objects nested in it, without their addresses."""
+    constants = [
+        _describe_code(value) if isinstance(value, CodeType) else _describe_value(value) for value in code.co_consts
+    ]
+    return code.co_code, code.co_names, constants
+
+
+def _describe_value(value: object) -> object:
+    """Describe a value a filter holds; sets are sorted, as their order changes between processes."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(repr, value))
+    return value
+
+
+def write_snapshot(path: Path, version: str, entries: Iterable[tuple[str, bytes, Iterable[str]]]) -> Path:
+    """
+    Write a snapshot.
+
+    :param path: Where to write the snapshot.
+    :param version: The library version, as get_version() returns it.
+    :param entries: Triples of full language name, stamp and filtered stop words.
+
+    :returns: Path of the written snapshot.
+    :raises OSError: If the snapshot cannot be written.
+    """
+    version_bytes = version.encode("utf-8")
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(version_bytes)), version_bytes, b""]
+    count = 0
+    for language, language_stamp, words in entries:
+        name = language.encode("utf-8")
+        payload = "\n".join(words).encode("utf-8", "surrogatepass")
+        parts += [_NAME_SIZE.pack(len(name)), name, language_stamp, _PAYLOAD_SIZE.pack(len(payload)), payload]
+        count += 1
+    parts[2] = _COUNT.pack(count)
+
+    write_atomically(path, b"".join(parts))
+
+    return path
+
+
+def read_snapshot(path: Path, version: str) -> dict[str, tuple[bytes, list[str]]]:
+    """
+    Read a snapshot.
+
+    :param path: Path of a snapshot written by write_snapshot().
+    :param version: The current library version.
+
+    :returns: The stamp and stop words of each language by full name, or nothing if the
+        snapshot was written by another format or library version.
+    :raises OSError: If the file cannot be read.
+    :raises ValueError: If the file is not a valid snapshot.
+    """
+    data = path.read_bytes()
+    try:
+        magic, format_version, version_size = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"expected {MAGIC!r}")
+        start, end = _HEADER.size, _HEADER.size + version_size
+        if format_version != FORMAT_VERSION or data[start:end] != version.encode("utf-8"):
+            return {}
+
+        (count,) = _COUNT.unpack_from(data, end)
+        end += _COUNT.size
+        languages = {}
+        for _ in range(count):
+            (name_size,) = _NAME_SIZE.unpack_from(data, end)
+            start, end = end + _NAME_SIZE.size, end + _NAME_SIZE.size + name_size
+            name = data[start:end].decode("utf-8")
+            start, end = end, end + STAMP_SIZE
+            language_stamp = data[start:end]
+            (payload_size,) = _PAYLOAD_SIZE.unpack_from(data, end)
+            start = end + _PAYLOAD_SIZE.size
+            end = start + payload_size
+            if end > len(data):
+                raise ValueError("truncated")
+            payload = data[start:end].decode("utf-8", "surrogatepass")
+            languages[name] = (language_stamp, payload.split("\n") if payload else [])
+    except (struct.error, ValueError) as e:
+        raise ValueError(f'"{path}" is not a valid stop words snapshot: {e}') from e
+
+    return languages
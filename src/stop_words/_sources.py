@@ -0,0 +1,156 @@
+"""
+Stop word sources layered on top of the bundled data.
+
+A source provides the stop words of some languages, by full language name,
+and a fingerprint per language that changes whenever those stop words do.
+stop_words.reload_changed() compares fingerprints to reload only the
+languages whose stop words changed.
+"""
+
+import threading
+from pathlib import Path
+from typing import Iterable, Literal, Mapping, Protocol
+
+
+class StopWordsSource(Protocol):
+    """What add_source() expects of a source."""
+
+    def languages(self) -> Iterable[str]:
+        """Get the full names of the languages this source provides."""
+        ...
+
+    def read(self, language: str) -> list[str] | None:
+        """
+        Read the stop words of a language.
+
+        :param language: Full language name.
+
+        :returns: The stop words, or None if this source does not provide the language.
+        :raises OSError: If the stop words cannot be read.
+        """
+        ...
+
+    def fingerprint(self, language: str) -> object:
+        """
+        Identify the current version of the stop words of a language, cheaply.
+
+        :param language: Full language name.
+
+        :returns: A value that compares equal as long as the stop words are unchanged, or None
+            if this source does not provide the language.
+        """
+        ...
+
+
+class DirectorySource:
+    """
+    Stop words read from ``<language>.txt`` files in a directory, one word per line, like the bundled data.
+
+    Changes are detected by modification time and size, or by content hash,
+    which also ignores files that were rewritten with the same content.
+    """
+
+    def __init__(self, path: str | Path, *, detect: Literal["mtime", "hash"] = "mtime") -> None:
+        """
+        Use a directory as a source.
+
+        :param path: Directory holding ``<language>.txt`` files named after full language names.
+        :param detect: 'mtime' to compare modification times and sizes, 'hash' to compare contents.
+        :raises ValueError: If detect is neither 'mtime' nor 'hash'.
+        """
+        if detect not in ("mtime", "hash"):
+            raise ValueError(f'Unknown change detection "{detect}". Use "mtime" or "hash".')
+        self.path = Path(path)
+        self.detect = detect
+
+    def languages(self) -> list[str]:
+        return sorted(path.stem for path in self.path.glob("*.txt"))
+
+    def read(self, language: str) -> list[str] | None:
+        from ._index import read_words
+
+        try:
+            return read_words(self.path / f"{language}.txt")
+        except FileNotFoundError:
+            return None
+
+    def fingerprint(self, language: str) -> object:
+        language_file = self.path / f"{language}.txt"
+        try:
+            if self.detect == "hash":
+                import hashlib
+
+                return hashlib.blake2b(language_file.read_bytes(), digest_size=16).digest()
+            stat = language_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __repr__(self) -> str:
+        return f"DirectorySource({str(self.path)!r}, detect={self.detect!r})"
+
+
+class MemorySource:
+    """
+    Stop words held in memory, e.g., fetched from a database, and updated with set() and remove().
+
+    Fingerprints are digests of the stop words, so they are the same in every
+    process holding the same stop words, and setting unchanged stop words
+    does not cause a reload.
+
+    Example:
+        >>> source = MemorySource({'english': ['acme', 'inc']})
+        >>> source.set('french', ['acme', 'sarl'])
+    """
+
+    def __init__(self, stop_words: Mapping[str, Iterable[str]] | None = None) -> None:
+        """
+        Create a source.
+
+        :param stop_words: Stop words by full language name.
+        """
+        self._lock = threading.Lock()
+        self._words: dict[str, tuple[str, ...]] = {}
+        self._digests: dict[str, bytes] = {}
+        for language, words in (stop_words or {}).items():
+            self.set(language, words)
+
+    def set(self, language: str, words: Iterable[str]) -> None:
+        """
+        Provide or replace the stop words of a language.
+
+        :param language: Full language name.
+        :param words: The stop words.
+        """
+        import hashlib
+
+        words = tuple(words)
+        digest = hashlib.blake2b(repr(words).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            self._words[language] = words
+            self._digests[language] = digest
+
+    def remove(self, language: str) -> bool:
+        """
+        Stop providing the stop words of a language.
+
+        :param language: Full language name.
+
+        :returns: True if the language was provided, False otherwise.
+        """
+        with self._lock:
+            self._digests.pop(language, None)
+            return self._words.pop(language, None) is not None
+
+    def languages(self) -> list[str]:
+        return list(self._words)
+
+    def read(self, language: str) -> list[str] | None:
+        words = self._words.get(language)
+        return list(words) if words is not None else None
+
+    def fingerprint(self, language: str) -> object:
+        return self._digests.get(language)
+
+    def __repr__(self) -> str:
+        return f"MemorySource({sorted(self._words)!r})"
@@ -0,0 +1,77 @@
+"""
+Vectorized stop word masks over NumPy arrays and pandas objects.
+
+This module needs NumPy and is only imported by stop_word_mask(). pandas is
+never imported here: pandas objects are recognized only if the caller has
+already imported pandas.
+"""
+
+import sys
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+
+def build_sorted_array(words: Iterable[str]) -> npt.NDArray[np.str_]:
+    """
+    Build the sorted, deduplicated array of stop words that fixed-width string arrays are searched in.
+
+    :param words: The stop words.
+
+    :returns: A sorted array of unique stop words.
+    """
+    return np.array(sorted(set(words)), dtype=np.str_)
+
+
+def array_mask(
+    values: npt.NDArray[Any], words: frozenset[str], sorted_words: Callable[[], npt.NDArray[np.str_]]
+) -> npt.NDArray[np.bool_]:
+    """
+    Compute which elements of an array are stop words.
+
+    Fixed-width string arrays are binary-searched in the sorted stop words
+    entirely in C. Other arrays, typically of Python objects whose hashes
+    are cached on the strings, are checked against the frozenset.
+
+    :param values: Array of any shape.
+    :param words: The stop words.
+    :param sorted_words: Returns the sorted stop words array; only called for string arrays.
+
+    :returns: A boolean array of the same shape.
+    """
+    if values.dtype.kind == "U":
+        haystack = sorted_words()
+        if not haystack.size:
+            return np.zeros(values.shape, dtype=np.bool_)
+        positions = np.searchsorted(haystack, values)
+        np.minimum(positions, haystack.size - 1, out=positions)
+        return np.asarray(haystack[positions] == values, dtype=np.bool_)
+
+    flat = values.ravel()
+    return np.fromiter(map(words.__contains__, flat), dtype=np.bool_, count=flat.size).reshape(values.shape)
+
+
+def stop_word_mask(
+    tokens: Any, lookup: Callable[[object], tuple[frozenset[str], Callable[[], npt.NDArray[np.str_]]]]
+) -> Any:
+    """
+    Compute which tokens are stop words.
+
+    :param tokens: A NumPy array, a pandas Series or DataFrame, or anything np.asarray() accepts.
+    :param lookup: Returns the stop words and the getter of their sorted array, given a DataFrame column
+        label, or None for any other input.
+
+    :returns: A boolean array of the same shape, or a boolean Series or DataFrame with the same labels.
+    """
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(tokens, pd.DataFrame):
+        columns = {column: stop_word_mask(tokens[column], lambda _: lookup(column)) for column in tokens.columns}
+        return pd.DataFrame(columns, index=tokens.index, columns=tokens.columns)
+
+    if pd is not None and isinstance(tokens, (pd.Series, pd.Index)):
+        # pandas hashes object columns in C, about twice as fast as probing the frozenset from Python.
+        words, _ = lookup(None)
+        return tokens.isin(words)
+
+    return array_mask(np.asarray(tokens), *lookup(None))
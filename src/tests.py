@@ -1,19 +1,83 @@
+import asyncio
+import gc
+import multiprocessing
+import os
 import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest import TestCase
+from typing import Iterator
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipUnless
 
 import stop_words
+from benchmarks import compare
 from stop_words import (
     AVAILABLE_LANGUAGES,
     LANGUAGE_MAPPING,
     STOP_WORDS_CACHE,
+    CaseFold,
+    CompactStopWords,
+    DirectorySource,
+    Exclude,
+    Include,
+    InstrumentationEvent,
+    MaxLength,
+    MemorySource,
+    MinLength,
+    RejectPattern,
     StopWordError,
+    StopWordsStats,
     add_filter,
+    add_hook,
+    add_source,
+    aget_stop_words,
+    apply_filters,
+    attach_shared_store,
+    cache_info,
+    configure_cache,
+    detach_shared_store,
+    detect_language,
+    filter_documents,
+    find_stop_words,
+    get_compact_stop_words,
+    get_normalizer,
     get_stop_words,
+    get_stop_words_multi,
+    get_stop_words_set,
     get_version,
+    is_stop_word,
+    load_cache,
+    preload_for_fork,
+    publish_shared_store,
+    reload_changed,
     remove_filter,
+    remove_hook,
+    remove_source,
+    remove_stop_words,
+    remove_stop_words_batch,
     safe_get_stop_words,
+    save_cache,
+    stop_word_mask,
+    strip_stop_words,
+    warm_up,
 )
+from stop_words._cache import measure_size
+from stop_words._index import StopWordsIndex, build_index, index_path, read_words
+from stop_words._shared import MAX_LANGUAGES, build_shared_store
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None  # type: ignore[assignment]
 
 
 class TestStopWordsBasic(TestCase):
@@ -55,6 +119,56 @@ class TestStopWordsBasic(TestCase):
         self.assertIsNotNone(get_version())
 
 
+class TestLazyImport(TestCase):
+    """Test that importing the module defers loading the language mapping."""
+
+    def test_import_does_not_load_language_mapping(self) -> None:
+        """A bare import should neither parse languages.json nor import json."""
+        code = (
+            "import sys, stop_words; "
+            "print(sorted({'LANGUAGE_MAPPING', 'AVAILABLE_LANGUAGES'} & set(vars(stop_words))), 'json' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[] False")
+
+    def test_import_defers_submodules(self) -> None:
+        """A bare import should load neither threading nor the submodules of optional features."""
+        code = (
+            "import sys, stop_words; "
+            "print(sorted(name for name in sys.modules if name.startswith('stop_words.')), 'threading' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "['stop_words._cache'] False")
+
+    def test_lazy_exports_resolve(self) -> None:
+        """Classes of the lazily imported submodules should still be reachable from the package."""
+        from stop_words._compact import CompactStopWords
+        from stop_words._pipeline import Exclude, fuse
+        from stop_words._sources import MemorySource
+
+        self.assertIs(stop_words.CompactStopWords, CompactStopWords)
+        self.assertIs(stop_words.Exclude, Exclude)
+        self.assertIs(stop_words.fuse, fuse)
+        self.assertIs(stop_words.MemorySource, MemorySource)
+        with self.assertRaises(AttributeError):
+            stop_words.NoSuchName  # noqa: B018
+
+    def test_lazy_attributes_resolve_once(self) -> None:
+        """The lazy globals should behave like regular module attributes."""
+        self.assertIs(stop_words.LANGUAGE_MAPPING, LANGUAGE_MAPPING)
+        self.assertIs(stop_words.AVAILABLE_LANGUAGES, AVAILABLE_LANGUAGES)
+        self.assertEqual(AVAILABLE_LANGUAGES, list(LANGUAGE_MAPPING.values()))
+
+    def test_unknown_attribute_raises(self) -> None:
+        """Other missing attributes should still raise AttributeError."""
+        with self.assertRaises(AttributeError):
+            stop_words.NOT_AN_ATTRIBUTE  # type: ignore[attr-defined]
+
+
 class TestStopWordsCache(TestCase):
     """Test caching behavior."""
 
@@ -118,6 +232,1708 @@ class TestStopWordsCache(TestCase):
         sw3 = get_stop_words("en")
         self.assertNotIn("custom_word", sw3)
 
+    def test_copy_false_returns_cached_tuple(self) -> None:
+        """copy=False should return the cached data itself, read-only."""
+        view = get_stop_words("en", copy=False)
+        self.assertIsInstance(view, tuple)
+        self.assertIs(view, STOP_WORDS_CACHE["english"])
+        self.assertIs(view, get_stop_words("english", copy=False))
+        self.assertEqual(list(view), get_stop_words("en"))
+
+    def test_copy_false_cannot_corrupt_cache(self) -> None:
+        """The read-only view should reject modification."""
+        view = get_stop_words("en", copy=False)
+        with self.assertRaises((TypeError, AttributeError)):
+            view.append("custom_word")  # type: ignore[attr-defined]
+        self.assertNotIn("custom_word", get_stop_words("en"))
+
+    def test_assigned_lists_are_copied(self) -> None:
+        """Lists assigned to the cache directly should be stored as tuples, out of the caller's reach."""
+        self.addCleanup(STOP_WORDS_CACHE.clear)
+        words = ["x"]
+        STOP_WORDS_CACHE["english"] = words
+        STOP_WORDS_CACHE.update(french=["y"])
+        words.append("z")
+
+        self.assertEqual(get_stop_words("en", copy=False), ("x",))
+        self.assertEqual(get_stop_words("fr", copy=False), ("y",))
+        self.assertFalse(is_stop_word("z", "en"))
+
+    def test_copy_false_without_cache(self) -> None:
+        """copy=False should also work when caching is disabled."""
+        view = get_stop_words("de", cache=False, copy=False)
+        self.assertIsInstance(view, tuple)
+        self.assertNotIn("german", STOP_WORDS_CACHE)
+
+
+class TestStopWordsCacheLimits(TestCase):
+    """Test the bounded cache and its statistics."""
+
+    def setUp(self) -> None:
+        """Start from an empty, unbounded cache."""
+        STOP_WORDS_CACHE.clear()
+        configure_cache()
+
+    def tearDown(self) -> None:
+        """Restore the unbounded cache."""
+        configure_cache()
+        STOP_WORDS_CACHE.clear()
+
+    def test_unbounded_by_default(self) -> None:
+        """Without limits, every loaded language should stay cached."""
+        for language in AVAILABLE_LANGUAGES:
+            get_stop_words(language, copy=False)
+        info = cache_info()
+        self.assertEqual(info.languages, len(AVAILABLE_LANGUAGES))
+        self.assertEqual(info.evictions, 0)
+        self.assertIsNone(info.max_languages)
+        self.assertIsNone(info.max_bytes)
+
+    def test_hits_and_misses(self) -> None:
+        """Lookups should be counted like functools.lru_cache does."""
+        get_stop_words("en")
+        get_stop_words("en")
+        get_stop_words("english")
+        get_stop_words("de", cache=False)
+        info = cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_repeated_membership_checks_are_counted(self) -> None:
+        """Membership checks answered without going through the cache should still count as hits."""
+        for _ in range(3):
+            is_stop_word("the", "en")
+            get_stop_words_set("en")
+        info = cache_info()
+        self.assertEqual((info.hits, info.misses), (5, 1))
+
+    def test_repeated_membership_checks_keep_recency(self) -> None:
+        """Repeated membership checks should keep a language recently used in a bounded cache."""
+        configure_cache(max_languages=2)
+        is_stop_word("the", "en")
+        is_stop_word("le", "fr")
+        for _ in range(3):
+            is_stop_word("the", "en")
+        is_stop_word("der", "de")
+
+        self.assertEqual(set(STOP_WORDS_CACHE), {"english", "german"})
+
+    def test_lru_eviction_by_language_count(self) -> None:
+        """The least recently used language should be evicted first."""
+        configure_cache(max_languages=2)
+        get_stop_words("en")
+        get_stop_words("fr")
+        get_stop_words("en")
+        get_stop_words("de")
+
+        self.assertEqual(set(STOP_WORDS_CACHE), {"english", "german"})
+        self.assertEqual(cache_info().evictions, 1)
+
+    def test_eviction_by_memory_budget(self) -> None:
+        """The measured size of the cache should stay within the byte budget."""
+        get_stop_words("en")
+        english_bytes = cache_info().bytes
+        self.assertGreater(english_bytes, 0)
+
+        configure_cache(max_bytes=english_bytes)
+        self.assertIn("english", STOP_WORDS_CACHE)
+        get_stop_words("fr")
+
+        info = cache_info()
+        self.assertNotIn("english", STOP_WORDS_CACHE)
+        self.assertLessEqual(info.bytes, english_bytes)
+        self.assertEqual(info.evictions, 1)
+
+    def test_derived_set_is_accounted_and_evicted(self) -> None:
+        """The cached frozenset should count towards the size and leave with its entry."""
+        get_stop_words("en")
+        words_only = cache_info().bytes
+        sw_set = get_stop_words_set("en")
+        self.assertGreater(cache_info().bytes, words_only)
+
+        configure_cache(max_languages=0)
+        self.assertEqual(cache_info().bytes, 0)
+        configure_cache()
+        self.assertIsNot(get_stop_words_set("en"), sw_set)
+
+    def test_mutators_keep_accounting(self) -> None:
+        """Dictionary mutators should keep the size accounting consistent."""
+        get_stop_words("en")
+        get_stop_words("fr")
+        STOP_WORDS_CACHE.pop("english")
+        del STOP_WORDS_CACHE["french"]
+        self.assertEqual(cache_info().bytes, 0)
+
+        STOP_WORDS_CACHE.update(custom=("foo", "bar"))
+        self.assertEqual(STOP_WORDS_CACHE["custom"], ("foo", "bar"))
+        self.assertGreater(cache_info().bytes, 0)
+
+    def test_negative_limit_raises(self) -> None:
+        """Negative limits should be rejected."""
+        with self.assertRaises(ValueError):
+            configure_cache(max_languages=-1)
+
+
+class TestStopWordsSet(TestCase):
+    """Test the frozenset membership API."""
+
+    def setUp(self) -> None:
+        """Clear cache before each test."""
+        STOP_WORDS_CACHE.clear()
+
+    def test_returns_frozenset_matching_list(self) -> None:
+        """The set should contain exactly the words of get_stop_words()."""
+        sw_set = get_stop_words_set("en")
+        self.assertIsInstance(sw_set, frozenset)
+        self.assertEqual(sw_set, set(get_stop_words("english")))
+
+    def test_set_is_shared_between_calls(self) -> None:
+        """Cached languages should return the very same set object."""
+        self.assertIs(get_stop_words_set("en"), get_stop_words_set("english"))
+
+    def test_set_rebuilt_after_cache_clear(self) -> None:
+        """Clearing the cache should also drop the derived set."""
+        sw_set = get_stop_words_set("fr")
+        STOP_WORDS_CACHE.clear()
+        self.assertIsNot(get_stop_words_set("fr"), sw_set)
+
+    def test_set_without_cache(self) -> None:
+        """cache=False should neither read nor populate the cache."""
+        sw_set = get_stop_words_set("de", cache=False)
+        self.assertIn("und", sw_set)
+        self.assertNotIn("german", STOP_WORDS_CACHE)
+
+    def test_is_stop_word(self) -> None:
+        """is_stop_word should test membership in the language's stop words."""
+        self.assertTrue(is_stop_word("the", "en"))
+        self.assertFalse(is_stop_word("python", "en"))
+        self.assertFalse(is_stop_word("The", "en"))
+
+    def test_is_stop_word_unknown_language(self) -> None:
+        """Unknown languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            is_stop_word("the", "sindarin")
+
+    def test_set_respects_filters(self) -> None:
+        """Filters should apply to the set just like to the list."""
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        try:
+            self.assertFalse(is_stop_word("the", "en"))
+        finally:
+            remove_filter(drop_the, language="english")
+            STOP_WORDS_CACHE.clear()
+
+
+class TestCompactStopWords(TestCase):
+    """Test the compact representation and compact mode."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Leave compact mode and restore the filters."""
+        configure_cache()
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_same_members_as_set(self) -> None:
+        """The compact form should contain exactly the stop words of every language."""
+        for language in AVAILABLE_LANGUAGES:
+            with self.subTest(language=language):
+                words = get_stop_words_set(language)
+                compact = CompactStopWords(words)
+                self.assertEqual(len(compact), len(words))
+                self.assertEqual(set(compact), words)
+                self.assertTrue(all(word in compact for word in words))
+
+    def test_non_members(self) -> None:
+        """Words that are not stop words, prefixes of stop words and non-strings should not match."""
+        compact = CompactStopWords(["the", "a", "an", "the"])
+        self.assertEqual(len(compact), 3)
+        for word in ["th", "then", "", "The", None, 1]:
+            self.assertNotIn(word, compact)
+        self.assertNotIn("a", CompactStopWords([]))
+        self.assertEqual(list(CompactStopWords([])), [])
+
+    def test_hash_collisions_compare_strings(self) -> None:
+        """Words sharing a hash should only match themselves."""
+        with mock.patch("stop_words._compact.hash", lambda word: len(word), create=True):
+            compact = CompactStopWords(["ab", "cd", "efg"])
+            self.assertIn("ab", compact)
+            self.assertIn("cd", compact)
+            self.assertNotIn("xy", compact)
+
+    def test_smaller_than_set(self) -> None:
+        """The compact form should be much smaller than a frozenset and its strings."""
+        words = get_stop_words("en", copy=False)
+        compact = get_compact_stop_words("en")
+        self.assertLess(sys.getsizeof(compact) * 3, measure_size(frozenset(words)))
+
+    def test_built_once_and_outside_the_cache(self) -> None:
+        """The compact form should be reused, and not add the language to STOP_WORDS_CACHE."""
+        compact = get_compact_stop_words("fr")
+        self.assertIs(get_compact_stop_words("french"), compact)
+        self.assertNotIn("french", STOP_WORDS_CACHE)
+
+    def test_rebuilt_after_filter_change(self) -> None:
+        """A filter change should rebuild the compact form."""
+        self.assertIn("the", get_compact_stop_words("en"))
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        self.assertNotIn("the", get_compact_stop_words("en"))
+
+    def test_compact_mode(self) -> None:
+        """In compact mode, lookups and removal should use the compact form and leave the cache empty."""
+        configure_cache(compact=True)
+        self.assertTrue(is_stop_word("the", "en"))
+        self.assertFalse(is_stop_word("fox", "en"))
+        self.assertEqual(list(remove_stop_words(["the", "fox"], "en")), ["fox"])
+        self.assertEqual(remove_stop_words_batch([["le", "chat"]], "fr"), [["chat"]])
+        warm_up(["de"])
+        self.assertEqual(len(STOP_WORDS_CACHE), 0)
+        self.assertEqual(set(stop_words._compact_stop_words), {"english", "french", "german"})
+
+        configure_cache()
+        self.assertEqual(stop_words._compact_stop_words, {})
+        self.assertTrue(is_stop_word("the", "en"))
+        self.assertIn("english", STOP_WORDS_CACHE)
+
+    def test_unavailable_language(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            get_compact_stop_words("sindarin")
+
+
+class TestNormalizedLookups(TestCase):
+    """Test case- and accent-insensitive sets and lookups."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Restore the filters."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_casefold(self) -> None:
+        """Case folding should handle characters that lowercasing gets wrong."""
+        self.assertFalse(is_stop_word("ÜBER", "de"))
+        self.assertTrue(is_stop_word("ÜBER", "de", normalize="casefold"))
+        # 'ß' folds to 'ss', on both sides.
+        self.assertTrue(is_stop_word("DASS", "de", normalize="casefold"))
+        self.assertIn("dass", get_stop_words_set("de", normalize="casefold"))
+
+    def test_turkish_dotted_and_dotless_i(self) -> None:
+        """Turkish should fold 'İ' to 'i' and 'I' to 'ı'."""
+        self.assertTrue(is_stop_word("DİYE", "tr", normalize="casefold"))
+        self.assertFalse(is_stop_word("DIYE", "tr", normalize="casefold"))
+        self.assertTrue(is_stop_word("BİR", "turkish", normalize="nfkc"))
+        # Other languages fold 'I' to 'i'.
+        self.assertTrue(is_stop_word("IF", "en", normalize="casefold"))
+
+    def test_nfkc(self) -> None:
+        """NFKC should unify full-width forms and decomposed accents."""
+        self.assertTrue(is_stop_word("Ｔｈｅ", "en", normalize="nfkc"))
+        self.assertFalse(is_stop_word("Ｔｈｅ", "en", normalize="casefold"))
+        self.assertTrue(is_stop_word("e\u0301te\u0301", "fr", normalize="nfkc"))
+
+    def test_accents(self) -> None:
+        """Accent-insensitive lookups should ignore diacritics on both sides."""
+        self.assertTrue(is_stop_word("Ou", "fr", normalize="accents"))
+        self.assertTrue(is_stop_word("uber", "de", normalize="accents"))
+        self.assertIn("ete", get_stop_words_set("fr", normalize="accents"))
+
+    def test_sets_are_cached_per_mode(self) -> None:
+        """Each mode should have its own set, built once per cache entry."""
+        casefolded = get_stop_words_set("de", normalize="casefold")
+        self.assertIs(get_stop_words_set("german", normalize="casefold"), casefolded)
+        self.assertIsNot(get_stop_words_set("de", normalize="accents"), casefolded)
+        self.assertIsNot(get_stop_words_set("de"), casefolded)
+
+        uncached = get_stop_words_set("de", cache=False, normalize="casefold")
+        self.assertEqual(uncached, casefolded)
+        self.assertIsNot(uncached, casefolded)
+
+    def test_filters_refresh_normalized_sets(self) -> None:
+        """Normalized sets should follow filter changes like the plain ones."""
+        self.assertTrue(is_stop_word("THE", "en", normalize="casefold"))
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        self.assertFalse(is_stop_word("THE", "en", normalize="casefold"))
+
+    def test_get_normalizer(self) -> None:
+        """The public normalizer should match the normalized set and be shared."""
+        normalize_word = get_normalizer("de", "accents")
+        self.assertIs(get_normalizer("german", "accents"), normalize_word)
+        self.assertEqual(normalize_word("ÜBER"), "uber")
+        self.assertIn(normalize_word("Über"), get_stop_words_set("de", normalize="accents"))
+        with self.assertRaises(StopWordError):
+            get_normalizer("sindarin", "accents")
+
+    def test_normalizers_are_shared_between_languages(self) -> None:
+        """Languages should share one normalizer per mode, except Turkic languages, which share another."""
+        normalize_word = get_normalizer("de", "casefold")
+        self.assertIs(get_normalizer("fr", "casefold"), normalize_word)
+        self.assertIsNot(get_normalizer("de", "accents"), normalize_word)
+        self.assertIsNot(get_normalizer("tr", "casefold"), normalize_word)
+        self.assertEqual(get_normalizer("tr", "casefold")("DIYE"), "dıye")
+        self.assertEqual(normalize_word("DIYE"), "diye")
+
+    def test_token_cache_size(self) -> None:
+        """The token cache size should be configurable, and changing it should start new normalizers."""
+        normalize_word = get_normalizer("de", "casefold")
+        try:
+            configure_cache(token_cache_size=16)
+            resized = get_normalizer("de", "casefold")
+            self.assertIsNot(resized, normalize_word)
+            self.assertEqual(resized.cache_info().maxsize, 16)  # type: ignore[attr-defined]
+            self.assertTrue(is_stop_word("ÜBER", "de", normalize="casefold"))
+
+            configure_cache(token_cache_size=16)
+            self.assertIs(get_normalizer("de", "casefold"), resized)
+            with self.assertRaises(ValueError):
+                configure_cache(token_cache_size=-1)
+        finally:
+            configure_cache()
+
+    def test_unknown_mode(self) -> None:
+        """Unknown normalization modes should raise ValueError."""
+        with self.assertRaises(ValueError):
+            is_stop_word("the", "en", normalize="upper")  # type: ignore[arg-type]
+        with self.assertRaises(ValueError):
+            get_stop_words_set("en", normalize="upper")  # type: ignore[arg-type]
+
+
+class TestStopWordsMulti(TestCase):
+    """Test merged stop word sets of several languages."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Restore the filters."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_union_of_languages(self) -> None:
+        """The result should be the union of the per-language sets."""
+        merged = get_stop_words_multi(["en", "fr", "de", "es"])
+        expected = set().union(*(get_stop_words_set(language) for language in ("en", "fr", "de", "es")))
+        self.assertIsInstance(merged, frozenset)
+        self.assertEqual(merged, expected)
+
+    def test_cached_per_normalized_language_set(self) -> None:
+        """Order, codes and full names should map to the same cached union."""
+        merged = get_stop_words_multi(["en", "fr"])
+        self.assertIs(get_stop_words_multi(["french", "english", "en"]), merged)
+        self.assertIs(get_stop_words_multi(("fr", "en")), merged)
+
+    def test_single_language_string(self) -> None:
+        """A single language string should behave like a one-element list."""
+        self.assertEqual(get_stop_words_multi("en"), get_stop_words_set("en"))
+
+    def test_all_languages(self) -> None:
+        """'all' should merge every available language."""
+        merged = get_stop_words_multi("all")
+        self.assertEqual(len(STOP_WORDS_CACHE), len(AVAILABLE_LANGUAGES))
+        self.assertTrue(all(get_stop_words_set(language) <= merged for language in AVAILABLE_LANGUAGES))
+        self.assertIs(get_stop_words_multi(["all"]), merged)
+
+    def test_union_survives_unrelated_cache_changes(self) -> None:
+        """Loading another language should not force a rebuild of the union."""
+        merged = get_stop_words_multi(["en", "fr"])
+        get_stop_words("de")
+        self.assertIs(get_stop_words_multi(["en", "fr"]), merged)
+
+    def test_union_respects_filters(self) -> None:
+        """A filter change should be reflected in the union."""
+        self.assertIn("the", get_stop_words_multi(["en", "fr"]))
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the)
+        self.assertNotIn("the", get_stop_words_multi(["en", "fr"]))
+
+    def test_unknown_language_raises(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            get_stop_words_multi(["en", "sindarin"])
+
+
+@skipUnless(np is not None, "needs NumPy")
+class TestStopWordMask(TestCase):
+    """Test vectorized stop word masks."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Restore the filters."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_string_array(self) -> None:
+        """Fixed-width string arrays of any shape should be masked element-wise."""
+        tokens = np.array([["the", "fox"], ["zzzz", "and"]])
+        np.testing.assert_array_equal(stop_word_mask(tokens, "en"), [[True, False], [False, True]])
+        np.testing.assert_array_equal(stop_word_mask(np.array([], dtype=str), "en"), np.array([], dtype=bool))
+
+    def test_object_array_and_list(self) -> None:
+        """Object arrays and lists should be masked, with non-strings never matching."""
+        tokens = np.array(["the", None, 3.5, "fox"], dtype=object)
+        np.testing.assert_array_equal(stop_word_mask(tokens, "en"), [True, False, False, False])
+        np.testing.assert_array_equal(stop_word_mask(["le", "the"], "fr"), [True, False])
+
+    def test_agrees_with_set_membership(self) -> None:
+        """Both strategies should agree with the cached set on every stop word and a few others."""
+        words = get_stop_words_set("de")
+        tokens = sorted(words) + ["", "zzzz", "Der", "aaaa"]
+        expected = [token in words for token in tokens]
+        np.testing.assert_array_equal(stop_word_mask(np.array(tokens), "de"), expected)
+        np.testing.assert_array_equal(stop_word_mask(np.array(tokens, dtype=object), "de"), expected)
+
+    def test_several_languages(self) -> None:
+        """Several languages should match the stop words of any of them."""
+        tokens = np.array(["the", "le", "der", "zzzz"])
+        np.testing.assert_array_equal(stop_word_mask(tokens, ["en", "fr"]), [True, True, False, False])
+        np.testing.assert_array_equal(stop_word_mask(tokens, "all"), [True, True, True, False])
+
+    def test_structures_are_cached_and_follow_filters(self) -> None:
+        """The sorted array should be built once and rebuilt after a filter change."""
+        stop_word_mask(np.array(["the"]), "en")
+        haystack = STOP_WORDS_CACHE._entries["english"].derived["sorted_array"]
+        stop_word_mask(np.array(["fox"]), "en")
+        self.assertIs(STOP_WORDS_CACHE._entries["english"].derived["sorted_array"], haystack)
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        np.testing.assert_array_equal(stop_word_mask(np.array(["the", "and"]), "en"), [False, True])
+
+    @skipUnless(pd is not None, "needs pandas")
+    def test_series_and_index(self) -> None:
+        """Series should give a boolean Series with the same labels, Index a boolean array."""
+        series = pd.Series(["the", "fox", None], index=["a", "b", "c"], name="token")
+        mask = stop_word_mask(series, "en")
+        pd.testing.assert_series_equal(mask, pd.Series([True, False, False], index=["a", "b", "c"], name="token"))
+        np.testing.assert_array_equal(stop_word_mask(pd.Index(["and", "fox"]), "en"), [True, False])
+
+    @skipUnless(pd is not None, "needs pandas")
+    def test_dataframe(self) -> None:
+        """DataFrames should be masked with one language for all columns, or one per column."""
+        frame = pd.DataFrame({"title_en": ["the", "le"], "title_fr": ["the", "le"]}, index=[10, 20])
+        expected = pd.DataFrame({"title_en": [True, False], "title_fr": [False, True]}, index=[10, 20])
+        pd.testing.assert_frame_equal(stop_word_mask(frame, {"title_en": "en", "title_fr": "fr"}), expected)
+        self.assertTrue(stop_word_mask(frame, ["en", "fr"]).all().all())
+
+        with self.assertRaises(KeyError):
+            stop_word_mask(frame, {"title_en": "en"})
+        with self.assertRaises(TypeError):
+            stop_word_mask(np.array(["the"]), {"title_en": "en"})
+
+    def test_unavailable_language(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            stop_word_mask(np.array(["the"]), "sindarin")
+
+
+class TestDetectLanguage(TestCase):
+    """Test stop-word-based language detection."""
+
+    def tearDown(self) -> None:
+        """Restore the filters and drop the index built with them."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        stop_words._language_index = None
+        STOP_WORDS_CACHE.clear()
+
+    def test_detects_language_of_text(self) -> None:
+        """Texts full of stop words should be attributed to their language."""
+        samples = {
+            "english": "The cat is on the table and it does not want to move",
+            "french": "Le chat est sur la table et il ne veut pas bouger",
+            "german": "Die Katze ist auf dem Tisch und sie will sich nicht bewegen",
+            "spanish": "El gato está en la mesa y no quiere moverse de ahí",
+        }
+        for language, text in samples.items():
+            with self.subTest(language=language):
+                self.assertEqual(detect_language(text), language)
+
+    def test_accepts_tokens(self) -> None:
+        """Token iterables, including generators, should be accepted and lowercased."""
+        self.assertEqual(detect_language(iter(["The", "cat", "IS", "here"])), "english")
+
+    def test_candidates_restrict_result(self) -> None:
+        """Only candidate languages should be considered."""
+        text = "Le chat est sur la table"
+        self.assertEqual(detect_language(text, candidates=["en", "fr"]), "french")
+        self.assertEqual(detect_language(text, candidates=["english"]), "english")
+
+    def test_no_stop_words_returns_none(self) -> None:
+        """Texts without any stop word should not be attributed to a language."""
+        self.assertIsNone(detect_language("xyzzy qwfp"))
+        self.assertIsNone(detect_language([]))
+
+    def test_unknown_candidate_raises(self) -> None:
+        """Unavailable candidate languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            detect_language("the cat", candidates=["sindarin"])
+
+    def test_index_respects_filters(self) -> None:
+        """The index should be rebuilt when filters change."""
+        self.assertEqual(detect_language("the the the", candidates=["en", "fr"]), "english")
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        self.assertIsNone(detect_language("the the the", candidates=["en", "fr"]))
+
+    def test_index_survives_cache_changes(self) -> None:
+        """Loading and evicting languages should neither rebuild the index nor fill a bounded cache."""
+        configure_cache(max_languages=2)
+        try:
+            get_stop_words("en")
+            self.assertEqual(detect_language("le chat est sur la table"), "french")
+            self.assertEqual(set(STOP_WORDS_CACHE), {"english"})
+            _, index = stop_words._get_language_index()
+
+            for language in ("fr", "de", "es"):
+                get_stop_words(language)
+            self.assertEqual(detect_language("the cat is on the table"), "english")
+            self.assertIs(stop_words._get_language_index()[1], index)
+        finally:
+            configure_cache()
+
+    def test_index_rereads_only_changed_languages(self) -> None:
+        """A filter for one language should leave the stop words of the others in the index."""
+        detect_language("")
+        before = stop_words._language_index
+        assert before is not None
+        french = before[1].index("french")
+
+        add_filter(lambda words, _lang: [w for w in words if w != "the"], language="english")
+        self.assertIsNone(detect_language("the", candidates=["en", "fr"]))
+        after = stop_words._language_index
+        assert after is not None
+        self.assertIs(after[3][french], before[3][french])
+
+    def test_index_follows_sources_and_assignments(self) -> None:
+        """Reloaded sources and directly assigned cache entries should be reflected in the index."""
+        source = MemorySource({"english": ["xyzzy"]})
+        add_source(source, extend=True)
+        try:
+            self.assertEqual(detect_language("xyzzy"), "english")
+            source.set("english", ["plugh"])
+            reload_changed()
+            self.assertIsNone(detect_language("xyzzy"))
+            self.assertEqual(detect_language("plugh"), "english")
+        finally:
+            remove_source(source)
+
+        STOP_WORDS_CACHE["french"] = ("plover",)
+        self.assertEqual(detect_language("plover"), "french")
+        del STOP_WORDS_CACHE["french"]
+        self.assertIsNone(detect_language("plover"))
+
+    def test_languages_of_sources(self) -> None:
+        """Languages only a source provides should be detected, and accepted as candidates."""
+        source = MemorySource({"klingon": ["qa", "vaj"]})
+        add_source(source)
+        self.addCleanup(remove_source, source)
+        self.assertEqual(detect_language("qa vaj qa", candidates=["klingon", "en"]), "klingon")
+        self.assertEqual(detect_language("qa vaj qa"), "klingon")
+
+        # A directory source can start to provide a language without any reload.
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        directory = DirectorySource(tmp_dir)
+        add_source(directory)
+        self.addCleanup(remove_source, directory)
+        self.assertEqual(detect_language("the fox"), "english")
+        (tmp_dir / "sindarin.txt").write_text("i\nen\n", encoding="utf-8")
+        self.assertEqual(detect_language("i en i", candidates=["sindarin", "klingon"]), "sindarin")
+        with self.assertRaises(StopWordError):
+            detect_language("qa", candidates=["quenya"])
+
+
+class TestStopWordsInText(TestCase):
+    """Test finding and stripping stop words in raw text."""
+
+    def tearDown(self) -> None:
+        """Restore the filters."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_find_returns_spans(self) -> None:
+        """Spans should point at whole stop words in the original text, whatever their case."""
+        text = "The fox, AND the dog."
+        spans = find_stop_words(text, "en")
+        self.assertEqual(spans, [(0, 3), (9, 12), (13, 16)])
+        self.assertEqual([text[start:end] for start, end in spans], ["The", "AND", "the"])
+
+    def test_find_matches_whole_words_only(self) -> None:
+        """Stop words inside longer words should not match."""
+        self.assertEqual(find_stop_words("theory andante", "en"), [])
+
+    def test_find_prefers_longest_word(self) -> None:
+        """Words with apostrophes and multi-word entries should be matched as a whole."""
+        self.assertEqual(find_stop_words("I can't swim", "en"), [(0, 1), (2, 7)])
+        phrase = next(word for word in get_stop_words("vi") if " " in word)
+        self.assertEqual(find_stop_words(f"x {phrase} x", "vi"), [(2, 2 + len(phrase))])
+
+    def test_find_with_length_changing_lowercase(self) -> None:
+        """Offsets should stay valid when lowercasing changes the length of the text."""
+        text = "İstanbul, the fox"
+        self.assertEqual(find_stop_words(text, "en"), [(10, 13)])
+
+    def test_stop_words_with_capitals_match_in_any_text(self) -> None:
+        """Stop words listed with capitals should match whether or not lowercasing changes the text length."""
+        self.assertEqual(find_stop_words("WHO who", "gu"), [(0, 3), (4, 7)])
+        self.assertEqual(find_stop_words("İ WHO who", "gu"), [(2, 5), (6, 9)])
+        self.assertEqual(find_stop_words("INSERmi insermi", "tr"), [(0, 7), (8, 15)])
+        self.assertEqual(find_stop_words("İ INSERmi insermi", "tr"), [(2, 9), (10, 17)])
+
+    def test_strip_keeps_case_and_punctuation(self) -> None:
+        """Stripping should remove stop words and the whitespace after them, and nothing else."""
+        self.assertEqual(strip_stop_words("The fox, AND the dog.", "en"), "fox, dog.")
+        self.assertEqual(strip_stop_words("", "en"), "")
+
+    def test_strip_agrees_with_token_removal(self) -> None:
+        """On space-separated lowercase text, stripping should match token removal."""
+        tokens = "the quick brown fox jumps over the lazy dog".split()
+        self.assertEqual(strip_stop_words(" ".join(tokens), "en").split(), list(remove_stop_words(tokens, "en")))
+
+    def test_matcher_is_cached_and_respects_filters(self) -> None:
+        """The matcher should be built once per cache entry and rebuilt after a filter change."""
+        find_stop_words("the fox", "en")
+        entry = STOP_WORDS_CACHE._entries["english"]
+        matcher = entry.derived["matcher"]
+        find_stop_words("the dog", "en")
+        self.assertIs(STOP_WORDS_CACHE._entries["english"].derived["matcher"], matcher)
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the, language="english")
+        self.assertEqual(strip_stop_words("the fox is here", "en"), "the fox ")
+
+    def test_several_languages(self) -> None:
+        """Several languages should match the stop words of any of them, through one cached matcher."""
+        self.assertEqual(strip_stop_words("Le chat and the dog", ["en", "fr"]), "chat dog")
+        self.assertEqual(find_stop_words("le the", ("french",)), [(0, 2)])
+        self.assertEqual(strip_stop_words("the fox", ["en"]), strip_stop_words("the fox", "en"))
+
+    def test_unavailable_language(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            find_stop_words("the fox", "sindarin")
+        with self.assertRaises(StopWordError):
+            find_stop_words("the fox", ["en", "sindarin"])
+        with self.assertRaises(StopWordError):
+            strip_stop_words("the fox", "sindarin")
+
+
+class TestRemoveStopWords(TestCase):
+    """Test streaming stop word removal."""
+
+    def test_remove_stop_words(self) -> None:
+        """Stop words should be dropped and the order of the rest kept."""
+        tokens = "the quick brown fox jumps over the lazy dog".split()
+        result = remove_stop_words(tokens, "en")
+        self.assertNotIsInstance(result, list)
+        self.assertEqual(list(result), ["quick", "brown", "fox", "jumps", "lazy", "dog"])
+
+    def test_remove_stop_words_is_lazy(self) -> None:
+        """Tokens should be pulled from the input only as the output is consumed."""
+        consumed = []
+
+        def tokens() -> Iterator[str]:
+            for token in ("the", "fox", "and", "dog"):
+                consumed.append(token)
+                yield token
+
+        result = remove_stop_words(tokens(), "en")
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(result), "fox")
+        self.assertEqual(consumed, ["the", "fox"])
+
+    def test_remove_stop_words_unknown_language_raises_eagerly(self) -> None:
+        """An unavailable language should raise before iteration starts."""
+        with self.assertRaises(StopWordError):
+            remove_stop_words(["the"], "sindarin")
+
+    def test_remove_stop_words_batch(self) -> None:
+        """Each batch should be filtered independently."""
+        batches = [["the", "fox"], iter(["a", "dog", "and", "cat"]), []]
+        self.assertEqual(remove_stop_words_batch(batches, "en"), [["fox"], ["dog", "cat"], []])
+
+
+class TestFilterDocuments(TestCase):
+    """Test filtering documents on a process pool."""
+
+    def test_results_in_order(self) -> None:
+        """Texts and token lists should be filtered like in-process, and come back in order."""
+        documents = [f"The fox {i} and the dog" if i % 2 else ["the", str(i), "and"] for i in range(500)]
+        expected = [
+            strip_stop_words(document, "en") if isinstance(document, str) else list(remove_stop_words(document, "en"))
+            for document in documents
+        ]
+        self.assertEqual(list(filter_documents(documents, "en", workers=2, chunksize=7)), expected)
+        self.assertEqual(list(filter_documents(iter([]), "en", workers=1)), [])
+
+    def test_several_languages(self) -> None:
+        """Several languages should remove the stop words of all of them."""
+        results = filter_documents(["le chat and the dog", ["le", "chat", "the"]], ["en", "fr"], workers=1)
+        self.assertEqual(list(results), ["chat dog", ["chat"]])
+
+    def test_bounded_in_flight(self) -> None:
+        """Documents should be read from the iterable only a few chunks ahead of the results."""
+        pulled = 0
+
+        def documents() -> Iterator[str]:
+            nonlocal pulled
+            for i in range(10_000):
+                pulled += 1
+                yield f"the {i}"
+
+        results = filter_documents(documents(), "en", workers=2, chunksize=10)
+        self.assertEqual(next(results), "0")
+        self.assertLessEqual(pulled, 4 * 10)
+        del results  # Closes the generator, which shuts the pool down.
+
+    def test_spawned_workers_see_filters_sources_and_compact_mode(self) -> None:
+        """Workers that do not inherit this process's state should still use its filters, sources and compact mode."""
+        spawn = multiprocessing.get_context("spawn")
+        add_filter(Exclude(["the"]))
+        self.addCleanup(remove_filter, stop_words._filters[None][-1])
+        source = MemorySource({"klingon": ["qa", "vaj"]})
+        add_source(source)
+        self.addCleanup(remove_source, source)
+
+        results = filter_documents(["the fox and the dog", ["the", "fox", "and"]], "en", workers=1, mp_context=spawn)
+        self.assertEqual(list(results), [strip_stop_words("the fox and the dog", "en"), ["the", "fox"]])
+        results = filter_documents(["qa Qapla' vaj", ["qa", "vaj", "the"]], ["klingon"], workers=1, mp_context=spawn)
+        self.assertEqual(list(results), ["Qapla' ", ["the"]])
+
+        configure_cache(compact=True)
+        self.addCleanup(configure_cache)
+        results = filter_documents(["the fox and the dog", ["the", "and"]], "en", workers=1, mp_context=spawn)
+        self.assertEqual(list(results), ["the fox the dog", ["the"]])
+
+    def test_invalid_arguments_raise_on_call(self) -> None:
+        """Unavailable languages and non-positive sizes should raise before any process starts."""
+        with self.assertRaises(StopWordError):
+            filter_documents(["the fox"], "sindarin")
+        with self.assertRaises(ValueError):
+            filter_documents(["the fox"], "en", chunksize=0)
+        with self.assertRaises(ValueError):
+            filter_documents(["the fox"], "en", workers=0)
+
+
+class TestCommandLine(TestCase):
+    """Test python -m stop_words."""
+
+    def run_cli(self, *args: str, stdin: bytes = b"") -> subprocess.CompletedProcess[bytes]:
+        """Run the command line interface in a new process."""
+        return subprocess.run(
+            [sys.executable, "-m", "stop_words", *args], cwd=Path(__file__).parent, input=stdin, capture_output=True
+        )
+
+    def test_stdin_to_stdout(self) -> None:
+        """Lines should lose their stop words and keep their line endings."""
+        result = self.run_cli(stdin=b"The fox and the dog\r\nthe\n\nquick brown fox")
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b"fox dog\r\n\n\nquick brown fox")
+
+    def test_files_languages_and_workers(self) -> None:
+        """Files should be read in order, with the stop words of every language, in one or more processes."""
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        first, second = tmp_dir / "first.txt", tmp_dir / "second.txt"
+        first.write_text("le chat and the dog\n" * 3000, encoding="utf-8")
+        second.write_bytes(b"the \xff byte\n")
+
+        expected = b"chat dog\n" * 3000 + b"\xff byte\n"
+        for workers in ("1", "2"):
+            result = self.run_cli("-l", "en", "--language", "french", "-w", workers, str(first), str(second))
+            self.assertEqual(result.stdout, expected)
+
+    def test_stats(self) -> None:
+        """--stats should report lines and tokens on standard error."""
+        result = self.run_cli("--stats", stdin=b"the quick fox\nthe dog\n")
+        self.assertEqual(result.stdout, b"quick fox\ndog\n")
+        self.assertIn(b"2 lines, 5 tokens", result.stderr)
+
+    def test_errors(self) -> None:
+        """Unavailable languages and missing files should fail with an error message."""
+        result = self.run_cli("-l", "sindarin")
+        self.assertEqual(result.returncode, 2)
+        self.assertIn(b'Language "sindarin" is unavailable', result.stderr)
+
+        result = self.run_cli("no-such-file.txt")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(b"no-such-file.txt", result.stderr)
+
+    def test_list_languages(self) -> None:
+        """--list-languages should print the language codes and names."""
+        result = self.run_cli("--list-languages")
+        self.assertIn(b"en\tenglish\n", result.stdout)
+
+
+class TestStopWordsIndex(TestCase):
+    """Test the compiled binary index."""
+
+    def setUp(self) -> None:
+        """Work on a private copy of the stop words directory."""
+        STOP_WORDS_CACHE.clear()
+        self.original_dir = stop_words.STOP_WORDS_DIR
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.tmp_dir / "stop-words"
+        shutil.copytree(self.original_dir, self.source_dir)
+
+    def tearDown(self) -> None:
+        """Restore the bundled directory and drop the private copy."""
+        stop_words.STOP_WORDS_DIR = self.original_dir
+        for index in stop_words._indexes.values():
+            if index is not None:
+                index.close()
+        stop_words._indexes.clear()
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_index_round_trip(self) -> None:
+        """The index should hold the mapping and the exact words of every text file."""
+        index = StopWordsIndex(build_index(self.source_dir))
+        try:
+            self.assertEqual(index.mapping, LANGUAGE_MAPPING)
+            for language in AVAILABLE_LANGUAGES:
+                with self.subTest(language=language):
+                    self.assertIn(language, index)
+                    self.assertEqual(index.read(language), read_words(self.source_dir / f"{language}.txt"))
+            self.assertNotIn("sindarin", index)
+        finally:
+            index.close()
+
+    def test_index_path_is_next_to_source_dir(self) -> None:
+        """The index should be named after the directory it was compiled from."""
+        self.assertEqual(index_path(self.source_dir), self.tmp_dir / "stop-words.idx")
+
+    def test_get_stop_words_reads_from_index(self) -> None:
+        """With an index present, the text files should not be needed."""
+        expected = get_stop_words("en")
+        build_index(self.source_dir)
+        (self.source_dir / "english.txt").unlink()
+
+        stop_words.STOP_WORDS_DIR = self.source_dir
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(get_stop_words("en"), expected)
+
+    def test_edited_text_files_win_over_index(self) -> None:
+        """A text file changed since the index was built should be read instead of the index."""
+        build_index(self.source_dir)
+        english_file = self.source_dir / "english.txt"
+        english_file.write_text("acme\n", encoding="utf-8")
+        os.utime(english_file, ns=(1, 1))
+
+        stop_words.STOP_WORDS_DIR = self.source_dir
+        self.assertEqual(get_stop_words("en"), ["acme"])
+        self.assertEqual(len(get_stop_words("fr")), len(read_words(self.source_dir / "french.txt")))
+        index = stop_words._get_index()
+        assert index is not None
+        self.assertFalse(index.is_current(self.source_dir, "english"))
+        self.assertTrue(index.is_current(self.source_dir, "french"))
+
+    def test_edited_mapping_disables_index(self) -> None:
+        """An index built from another languages.json should not be used at all."""
+        build_index(self.source_dir)
+        mapping_file = self.source_dir / "languages.json"
+        mapping_file.write_bytes(mapping_file.read_bytes().replace(b'"en"', b'"xx"'))
+        os.utime(mapping_file, ns=(1, 1))
+
+        stop_words.STOP_WORDS_DIR = self.source_dir
+        self.assertIsNone(stop_words._get_index())
+        self.assertEqual(len(get_stop_words("en")), TestStopWordsBasic.NUMBER_OF_ENGLISH_STOP_WORDS)
+
+    def test_same_size_edits_win_over_index(self) -> None:
+        """A text file edited without changing its size should be told apart by its content."""
+        build_index(self.source_dir)
+        english_file = self.source_dir / "english.txt"
+        content = english_file.read_bytes()
+        english_file.write_bytes(content.replace(b"the\n", b"thy\n", 1))
+        os.utime(english_file, ns=(1, 1))
+
+        stop_words.STOP_WORDS_DIR = self.source_dir
+        self.assertIn("thy", get_stop_words("en"))
+
+    def test_index_survives_copies_without_modification_times(self) -> None:
+        """Installing the package, which does not keep modification times, should keep the index in use."""
+        build_index(self.source_dir)
+        installed_dir = self.tmp_dir / "installed" / "stop-words"
+        shutil.copytree(self.source_dir, installed_dir, copy_function=shutil.copyfile)
+        shutil.copyfile(index_path(self.source_dir), index_path(installed_dir))
+        english_file = installed_dir / "english.txt"
+        self.assertNotEqual(english_file.stat().st_mtime_ns, (self.source_dir / "english.txt").stat().st_mtime_ns)
+
+        stop_words.STOP_WORDS_DIR = installed_dir
+        events: list[InstrumentationEvent] = []
+        add_hook(events.append)
+        try:
+            get_stop_words("en")
+        finally:
+            remove_hook(events.append)
+        self.assertEqual([event.detail for event in events if event.kind == "read"], ["index"])
+
+    def test_invalid_index_falls_back_to_text_files(self) -> None:
+        """A corrupt index should be ignored in favour of the text files."""
+        index_path(self.source_dir).write_bytes(b"not an index")
+        with self.assertRaises(ValueError):
+            StopWordsIndex(index_path(self.source_dir))
+
+        stop_words.STOP_WORDS_DIR = self.source_dir
+        self.assertEqual(len(get_stop_words("en")), TestStopWordsBasic.NUMBER_OF_ENGLISH_STOP_WORDS)
+
+
+class TestAsyncStopWords(IsolatedAsyncioTestCase):
+    """Test the asyncio API."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Clean up the cache filled by the test."""
+        STOP_WORDS_CACHE.clear()
+
+    async def test_cold_load_runs_in_thread(self) -> None:
+        """A cache miss should be loaded off the event loop."""
+        with mock.patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            words = await aget_stop_words("en")
+        to_thread.assert_called_once()
+        self.assertEqual(words, get_stop_words("en"))
+
+    async def test_cache_hit_does_not_use_thread(self) -> None:
+        """A cache hit should be answered on the event loop."""
+        get_stop_words("en")
+        with mock.patch("asyncio.to_thread", side_effect=AssertionError("unexpected thread")):
+            words = await aget_stop_words("english", copy=False)
+        self.assertIs(words, STOP_WORDS_CACHE["english"])
+
+    async def test_copy_and_cache_options(self) -> None:
+        """copy and cache should behave as in get_stop_words()."""
+        words = await aget_stop_words("fr")
+        self.assertIsInstance(words, list)
+        words.append("zzz")
+        self.assertNotIn("zzz", await aget_stop_words("fr"))
+
+        STOP_WORDS_CACHE.clear()
+        await aget_stop_words("de", cache=False)
+        self.assertNotIn("german", STOP_WORDS_CACHE)
+
+    async def test_unavailable_language(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            await aget_stop_words("sindarin")
+
+
+class TestWarmUp(TestCase):
+    """Test parallel preloading of languages."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Clean up the cache filled by the test."""
+        STOP_WORDS_CACHE.clear()
+
+    def test_warm_up_all_languages(self) -> None:
+        """All languages should be cached, with a load time each."""
+        timings = warm_up(workers=4)
+        self.assertEqual(list(timings), AVAILABLE_LANGUAGES)
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        self.assertEqual(set(STOP_WORDS_CACHE), set(AVAILABLE_LANGUAGES))
+
+    def test_warm_up_subset(self) -> None:
+        """Codes and names should be resolved and deduplicated, and sets built."""
+        timings = warm_up(["en", "english", "fr"])
+        self.assertEqual(list(timings), ["english", "french"])
+        self.assertEqual(set(STOP_WORDS_CACHE), {"english", "french"})
+
+        misses = cache_info().misses
+        self.assertIs(get_stop_words_set("en"), get_stop_words_set("english"))
+        self.assertEqual(cache_info().misses, misses)
+
+    def test_warm_up_unavailable_language(self) -> None:
+        """Unavailable languages should raise before anything is loaded."""
+        with self.assertRaises(StopWordError):
+            warm_up(["en", "sindarin"])
+        self.assertEqual(len(STOP_WORDS_CACHE), 0)
+
+
+class TestPreloadForFork(TestCase):
+    """Test preloading for pre-fork servers."""
+
+    # Loads every language in the parent, forks, then reports how many KiB the
+    # child's private dirty memory grows by when it runs a collection and uses every set.
+    FORK_SCRIPT = """
+import gc, os, sys
+import stop_words
+
+def private_dirty():
+    with open("/proc/self/smaps_rollup") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("Private_Dirty:"))
+
+if sys.argv[1] == "preload_for_fork":
+    stop_words.preload_for_fork()
+else:
+    stop_words.warm_up()
+    gc.collect()
+
+read_end, write_end = os.pipe()
+if os.fork() == 0:
+    before = private_dirty()
+    gc.collect()
+    for language in stop_words.AVAILABLE_LANGUAGES:
+        stop_words.get_stop_words_set(language)
+    os.write(write_end, str(private_dirty() - before).encode())
+    os._exit(0)
+os.wait()
+print(os.read(read_end, 64).decode())
+"""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Unfreeze the objects frozen by the test."""
+        gc.unfreeze()
+        STOP_WORDS_CACHE.clear()
+
+    def test_preload_loads_and_freezes(self) -> None:
+        """The languages and their sets should be cached and frozen out of the collector."""
+        timings = preload_for_fork(["en", "fr"])
+        self.assertEqual(list(timings), ["english", "french"])
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        misses = cache_info().misses
+        get_stop_words_set("en")
+        get_stop_words("fr", copy=False)
+        self.assertEqual(cache_info().misses, misses)
+
+    def test_preload_unavailable_language(self) -> None:
+        """Unavailable languages should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            preload_for_fork(["sindarin"])
+
+    def test_forked_worker_memory_growth(self) -> None:
+        """A forked worker should copy fewer pages after preload_for_fork() than after a plain warm-up."""
+        if not hasattr(os, "fork") or not Path("/proc/self/smaps_rollup").exists():
+            self.skipTest("needs fork() and /proc/self/smaps_rollup")
+
+        def growth(mode: str) -> int:
+            result = subprocess.run(
+                [sys.executable, "-c", self.FORK_SCRIPT, mode],
+                cwd=Path(__file__).parent,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            return int(result.stdout)
+
+        warm_up_growth = min(growth("warm_up") for _ in range(3))
+        preload_growth = min(growth("preload_for_fork") for _ in range(3))
+        self.assertLess(preload_growth, warm_up_growth / 2)
+
+
+class TestSharedStore(TestCase):
+    """Test the cross-process shared store."""
+
+    def setUp(self) -> None:
+        """Create a directory for the stores."""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.path = self.tmp_dir / "stop-words.shm"
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Detach and remove the stores."""
+        detach_shared_store()
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_store_holds_every_language(self) -> None:
+        """Every published word should be found in its languages only."""
+        store = attach_shared_store(publish_shared_store(self.path))
+        self.assertEqual(store.languages, AVAILABLE_LANGUAGES)
+        for language in AVAILABLE_LANGUAGES:
+            words = get_stop_words(language, copy=False)
+            self.assertEqual(store.read(language), list(stop_words._read_stop_words(language)))
+            self.assertTrue(all(store.contains(word, language) for word in words), language)
+        self.assertFalse(store.contains("fox", "english"))
+        self.assertFalse(store.contains("le", "english"))
+        self.assertTrue(store.contains("le", "french"))
+        self.assertFalse(store.contains("\ud800", "english"))
+
+    def test_is_stop_word_uses_store(self) -> None:
+        """Membership checks should not load the language into this process."""
+        attach_shared_store(publish_shared_store(self.path, ["en", "fr"]))
+        STOP_WORDS_CACHE.clear()
+        self.assertTrue(is_stop_word("the", "en"))
+        self.assertFalse(is_stop_word("fox", "english"))
+        self.assertNotIn("english", STOP_WORDS_CACHE)
+
+        # Languages missing from the store are loaded as usual.
+        self.assertTrue(is_stop_word("der", "de"))
+        self.assertIn("german", STOP_WORDS_CACHE)
+
+    def test_filters_bypass_store(self) -> None:
+        """The unfiltered store should not answer for filtered languages."""
+        attach_shared_store(publish_shared_store(self.path, ["en"]))
+
+        def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if w != "the"]
+
+        add_filter(drop_the)
+        self.assertFalse(is_stop_word("the", "en"))
+        remove_filter(drop_the)
+        self.assertTrue(is_stop_word("the", "en"))
+
+    def test_store_is_the_source_of_attached_languages(self) -> None:
+        """Languages in the store should be loaded from it instead of the data files."""
+        attach_shared_store(build_shared_store(self.path, [("english", ["foo", "bar"])]))
+        self.assertEqual(get_stop_words("en"), ["foo", "bar"])
+
+        detach_shared_store()
+        STOP_WORDS_CACHE.clear()
+        self.assertIn("the", get_stop_words("en"))
+
+    def test_other_process_attaches(self) -> None:
+        """A store published here should be usable from another process."""
+        publish_shared_store(self.path, ["en"])
+        code = (
+            "import sys, stop_words; stop_words.attach_shared_store(sys.argv[1]); "
+            "print(stop_words.is_stop_word('the', 'en'), 'english' in stop_words.STOP_WORDS_CACHE)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(self.path)],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "True False")
+
+    def test_invalid_store(self) -> None:
+        """Missing or invalid stores should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            attach_shared_store(self.path)
+        self.path.write_bytes(b"not a store")
+        with self.assertRaises(StopWordError):
+            attach_shared_store(self.path)
+
+    def test_too_many_languages(self) -> None:
+        """Language bitmasks should not overflow."""
+        with self.assertRaises(ValueError):
+            build_shared_store(self.path, [(f"language{n}", ["word"]) for n in range(MAX_LANGUAGES + 1)])
+
+
+class TestSources(TestCase):
+    """Test stop word sources and incremental reloads."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache and a directory source holding English stop words."""
+        STOP_WORDS_CACHE.clear()
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.english_file = self.tmp_dir / "english.txt"
+        self.write(self.english_file, "acme\nwidget\n")
+
+    def tearDown(self) -> None:
+        """Remove the sources, filters and the directory."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        for source, _ in stop_words._source_layers:
+            remove_source(source)
+        configure_cache()
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path: Path, content: str) -> None:
+        """Write a file and move its modification time forward, so the change is visible on any filesystem."""
+        previous = path.stat().st_mtime_ns if path.exists() else 0
+        path.write_text(content, encoding="utf-8")
+        os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+    def test_replace_and_extend(self) -> None:
+        """A source should replace the bundled stop words of a language, or add to them."""
+        source = DirectorySource(self.tmp_dir)
+        add_source(source)
+        self.assertEqual(get_stop_words("en"), ["acme", "widget"])
+        self.assertFalse(is_stop_word("the", "en"))
+        self.assertTrue(is_stop_word("le", "fr"))
+
+        remove_source(source)
+        add_source(source, extend=True)
+        words = get_stop_words("en")
+        self.assertEqual(len(words), 1333 + 2)
+        self.assertEqual(words[-2:], ["acme", "widget"])
+
+    def test_layers_from_the_top(self) -> None:
+        """The most recently added source should come first, and extend the layers below it."""
+        add_source(DirectorySource(self.tmp_dir))
+        add_source(MemorySource({"english": ["gadget", "acme"]}), extend=True)
+        self.assertEqual(get_stop_words("en"), ["acme", "widget", "gadget"])
+
+    def test_languages_only_in_sources(self) -> None:
+        """Sources may provide languages that are not bundled, by full name."""
+        with self.assertRaises(StopWordError):
+            get_stop_words("tenant-a")
+
+        source = MemorySource({"tenant-a": ["acme"]})
+        add_source(source)
+        self.assertEqual(get_stop_words("tenant-a"), ["acme"])
+
+        source.remove("tenant-a")
+        self.assertEqual(reload_changed(), ["tenant-a"])
+        self.assertNotIn("tenant-a", STOP_WORDS_CACHE)
+        with self.assertRaisesRegex(StopWordError, "unavailable"):
+            get_stop_words("tenant-a")
+
+    def test_reload_only_changed_languages(self) -> None:
+        """Only languages whose files changed should be reloaded, and lookups should see the old words until then."""
+        add_source(DirectorySource(self.tmp_dir))
+        english = get_stop_words("en", copy=False)
+        french = get_stop_words("fr", copy=False)
+        self.assertEqual(reload_changed(), [])
+
+        self.write(self.english_file, "acme\n")
+        self.assertIs(get_stop_words("en", copy=False), english)
+        self.assertEqual(reload_changed(), ["english"])
+        self.assertEqual(get_stop_words("en"), ["acme"])
+        self.assertIs(get_stop_words("fr", copy=False), french)
+        self.assertEqual(reload_changed(), [])
+
+    def test_new_file_in_directory(self) -> None:
+        """A file added to a source directory should replace a cached language on the next reload."""
+        add_source(DirectorySource(self.tmp_dir))
+        self.assertIn("le", get_stop_words("fr"))
+        self.write(self.tmp_dir / "french.txt", "acme\n")
+        self.assertEqual(reload_changed(), ["french"])
+        self.assertEqual(get_stop_words("fr"), ["acme"])
+
+    def test_hash_detection_ignores_touched_files(self) -> None:
+        """With content hashes, rewriting a file with the same content should not reload it."""
+        add_source(DirectorySource(self.tmp_dir, detect="hash"))
+        get_stop_words("en")
+        self.write(self.english_file, "acme\nwidget\n")
+        self.assertEqual(reload_changed(), [])
+        self.write(self.english_file, "acme\n")
+        self.assertEqual(reload_changed(), ["english"])
+
+    def test_adding_and_removing_sources_reloads(self) -> None:
+        """Adding or removing a source should reload the cached languages it provides, and only those."""
+        french = get_stop_words("fr", copy=False)
+        self.assertIn("the", get_stop_words("en"))
+        source = MemorySource({"english": ["acme"]})
+        add_source(source)
+        self.assertEqual(get_stop_words("en"), ["acme"])
+
+        source.set("english", ["widget"])
+        self.assertEqual(reload_changed(), ["english"])
+        self.assertEqual(get_stop_words("en"), ["widget"])
+
+        self.assertTrue(remove_source(source))
+        self.assertFalse(remove_source(source))
+        self.assertIn("the", get_stop_words("en"))
+        self.assertIs(get_stop_words("fr", copy=False), french)
+
+    def test_reload_keeps_filters_and_compact_forms(self) -> None:
+        """Reloaded languages should be filtered again, and their compact forms rebuilt."""
+        source = MemorySource({"english": ["acme", "a"]})
+        add_source(source)
+
+        def drop_short(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if len(w) > 1]
+
+        add_filter(drop_short, language="english")
+        configure_cache(compact=True)
+        self.assertTrue(is_stop_word("acme", "en"))
+
+        source.set("english", ["widget", "b"])
+        self.assertEqual(reload_changed(), ["english"])
+        self.assertFalse(is_stop_word("acme", "en"))
+        self.assertTrue(is_stop_word("widget", "en"))
+        self.assertFalse(is_stop_word("b", "en"))
+
+    def test_invalid_detection(self) -> None:
+        """Unknown change detection modes should be rejected."""
+        with self.assertRaises(ValueError):
+            DirectorySource(self.tmp_dir, detect="inotify")  # type: ignore[arg-type]
+
+
+# Read by a filter in TestCacheSnapshots, as a global.
+BLOCKED_WORDS = frozenset({"the"})
+
+
+class TestCacheSnapshots(TestCase):
+    """Test saving and loading snapshots of the filtered cache."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache, with a snapshot path in a temporary directory."""
+        STOP_WORDS_CACHE.clear()
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.snapshot = self.tmp_dir / "stop-words.snapshot"
+
+    def tearDown(self) -> None:
+        """Remove the sources, filters, hooks and the directory."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        for source, _ in stop_words._source_layers:
+            remove_source(source)
+        for hook in stop_words._hooks:
+            remove_hook(hook)
+        STOP_WORDS_CACHE.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    @staticmethod
+    def drop_short(words: list[str], _language: str | None = None) -> list[str]:
+        return [word for word in words if len(word) > 3]
+
+    def test_round_trip(self) -> None:
+        """Loaded languages should be cached with their filtered stop words, without reading the source."""
+        add_filter(self.drop_short)
+        add_filter(Include(["acme"]), language="english")
+        english, french = get_stop_words("en"), get_stop_words("fr")
+        self.assertEqual(save_cache(self.snapshot), self.snapshot)
+
+        STOP_WORDS_CACHE.clear()
+        stats = StopWordsStats()
+        add_hook(stats)
+        self.assertEqual(sorted(load_cache(self.snapshot)), ["english", "french"])
+        self.assertEqual(get_stop_words("en"), english)
+        self.assertEqual(get_stop_words("fr"), french)
+        self.assertTrue(is_stop_word("acme", "en"))
+        self.assertEqual(stats.reads, {})
+
+    def test_filters_after_loading(self) -> None:
+        """Loaded languages should follow later filter changes, re-reading the source if they were filtered."""
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        STOP_WORDS_CACHE.clear()
+        load_cache(self.snapshot)
+        self.assertIsNotNone(STOP_WORDS_CACHE.raw("english"))
+
+        add_filter(self.drop_short)
+        get_stop_words("fr")
+        save_cache(self.snapshot)
+        STOP_WORDS_CACHE.clear()
+        load_cache(self.snapshot)
+        self.assertIsNone(STOP_WORDS_CACHE.raw("french"))
+
+        remove_filter(self.drop_short)
+        self.assertIn("le", get_stop_words("fr"))
+
+    def test_changed_filters_reject_snapshot(self) -> None:
+        """Languages saved with another filter chain should not be loaded."""
+        add_filter(MinLength(3))
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        remove_filter(MinLength(3))
+        add_filter(MinLength(4))
+
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), [])
+        self.assertNotIn("the", get_stop_words("en"))
+        self.assertIn("with", get_stop_words("en"))
+
+        remove_filter(MinLength(4))
+        add_filter(MinLength(3))
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), ["english"])
+
+    def test_changed_data_rejects_language(self) -> None:
+        """A language whose source changed since it was saved should not be loaded; the others should."""
+        (self.tmp_dir / "english.txt").write_text("acme\n", encoding="utf-8")
+        add_source(DirectorySource(self.tmp_dir))
+        get_stop_words("en")
+        get_stop_words("fr")
+        save_cache(self.snapshot)
+
+        os.utime(self.tmp_dir / "english.txt", ns=(1, 1))
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), ["french"])
+        self.assertEqual(get_stop_words("en"), ["acme"])
+
+    def test_other_version_rejects_snapshot(self) -> None:
+        """A snapshot written by another library version should be ignored."""
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        STOP_WORDS_CACHE.clear()
+        with mock.patch("stop_words.get_version", return_value="0.0.0"):
+            self.assertEqual(load_cache(self.snapshot), [])
+
+    def test_cached_and_assigned_languages(self) -> None:
+        """Languages already cached should be kept, and directly assigned entries should not be saved."""
+        get_stop_words("en")
+        STOP_WORDS_CACHE["french"] = ("custom",)
+        save_cache(self.snapshot)
+
+        english = get_stop_words("en", copy=False)
+        self.assertEqual(load_cache(self.snapshot), [])
+        self.assertIs(get_stop_words("en", copy=False), english)
+
+    def test_snapshots_are_replaced_atomically(self) -> None:
+        """Saving should leave no temporary file behind, keep the file mode, and keep the old snapshot on failure."""
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        self.snapshot.chmod(0o640)
+        save_cache(self.snapshot)
+        self.assertEqual(os.listdir(self.tmp_dir), [self.snapshot.name])
+        self.assertEqual(self.snapshot.stat().st_mode & 0o777, 0o640)
+
+        saved = self.snapshot.read_bytes()
+        get_stop_words("fr")
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(StopWordError):
+                save_cache(self.snapshot)
+        self.assertEqual(os.listdir(self.tmp_dir), [self.snapshot.name])
+        self.assertEqual(self.snapshot.read_bytes(), saved)
+
+    def test_invalid_snapshots(self) -> None:
+        """Missing, foreign or truncated files should raise StopWordError."""
+        with self.assertRaises(StopWordError):
+            load_cache(self.snapshot)
+
+        self.snapshot.write_bytes(b"not a snapshot")
+        with self.assertRaises(StopWordError):
+            load_cache(self.snapshot)
+
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        self.snapshot.write_bytes(self.snapshot.read_bytes()[:-10])
+        with self.assertRaises(StopWordError):
+            load_cache(self.snapshot)
+
+    def test_other_process(self) -> None:
+        """A snapshot should be loaded by another process with the same filters, defined alike."""
+        code = (
+            "import sys, stop_words\n"
+            "excluded = {'the', 'and', 'of'}\n"
+            "def drop(words, _language, excluded=excluded):\n"
+            "    return [word for word in words if word not in excluded]\n"
+            "stop_words.add_filter(drop)\n"
+            "stop_words.add_filter(stop_words.Exclude({'a', 'an'}))\n"
+            "if sys.argv[1] == 'save':\n"
+            "    stop_words.get_stop_words('en')\n"
+            "    stop_words.save_cache(sys.argv[2])\n"
+            "else:\n"
+            "    print(stop_words.load_cache(sys.argv[2]))"
+        )
+
+        def run(*args: str) -> str:
+            return subprocess.run(
+                [sys.executable, "-c", code, *args, str(self.snapshot)],
+                cwd=Path(__file__).parent,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+
+        run("save")
+        self.assertEqual(run("load").strip(), "['english']")
+
+    def test_memory_sources_are_stamped_by_content(self) -> None:
+        """Memory sources should match a snapshot when they hold the same stop words, whatever their history."""
+        source = MemorySource({"english": ["acme"]})
+        add_source(source)
+        get_stop_words("en")
+        save_cache(self.snapshot)
+
+        remove_source(source)
+        other = MemorySource({"english": ["widget"]})
+        add_source(other)
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), [])
+        self.assertEqual(get_stop_words("en"), ["widget"])
+
+        # Same stop words as when saved, set in another order of events.
+        other.set("english", ["acme"])
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), ["english"])
+        self.assertEqual(get_stop_words("en"), ["acme"])
+
+    def test_filters_reading_globals(self) -> None:
+        """Filters reading globals should never match, unless the caller versions them."""
+
+        def drop_blocked(words: list[str], _language: str | None = None) -> list[str]:
+            return [word for word in words if word not in BLOCKED_WORDS]
+
+        add_filter(drop_blocked)
+        get_stop_words("en")
+        save_cache(self.snapshot)
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), [])
+
+        get_stop_words("en")
+        save_cache(self.snapshot, filter_version="1")
+        STOP_WORDS_CACHE.clear()
+        self.assertEqual(load_cache(self.snapshot), [])
+        self.assertEqual(load_cache(self.snapshot, filter_version="2"), [])
+        self.assertEqual(load_cache(self.snapshot, filter_version="1"), ["english"])
+        self.assertNotIn("the", get_stop_words("en"))
+
+
+class TestInstrumentation(TestCase):
+    """Test the instrumentation hooks."""
+
+    def setUp(self) -> None:
+        """Register a recording hook on an empty cache."""
+        STOP_WORDS_CACHE.clear()
+        self.events: list[InstrumentationEvent] = []
+        add_hook(self.events.append)
+
+    def tearDown(self) -> None:
+        """Remove the hooks and filters."""
+        stop_words._hooks = ()
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    def test_miss_read_then_hit(self) -> None:
+        """A cold load should report a miss and a timed read, the next lookup a hit."""
+        get_stop_words("en")
+        get_stop_words("en")
+        self.assertEqual(
+            [(e.kind, e.language) for e in self.events], [("miss", "english"), ("read", "english"), ("hit", "english")]
+        )
+        read = self.events[1]
+        self.assertIn(read.detail, ("index", "file"))
+        self.assertGreaterEqual(read.seconds, 0.0)
+
+    def test_uncached_load_reports_read_only(self) -> None:
+        """Loads bypassing the cache should not report hits or misses."""
+        get_stop_words("fr", cache=False)
+        self.assertEqual([e.kind for e in self.events], ["read"])
+
+    def test_filters_are_timed(self) -> None:
+        """Every filter run should be reported with its name and language."""
+
+        def drop_short(words: list[str], _lang: str | None = None) -> list[str]:
+            return [w for w in words if len(w) > 2]
+
+        add_filter(drop_short, language="english")
+        add_filter(drop_short)
+        get_stop_words("en")
+        filters = [e for e in self.events if e.kind == "filter"]
+        self.assertEqual(len(filters), 2)
+        self.assertTrue(all(e.language == "english" and e.detail.endswith("drop_short") for e in filters))
+
+        self.events.clear()
+        stop_words.apply_filters(["a", "the"], None)
+        self.assertEqual([(e.kind, e.language) for e in self.events], [("filter", None)])
+
+    def test_stats_hook(self) -> None:
+        """StopWordsStats should aggregate events per language."""
+        stats = StopWordsStats()
+        add_hook(stats)
+        get_stop_words("en")
+        get_stop_words_set("en")
+        is_stop_word("the", "en")
+        get_stop_words("de")
+
+        self.assertEqual(stats.misses, {"english": 1, "german": 1})
+        self.assertEqual(stats.hits["english"], 2)
+        self.assertEqual(stats.reads["english"], 1)
+        self.assertGreaterEqual(stats.read_seconds["german"], 0.0)
+
+    def test_remove_hook(self) -> None:
+        """Removed hooks should not be called anymore."""
+        self.assertTrue(remove_hook(self.events.append))
+        self.assertFalse(remove_hook(self.events.append))
+        get_stop_words("en")
+        self.assertEqual(self.events, [])
+
+
+class TestStopWordsThreadSafety(TestCase):
+    """Test concurrent loading and filter registration."""
+
+    THREADS = 32
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Clean up the cache filled by the test."""
+        STOP_WORDS_CACHE.clear()
+
+    def test_concurrent_misses_load_once(self) -> None:
+        """Threads missing the cache together should share a single load."""
+        loads = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def count_loads(words: list[str], _lang: str | None = None) -> list[str]:
+            loads.append(threading.get_ident())
+            return words
+
+        def load(_: int) -> tuple[str, ...]:
+            barrier.wait()
+            return get_stop_words("fr", copy=False)
+
+        add_filter(count_loads, language="french")
+        try:
+            with ThreadPoolExecutor(self.THREADS) as executor:
+                results = list(executor.map(load, range(self.THREADS)))
+        finally:
+            remove_filter(count_loads, language="french")
+
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_concurrent_filter_registration(self) -> None:
+        """Registering filters while others load should neither fail nor lose filters."""
+        barrier = threading.Barrier(self.THREADS)
+
+        filters = [lambda words, _lang: words for _ in range(self.THREADS)]
+
+        def work(i: int) -> None:
+            barrier.wait()
+            add_filter(filters[i])
+            get_stop_words("en", cache=False)
+
+        with ThreadPoolExecutor(self.THREADS) as executor:
+            list(executor.map(work, range(self.THREADS)))
+
+        try:
+            self.assertEqual(len(stop_words._filters[None]), self.THREADS)
+        finally:
+            for func in filters:
+                self.assertTrue(remove_filter(func))
+
+        self.assertEqual(stop_words._filters[None], [])
+
 
 class TestStopWordsErrors(TestCase):
     """Test error handling."""
@@ -276,6 +2092,171 @@ class TestStopWordsFilters(TestCase):
         self.assertTrue(remove_filter(remove_letter))
 
 
+class TestFilterInvalidation(TestCase):
+    """Test that filter changes refresh only the affected cached languages."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        STOP_WORDS_CACHE.clear()
+        self.original_dir = stop_words.STOP_WORDS_DIR
+
+    def tearDown(self) -> None:
+        """Restore the data directory and the filters."""
+        stop_words.STOP_WORDS_DIR = self.original_dir
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    @staticmethod
+    def drop_the(words: list[str], _lang: str | None = None) -> list[str]:
+        return [w for w in words if w not in ("the", "le")]
+
+    def test_language_filter_invalidates_only_its_language(self) -> None:
+        """A language-specific filter should refresh that language and leave others cached."""
+        get_stop_words("en", copy=False)
+        french = get_stop_words("fr", copy=False)
+
+        add_filter(self.drop_the, language="english")
+        self.assertNotIn("the", get_stop_words("en", copy=False))
+        self.assertIs(get_stop_words("fr", copy=False), french)
+
+    def test_global_filter_invalidates_all_languages(self) -> None:
+        """A global filter should refresh every cached language."""
+        self.assertIn("the", get_stop_words("en", copy=False))
+        self.assertIn("le", get_stop_words("fr", copy=False))
+
+        add_filter(self.drop_the)
+        self.assertNotIn("the", get_stop_words("en", copy=False))
+        self.assertNotIn("le", get_stop_words("fr", copy=False))
+
+    def test_remove_filter_restores_words(self) -> None:
+        """Removing a filter should bring back the unfiltered words."""
+        add_filter(self.drop_the, language="english")
+        self.assertFalse(is_stop_word("the", "en"))
+        remove_filter(self.drop_the, language="english")
+        self.assertTrue(is_stop_word("the", "en"))
+
+    def test_repeated_lookups_follow_changes(self) -> None:
+        """Sets remembered for repeated lookups should be dropped when filters or cache entries change."""
+        for _ in range(3):
+            self.assertTrue(is_stop_word("the", "en"))
+            self.assertIn("the", get_stop_words_set("en"))
+
+        add_filter(self.drop_the, language="english")
+        self.assertFalse(is_stop_word("the", "en"))
+        self.assertNotIn("the", get_stop_words_set("en"))
+        remove_filter(self.drop_the, language="english")
+        self.assertTrue(is_stop_word("the", "en"))
+        self.assertIn("the", get_stop_words_set("en"))
+
+        STOP_WORDS_CACHE["english"] = ("custom",)
+        self.assertFalse(is_stop_word("the", "en"))
+        self.assertTrue(is_stop_word("custom", "english"))
+
+    def test_refilter_does_not_read_files(self) -> None:
+        """Re-applying filters should use the cached raw words instead of the files."""
+        get_stop_words("en")
+        stop_words.STOP_WORDS_DIR = Path("non-existent-directory")
+
+        add_filter(self.drop_the)
+        sw = get_stop_words("en")
+        self.assertNotIn("the", sw)
+        self.assertEqual(len(sw), TestStopWordsBasic.NUMBER_OF_ENGLISH_STOP_WORDS - 1)
+
+    def test_directly_assigned_entries_stay_current(self) -> None:
+        """Entries assigned to the cache by hand are not managed by the filter chain."""
+        STOP_WORDS_CACHE["english"] = ("custom",)
+        add_filter(self.drop_the)
+        self.assertEqual(get_stop_words("en"), ["custom"])
+
+
+class TestDeclarativeFilters(TestCase):
+    """Test the declarative filters and their fusion into a single pass."""
+
+    WORDS = ["The", "a", "and", "Über", "x1", "nothing", "the"]
+
+    def tearDown(self) -> None:
+        """Clean up filters and the cache after each test."""
+        stop_words._filters.clear()
+        stop_words._filters[None] = []
+        STOP_WORDS_CACHE.clear()
+
+    @staticmethod
+    def apply_one_by_one(filters: list[stop_words.DeclarativeFilter], words: list[str]) -> list[str]:
+        for step in filters:
+            words = step(words)
+        return words
+
+    def test_each_filter(self) -> None:
+        """Each declarative filter should do what its name says."""
+        self.assertEqual(MinLength(3)(self.WORDS), ["The", "and", "Über", "nothing", "the"])
+        self.assertEqual(MaxLength(2)(self.WORDS), ["a", "x1"])
+        self.assertEqual(CaseFold()(self.WORDS), ["the", "a", "and", "über", "x1", "nothing", "the"])
+        self.assertEqual(Exclude(["the", "a"])(self.WORDS), ["The", "and", "Über", "x1", "nothing"])
+        self.assertEqual(Include(["acme", "and", "acme"])(self.WORDS), [*self.WORDS, "acme"])
+        self.assertEqual(RejectPattern(r"\d|^n")(self.WORDS), ["The", "a", "and", "Über", "the"])
+
+    def test_fused_pass_matches_one_by_one(self) -> None:
+        """A fused chain should give exactly the result of applying its filters one after the other."""
+        chains = [
+            [MinLength(2), MaxLength(5), CaseFold(), Exclude(["the"]), RejectPattern(r"\d")],
+            [CaseFold(), Include(["THE", "acme", "a"]), MinLength(3), Exclude(["acme"])],
+            [Include(["Acme"]), CaseFold(), Include(["acme", "b"]), MaxLength(3)],
+            [Exclude(["and"]), Exclude(["a"]), MinLength(0)],
+        ]
+        for chain in chains:
+            with self.subTest(chain=chain):
+                self.assertEqual(stop_words.fuse(chain)[0](self.WORDS, None), self.apply_one_by_one(chain, self.WORDS))
+
+    def test_fuse_keeps_custom_callables(self) -> None:
+        """Only runs of consecutive declarative filters should be fused; other callables stay in place."""
+
+        def reverse(words: list[str], _language: str | None = None) -> list[str]:
+            return words[::-1]
+
+        chain = stop_words.fuse([MinLength(2), CaseFold(), reverse, Exclude(["and"])])
+        self.assertEqual(len(chain), 3)
+        self.assertIs(chain[1], reverse)
+        self.assertEqual(repr(chain[0]), "MinLength(2) + CaseFold()")
+
+    def test_filters_compare_by_value(self) -> None:
+        """Equal filters should compare and hash alike, so a new instance removes a registered one."""
+        self.assertEqual(Exclude(["a", "b"]), Exclude(["b", "a"]))
+        self.assertEqual(hash(RejectPattern("x")), hash(RejectPattern("x")))
+        self.assertNotEqual(MinLength(2), MaxLength(2))
+        self.assertNotEqual(Include(["a", "b"]), Include(["b", "a"]))
+
+        add_filter(MinLength(4), language="english")
+        self.assertNotIn("the", get_stop_words("en", copy=False))
+        self.assertTrue(remove_filter(MinLength(4), language="english"))
+        self.assertIn("the", get_stop_words("en", copy=False))
+
+    def test_registered_filters_apply_in_order(self) -> None:
+        """Language-specific and global declarative filters should apply like any other filters."""
+
+        def upper(words: list[str], _language: str | None = None) -> list[str]:
+            return [word.upper() for word in words]
+
+        add_filter(Include(["Acme"]), language="english")
+        add_filter(upper, language="english")
+        add_filter(CaseFold())
+        add_filter(Exclude(["the", "le"]))
+
+        english = get_stop_words("en", copy=False)
+        self.assertIn("acme", english)
+        self.assertNotIn("the", english)
+        self.assertTrue(all(word == word.casefold() for word in english))
+        self.assertNotIn("le", get_stop_words("fr", copy=False))
+        self.assertEqual(apply_filters(["The", "Zoo"], "english"), ["zoo", "acme"])
+
+    def test_negative_length(self) -> None:
+        """Lengths must not be negative."""
+        with self.assertRaises(ValueError):
+            MinLength(-1)
+        with self.assertRaises(ValueError):
+            MaxLength(-1)
+
+
 class TestStopWordsAllLanguages(TestCase):
     """Test all available languages."""
 
@@ -433,3 +2414,20 @@ class TestStopWordsConfiguration(TestCase):
         for lang_name in AVAILABLE_LANGUAGES:
             lang_file = stop_words.STOP_WORDS_DIR / f"{lang_name}.txt"
             self.assertTrue(lang_file.exists(), f"Language file missing: {lang_file}")
+
+
+class TestBenchmarkComparison(TestCase):
+    """Test the regression check of the benchmarks against a baseline."""
+
+    def test_regressions_over_threshold(self) -> None:
+        """Only timings slower than the baseline by more than the threshold should be reported."""
+        baseline = {"membership": {"set": 1.0e-6, "list": 1.0e-5}}
+        results = {"membership": {"set": 1.2e-6, "list": 1.5e-5}}
+        regressions = compare(results, baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("membership: list:"))
+        self.assertEqual(compare(results, baseline, 0.5), [])
+
+    def test_missing_timings_are_ignored(self) -> None:
+        """Benchmarks and labels missing from either side should not be compared."""
+        self.assertEqual(compare({"new": {"x": 1.0}, "membership": {"y": 1.0}}, {"membership": {"z": 0.1}}, 0.0), [])